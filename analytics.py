@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 from rich.console import Console
@@ -5,6 +6,29 @@ from rich.table import Table
 
 console = Console()
 
+# Rows of history carried into each chunk by the chunk-aware indicators. EMA, RSI and
+# MACD forget their start as (1 - alpha)**n; after 500 rows even the slowest (the
+# 26-period EMA) is below 1e-16, so chunked results match the in-memory computation.
+DEFAULT_INDICATOR_WARMUP = 500
+
+def _symbol_runs(chunks):
+    """Split a chunk stream into (symbol, frame) runs.
+
+    Chunks indexed by [Symbol, Date] (as multi-symbol tables stream, ordered by symbol)
+    yield one Date-indexed frame per consecutive symbol; other chunks yield (None, chunk).
+    """
+    for chunk in chunks:
+        if not (isinstance(chunk.index, pd.MultiIndex) and "Symbol" in chunk.index.names):
+            yield None, chunk
+            continue
+        symbols = chunk.index.get_level_values("Symbol").to_numpy()
+        starts = [0, *(np.flatnonzero(symbols[1:] != symbols[:-1]) + 1), len(symbols)]
+        for start, stop in zip(starts[:-1], starts[1:]):
+            yield symbols[start], chunk.iloc[start:stop].droplevel("Symbol")
+
+def _with_symbol(result, symbol):
+    return result if symbol is None else pd.concat({symbol: result}, names=["Symbol"])
+
 class Analytics:
     def __init__(self):
         pass
@@ -15,6 +39,11 @@ class Analytics:
             console.print("[bold red]Error:[/bold red] DataFrame must contain a 'Close' column for technical indicator calculation.")
             return None
 
+        df = self._technical_indicators(df)
+        console.print("[green]Technical indicators calculated.[/green]")
+        return df
+
+    def _technical_indicators(self, df):
         # Moving Averages
         df['SMA_20'] = ta.sma(df['Close'], length=20)
         df['EMA_20'] = ta.ema(df['Close'], length=20)
@@ -37,9 +66,36 @@ class Analytics:
         # For demonstration, we'll use rolling min/max as a very basic proxy
         df['Support'] = df['Low'].rolling(window=10).min()
         df['Resistance'] = df['High'].rolling(window=10).max()
+        return df
 
+    def iter_technical_indicators(self, chunks, warmup=DEFAULT_INDICATOR_WARMUP):
+        """Yield ``calculate_technical_indicators`` results for a stream of chunks.
+
+        Each chunk is computed together with the last ``warmup`` rows before it and only
+        its own rows are yielded, so memory stays bounded by chunk plus warmup. Windowed
+        indicators are exact; recursive ones (EMA, RSI, MACD) agree to float precision.
+        [Symbol, Date] chunks are computed per symbol, starting afresh at each symbol.
+        """
+        if warmup < 20:
+            raise ValueError("warmup must cover the longest indicator window (20 rows).")
+        history, current = None, None
+        for symbol, chunk in _symbol_runs(chunks):
+            if 'Close' not in chunk.columns:
+                raise ValueError("Chunks must contain a 'Close' column for technical indicator calculation.")
+            if symbol != current:
+                history, current = None, symbol
+            frame = chunk if history is None else pd.concat([history, chunk])
+            yield _with_symbol(self._technical_indicators(frame.copy()).iloc[len(frame) - len(chunk):], symbol)
+            history = frame.iloc[-warmup:]
+
+    def calculate_technical_indicators_chunked(self, chunks, warmup=DEFAULT_INDICATOR_WARMUP):
+        """Chunk-aware ``calculate_technical_indicators``; returns the concatenated result."""
+        results = list(self.iter_technical_indicators(chunks, warmup))
+        if not results:
+            console.print("[yellow]No data to calculate technical indicators.[/yellow]")
+            return None
         console.print("[green]Technical indicators calculated.[/green]")
-        return df
+        return pd.concat(results)
 
     def display_technical_indicators(self, df):
         """Display a summary of technical indicators."""
@@ -104,6 +160,39 @@ class Analytics:
         console.print(rolling_volatility.tail())
         return rolling_volatility
 
+    def iter_volatility(self, chunks, column='Close', window=20):
+        """Yield the ``calculate_volatility`` series chunk by chunk.
+
+        The last (forward-filled) price and the last ``window - 1`` returns are carried
+        into the next chunk, so the concatenated output matches the in-memory result.
+        [Symbol, Date] chunks are computed per symbol, starting afresh at each symbol.
+        """
+        last_price, carried, current = float('nan'), None, None
+        for symbol, chunk in _symbol_runs(chunks):
+            if column not in chunk.columns:
+                raise ValueError(f"Chunks must contain a '{column}' column to calculate volatility.")
+            if symbol != current:
+                last_price, carried, current = float('nan'), None, symbol
+            # Same as pct_change() on the whole column: gaps are padded from the previous price.
+            prices = pd.concat([pd.Series([last_price]), chunk[column].astype('float64').reset_index(drop=True)]).ffill()
+            last_price = prices.iloc[-1]
+            returns = pd.Series((prices / prices.shift(1) - 1).iloc[1:].to_numpy(), index=chunk.index).dropna()
+            combined = returns if carried is None else pd.concat([carried, returns])
+            rolling_volatility = combined.rolling(window=window).std() * (252**0.5)
+            yield _with_symbol(rolling_volatility.iloc[len(combined) - len(returns):].rename(column), symbol)
+            carried = combined.iloc[-(window - 1):] if window > 1 else None
+
+    def calculate_volatility_chunked(self, chunks, column='Close', window=20):
+        """Chunk-aware ``calculate_volatility``; returns the concatenated series."""
+        results = list(self.iter_volatility(chunks, column, window))
+        if not results:
+            console.print("[yellow]No data to calculate volatility.[/yellow]")
+            return
+        rolling_volatility = pd.concat(results)
+        console.print(f"[green]Rolling {window}-day Annualized Volatility for {column}:[/green]")
+        console.print(rolling_volatility.tail())
+        return rolling_volatility
+
     def perform_regression_analysis(self, df, dependent_var, independent_vars):
         """Perform linear regression analysis."""
         try:
@@ -1,18 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 import yfinance as yf
 import pandas as pd
+from rate_limiter import BULK, get_limiter
+from single_flight import get_default_group
+from cassette import get_default_cassette
+
+# Offsets used to turn yfinance period strings into a start date for the local bar store.
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+def period_to_start(period, now=None):
+    """Translate a yfinance period (e.g. '1y', 'ytd', 'max') to a start timestamp; 'max' gives None."""
+    now = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return (now - PERIOD_OFFSETS[period]).normalize()
+
+def flatten_download_columns(data):
+    """Drop the ticker level that newer yfinance versions add to single-ticker downloads."""
+    if isinstance(data.columns, pd.MultiIndex) and data.columns.nlevels == 2 and data.columns.get_level_values(1).nunique() == 1:
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+def fetch_bars_incremental(bar_store, ticker, period, interval):
+    """Serve OHLCV bars from the local store, downloading only the missing date ranges."""
+    def fetcher(start, end):
+        get_limiter("yfinance").acquire()
+        if start is None:
+            data = yf.download(ticker, period="max", end=end, interval=interval, progress=False)
+        else:
+            data = yf.download(ticker, start=start, end=end, interval=interval, progress=False)
+        # yfinance reports failures as an empty frame; treat that as "not fetched" so it is retried.
+        if data is None or data.empty:
+            return None
+        return flatten_download_columns(data)
+
+    return bar_store.fetch_incremental((ticker.upper(), interval), period_to_start(period), fetcher)
+
+def fetch_history(ticker, period, interval, bar_store=None, single_flight=None):
+    """Fetch OHLCV history, sharing one download among identical concurrent requests.
+
+    Used by both APIManager and MarketData so `stocks load` and `stocks history` for
+    the same ticker, period and interval coalesce.
+    """
+    def fetch():
+        if bar_store is not None:
+            return fetch_bars_incremental(bar_store, ticker, period, interval)
+        get_limiter("yfinance").acquire()
+        return yf.download(ticker, period=period, interval=interval)
+
+    group = single_flight or get_default_group()
+    key = ("history", ticker.upper(), period, interval)
+    return group.do(("yf_history",) + key[1:], lambda: get_default_cassette().call("yfinance", key, fetch))
 
 class APIManager:
-    def __init__(self):
-        pass
+    def __init__(self, bar_store=None, single_flight=None):
+        # Optional SeriesStore of OHLCV bars; when set, only missing ranges are downloaded.
+        self.bar_store = bar_store
+        self.single_flight = single_flight or get_default_group()
 
     def get_yfinance_historical_data(self, ticker, period="1y", interval="1d"):
         try:
-            data = yf.download(ticker, period=period, interval=interval)
-            if data.empty:
+            data = fetch_history(ticker, period, interval, self.bar_store, self.single_flight)
+            if data is None or data.empty:
                 return None
             return data
         except Exception as e:
             print(f"Error fetching data for {ticker} from Yahoo Finance: {e}")
             return None
 
+    def get_yfinance_batch_data(self, tickers, period="1y", interval="1d", batch_size=50, max_workers=4, layout="long"):
+        """Download many tickers in batched, threaded requests with bounded concurrency.
+
+        Returns ``(panel, failures, elapsed)``. The panel is long (indexed by Symbol and
+        Date) or wide (columns keyed by Symbol, then field); ``failures`` maps each
+        symbol that returned no data to the reason.
+        """
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+        started = time.perf_counter()
+
+        def download_batch(batch):
+            def download():
+                # Whole-universe loads are bulk work and yield to interactive requests.
+                get_limiter("yfinance").acquire(BULK)
+                return yf.download(batch, period=period, interval=interval, group_by="ticker",
+                                   threads=True, progress=False)
+
+            try:
+                data = get_default_cassette().call("yfinance", ("batch", tuple(batch), period, interval), download)
+                return batch, data, None
+            except Exception as e:
+                return batch, None, str(e)
+
+        frames = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch, data, error in executor.map(download_batch, batches):
+                for ticker in batch:
+                    if error:
+                        failures[ticker] = error
+                        continue
+                    if data is None or data.empty:
+                        failures[ticker] = "No data returned"
+                        continue
+                    if isinstance(data.columns, pd.MultiIndex):
+                        if ticker not in data.columns.get_level_values(0):
+                            failures[ticker] = "No data returned"
+                            continue
+                        frame = data[ticker]
+                    else:
+                        frame = data
+                    frame = frame.dropna(how="all")
+                    if frame.empty:
+                        failures[ticker] = "No data returned"
+                    else:
+                        frames[ticker] = frame
 
+        elapsed = time.perf_counter() - started
+        if not frames:
+            return None, failures, elapsed
+        panel = pd.concat(frames, axis=1, names=["Symbol"])
+        if layout == "long":
+            panel = panel.stack(level="Symbol", future_stack=True).dropna(how="all")
+            panel = panel.swaplevel().sort_index()
+        return panel, failures, elapsed
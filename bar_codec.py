@@ -0,0 +1,126 @@
+import struct
+import zlib
+import numpy as np
+
+# Block layout, zlib-compressed as a whole:
+#   header: version, row count, column count, first timestamp
+#   timestamps: deltas between consecutive rows, in the narrowest int type that fits
+#   per column: codec, decimal scale, int width, first value, payload length, payload
+BLOCK_VERSION = 1
+# Prices with at most this many decimals are stored as scaled integers.
+MAX_DECIMAL_SCALE = 8
+
+CODEC_NULL = 0    # Every value is NaN; no payload.
+CODEC_SCALED = 1  # round(x * 10**scale) as delta-encoded integers.
+CODEC_XOR = 2     # Each float's bits XOR the previous float's bits, byte-shuffled (float32 when exact).
+HAS_MASK = 0x10   # Payload starts with a packed NaN bitmap (scaled integers only).
+
+_BLOCK_HEADER = struct.Struct("<BIHq")
+_COLUMN_HEADER = struct.Struct("<BbBqI")
+_INT_TYPES = ("<i1", "<i2", "<i4", "<i8")
+_POWERS = 10.0 ** np.arange(MAX_DECIMAL_SCALE + 1)[:, None]
+
+def _pack_ints(values):
+    """Delta-encode an int64 array; returns (first value, int width, payload)."""
+    if len(values) == 0:
+        return 0, 1, b""
+    deltas = np.diff(values)
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if len(deltas) == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+            return int(values[0]), np.dtype(dtype).itemsize, deltas.astype(dtype).tobytes()
+
+def _unpack_ints(first, width, payload, count):
+    deltas = np.frombuffer(payload, dtype=f"<i{width}", count=max(count - 1, 0)).astype(np.int64)
+    return np.cumsum(np.concatenate(([first], deltas)), dtype=np.int64)[:count]
+
+def _decimal_scale(values):
+    """Smallest decimal scale at which ``values`` round-trip bit for bit, or None."""
+    if len(values) == 0:
+        return 0
+    # Try every scale at once: one row per scale (callers silence overflow warnings).
+    scaled = np.round(values * _POWERS)
+    # Compare through int64 exactly as decoding does, which also rejects -0.0.
+    exact = (scaled.astype(np.int64).astype(np.float64) / _POWERS).view(np.uint64) == values.view(np.uint64)
+    fits = (np.abs(scaled) < 2**53).all(axis=1) & exact.all(axis=1)
+    return int(np.argmax(fits)) if fits.any() else None
+
+def _encode_column(values):
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    if missing.all():
+        return _COLUMN_HEADER.pack(CODEC_NULL, 0, 0, 0, 0)
+    scale = _decimal_scale(values[~missing])
+    if scale is not None:
+        ints = np.round(values * 10.0**scale)
+        # Fill gaps with the previous value so they cost nothing after delta encoding.
+        if missing.any():
+            positions = np.where(missing, 0, np.arange(len(values)))
+            ints = ints[np.maximum.accumulate(positions)]
+            ints[:np.argmax(~missing)] = ints[np.argmax(~missing)]
+        first, width, payload = _pack_ints(ints.astype(np.int64))
+        codec = CODEC_SCALED
+        if missing.any():
+            codec |= HAS_MASK
+            payload = np.packbits(missing).tobytes() + payload
+        return _COLUMN_HEADER.pack(codec, scale, width, first, len(payload)) + payload
+    # Prices that came from float32 (as many providers send them) only need 4 bytes each.
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64).view(np.uint64), values.view(np.uint64)):
+        bits, width = narrow.view(np.uint32), 4
+    else:
+        bits, width = values.view(np.uint64), 8
+    xored = bits ^ np.concatenate(([bits.dtype.type(0)], bits[:-1]))
+    # Byte-shuffling groups the mostly-zero high bytes of the XORs so zlib can squeeze them.
+    payload = xored.astype(f"<u{width}").view(np.uint8).reshape(-1, width).T.tobytes()
+    return _COLUMN_HEADER.pack(CODEC_XOR, 0, width, 0, len(payload)) + payload
+
+def _decode_column(buffer, offset, count):
+    codec, scale, width, first, length = _COLUMN_HEADER.unpack_from(buffer, offset)
+    offset += _COLUMN_HEADER.size
+    payload = buffer[offset:offset + length]
+    if codec == CODEC_NULL:
+        values = np.full(count, np.nan)
+    elif codec & ~HAS_MASK == CODEC_SCALED:
+        mask = None
+        if codec & HAS_MASK:
+            mask_bytes = (count + 7) // 8
+            mask = np.unpackbits(np.frombuffer(payload[:mask_bytes], dtype=np.uint8), count=count).astype(bool)
+            payload = payload[mask_bytes:]
+        values = _unpack_ints(first, width, payload, count).astype(np.float64) / 10.0**scale
+        if mask is not None:
+            values[mask] = np.nan
+    elif codec == CODEC_XOR:
+        xored = np.frombuffer(payload, dtype=np.uint8).reshape(width, count).T.copy().view(f"<u{width}").ravel()
+        values = np.bitwise_xor.accumulate(xored).view(f"<f{width}").astype(np.float64)
+    else:
+        raise ValueError(f"Unknown column codec: {codec}")
+    return values, offset + length
+
+def encode_block(timestamps, columns):
+    """Encode sorted int64 timestamps and float columns of equal length into bytes."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    first, width, deltas = _pack_ints(timestamps)
+    parts = [_BLOCK_HEADER.pack(BLOCK_VERSION, len(timestamps), len(columns), first), bytes([width]), deltas]
+    # Huge values overflow the scaled and float32 candidates; those are simply not chosen.
+    with np.errstate(over="ignore", invalid="ignore"):
+        parts.extend(_encode_column(column) for column in columns)
+    return zlib.compress(b"".join(parts))
+
+def decode_block(data):
+    """Decode a block; returns (timestamps, [column arrays])."""
+    buffer = zlib.decompress(data)
+    version, count, column_count, first = _BLOCK_HEADER.unpack_from(buffer, 0)
+    if version != BLOCK_VERSION:
+        raise ValueError(f"Unsupported bar block version: {version}")
+    offset = _BLOCK_HEADER.size
+    width = buffer[offset]
+    offset += 1
+    length = max(count - 1, 0) * width
+    timestamps = _unpack_ints(first, width, buffer[offset:offset + length], count)
+    offset += length
+    columns = []
+    for _ in range(column_count):
+        values, offset = _decode_column(buffer, offset, count)
+        columns.append(values)
+    return timestamps, columns
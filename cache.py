@@ -0,0 +1,138 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Default time-to-live per kind of cached data, in seconds.
+DEFAULT_TTLS = {
+    # Ticker.info is stored once and read through the "quote" and "fundamentals" views.
+    "info": 24 * 60 * 60,
+    "quote": 15,
+    "fundamentals": 24 * 60 * 60,
+    "statements": 7 * 24 * 60 * 60,
+}
+DEFAULT_MAX_ENTRIES = 512
+CACHE_DIR = os.path.join(os.path.expanduser("~/.quant_app_cache"), "ticker")
+
+class TTLCache:
+    """In-process LRU cache with per-kind TTLs and an optional on-disk tier.
+
+    Entries are keyed by ``(kind, key)``; ``kind`` selects the TTL (e.g. seconds for
+    quotes, days for fundamentals). When ``disk_dir`` is set, entries are also pickled
+    there so they survive restarts until their TTL runs out; the disk tier is capped at
+    ``max_entries`` files too, evicting the least recently used.
+    """
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, disk_dir=None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def _expired(self, kind, stored_at):
+        return time.time() - stored_at > float(self.ttls.get(kind, 0))
+
+    def _disk_path(self, kind, key):
+        digest = hashlib.sha256(repr((kind, key)).encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{kind}-{digest}.pkl")
+
+    def _read_disk(self, kind, key):
+        path = self._disk_path(kind, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                stored_at, value = pickle.load(f)
+        except Exception:
+            os.remove(path)
+            return None
+        if self._expired(kind, stored_at):
+            os.remove(path)
+            return None
+        os.utime(path)  # The modification time orders the disk tier for LRU eviction.
+        return stored_at, value
+
+    def _prune_disk(self):
+        """Remove the least recently used files beyond ``max_entries``. Caller holds the lock."""
+        paths = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith(".pkl")]
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            os.remove(path)
+
+    def _store(self, kind, key, stored_at, value):
+        """Insert into the memory tier, evicting the least recently used entries. Caller holds the lock."""
+        self._entries[(kind, key)] = (stored_at, value)
+        self._entries.move_to_end((kind, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, kind, key, view=None):
+        """Return the cached value, or None if it is missing or expired.
+
+        ``view`` reads the entry stored under ``kind`` with the TTL and hit/miss counters
+        of another kind, so one stored value can serve views that need different freshness.
+        """
+        view = view or kind
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and self._expired(kind, entry[0]):
+                del self._entries[(kind, key)]
+                entry = None
+            if entry is None and self.disk_dir:
+                entry = self._read_disk(kind, key)
+                if entry is not None:
+                    self._store(kind, key, *entry)
+            if entry is None or self._expired(view, entry[0]):
+                self.misses[view] += 1
+                return None
+            self._entries.move_to_end((kind, key))
+            self.hits[view] += 1
+            return entry[1]
+
+    def set(self, kind, key, value):
+        stored_at = time.time()
+        with self._lock:
+            self._store(kind, key, stored_at, value)
+            if self.disk_dir:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                path = self._disk_path(kind, key)
+                with open(path + ".tmp", "wb") as f:
+                    pickle.dump((stored_at, value), f)
+                os.replace(path + ".tmp", path)
+                self._prune_disk()
+
+    def get_or_fetch(self, kind, key, fetch, view=None):
+        """Return the cached value or call ``fetch()``; empty results are not cached."""
+        value = self.get(kind, key, view)
+        if value is not None:
+            return value
+        value = fetch()
+        if value is None or getattr(value, "empty", False) or (isinstance(value, dict) and not value):
+            return value
+        self.set(kind, key, value)
+        return value
+
+    def clear(self, kind=None):
+        """Drop all entries, or only those of one kind, from both tiers."""
+        with self._lock:
+            for entry_key in [k for k in self._entries if kind is None or k[0] == kind]:
+                del self._entries[entry_key]
+            if self.disk_dir and os.path.isdir(self.disk_dir):
+                for name in os.listdir(self.disk_dir):
+                    if kind is None or name.startswith(f"{kind}-"):
+                        os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self):
+        """Per-kind hit/miss counts and the current number of in-memory entries."""
+        kinds = sorted(set(self.ttls) | set(self.hits) | set(self.misses))
+        return {
+            "entries": len(self._entries),
+            "kinds": {kind: {"hits": self.hits[kind], "misses": self.misses[kind], "ttl": self.ttls.get(kind)} for kind in kinds},
+        }
@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import os
+import pickle
+import threading
+import time
+import requests
+
+CASSETTE_DIR = os.path.join(os.path.expanduser("~/.quant_app_cache"), "cassettes")
+CASSETTE_MODES = ("off", "record", "replay")
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """Raised in replay mode when no recording exists for a request."""
+
+class Cassette:
+    """Record provider responses to a compressed local store and replay them offline.
+
+    In ``record`` mode every fetch runs normally and its result is written as a
+    gzip-compressed pickle keyed by provider and request. In ``replay`` mode results
+    come only from the store, after an artificial delay of ``latency`` seconds, or the
+    originally measured duration when ``latency`` is ``"recorded"``. ``off`` passes
+    every call straight through.
+    """
+
+    def __init__(self, directory=CASSETTE_DIR, mode="off", latency=0.0):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+
+    def configure(self, mode=None, latency=None, directory=None):
+        if mode is not None:
+            if mode not in CASSETTE_MODES:
+                raise ValueError(f"Unknown cassette mode: {mode}")
+            self.mode = mode
+        if latency is not None:
+            self.latency = latency
+        if directory is not None:
+            self.directory = directory
+
+    def _path(self, provider, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, provider, f"{digest}.pkl.gz")
+
+    def call(self, provider, key, fetch):
+        """Return ``fetch()`` for the request identified by ``(provider, key)``, recording or replaying it."""
+        if self.mode == "off":
+            return fetch()
+        path = self._path(provider, key)
+
+        if self.mode == "replay":
+            if not os.path.exists(path):
+                raise CassetteMiss(f"No recorded {provider} response for {key!r}")
+            with gzip.open(path, "rb") as f:
+                entry = pickle.load(f)
+            delay = entry["elapsed"] if self.latency == "recorded" else float(self.latency or 0)
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                self.replayed += 1
+            return entry["value"]
+
+        started = time.perf_counter()
+        value = fetch()
+        entry = {"key": key, "elapsed": time.perf_counter() - started, "recorded_at": time.time(), "value": value}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + ".tmp", "wb") as f:
+            pickle.dump(entry, f)
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self.recorded += 1
+        return value
+
+_default_cassette = Cassette()
+
+def get_default_cassette():
+    """Return the process-wide cassette; it is off unless main.py configures it."""
+    return _default_cassette
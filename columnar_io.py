@@ -0,0 +1,62 @@
+import os
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# File extensions recognised for each columnar format.
+COLUMNAR_FORMATS = {
+    "parquet": (".parquet", ".pq"),
+    "feather": (".feather", ".arrow", ".ipc"),
+}
+
+def detect_format(file_path):
+    """Return the columnar format ('parquet' or 'feather') implied by a file extension."""
+    ext = os.path.splitext(file_path)[1].lower()
+    for fmt, extensions in COLUMNAR_FORMATS.items():
+        if ext in extensions:
+            return fmt
+    raise ValueError(f"Unrecognised columnar file extension: {file_path}")
+
+def _index_columns(schema):
+    """Names of the stored pandas index columns, so projections keep the index."""
+    metadata = schema.pandas_metadata or {}
+    return [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+
+def read_columnar(file_path, columns=None, fmt=None):
+    """Read a Parquet or Arrow IPC/Feather file with memory mapping and column projection.
+
+    Only the requested columns (plus any stored index) are decoded, so reading one
+    column from a wide file costs a fraction of a full read.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    fmt = fmt or detect_format(file_path)
+    columns = list(columns) if columns else None
+
+    if fmt == "parquet":
+        table = pq.read_table(file_path, columns=columns, memory_map=True, use_pandas_metadata=True)
+    elif fmt == "feather":
+        if columns:
+            with pa.memory_map(file_path) as source:
+                schema = pa.ipc.open_file(source).schema
+            columns = columns + [c for c in _index_columns(schema) if c not in columns]
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    return table.to_pandas()
+
+def write_columnar(df, file_path, fmt=None, compression=None):
+    """Write a DataFrame, including its index, to a Parquet or Arrow IPC/Feather file.
+
+    By default Parquet is zstd-compressed and Feather is written uncompressed, so
+    memory-mapped Feather reads stay zero-copy instead of decompressing every buffer.
+    """
+    fmt = fmt or detect_format(file_path)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    if fmt == "parquet":
+        pq.write_table(table, file_path, compression=compression or "zstd")
+    elif fmt == "feather":
+        feather.write_feather(table, file_path, compression=compression or "uncompressed")
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    return file_path
@@ -76,6 +76,16 @@ class ConfigManager:
         else:
             console.print("[yellow]No aliases configured.[/yellow]")
 
+    def set_rate_limit(self, provider, rate, burst):
+        limits = self.config.get("rate_limits", {})
+        limits[provider] = {"rate": rate, "burst": burst}
+        self.config["rate_limits"] = limits
+        save_config(self.config)
+        console.print(f"[green]Rate limit for \'{provider}\' set to {rate} requests/sec (burst {burst}).[/green]")
+
+    def get_rate_limits(self):
+        return self.config.get("rate_limits", {})
+
     def set_theme(self, theme_name):
         # This is a placeholder for theme implementation.
         # In a real application, you would load different rich.theme.Theme objects
@@ -1,20 +1,102 @@
+import glob
+import math
+import os
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
+from columnar_io import read_columnar, write_columnar
+from http_client import get_default_client
+from rate_limiter import BULK, priority
 
 console = Console()
 
+# Timestamped market snapshots of the coin universe are kept here.
+UNIVERSE_DIR = os.path.join(os.path.expanduser("~/.quant_app_cache"), "crypto", "universe")
+# CoinGecko's maximum page size for /coins/markets.
+MAX_PER_PAGE = 250
+
+# Column dtypes for universe snapshots.
+UNIVERSE_DTYPES = {
+    "id": "string",
+    "symbol": "string",
+    "name": "string",
+    "market_cap_rank": "Int64",
+    "current_price": "float64",
+    "market_cap": "float64",
+    "total_volume": "float64",
+    "high_24h": "float64",
+    "low_24h": "float64",
+    "price_change_percentage_24h": "float64",
+    "circulating_supply": "float64",
+    "total_supply": "float64",
+    "max_supply": "float64",
+    "ath": "float64",
+    "atl": "float64",
+}
+
+# CoinGecko returns 5-minute points for windows up to 1 day, hourly up to 90 days and
+# daily beyond that. Each granularity is stored separately as (bucket, refresh seconds).
+GRANULARITIES = {
+    "5m": ("5min", 5 * 60),
+    "hourly": ("h", 60 * 60),
+    "daily": ("D", 60 * 60),
+}
+
+def granularity_for_days(days):
+    """Return the granularity CoinGecko serves for a ``days`` window."""
+    if str(days) == "max" or float(days) > 90:
+        return "daily"
+    if float(days) > 1:
+        return "hourly"
+    return "5m"
+
+def market_chart_frame(data, granularity):
+    """Build a price/market_cap/total_volume frame from a market_chart response.
+
+    Points are bucketed to ``granularity`` and the first point of each bucket is kept,
+    so finer points from a short incremental range land on the same timestamps, with
+    the same start-of-bucket meaning, as the stored series.
+    """
+    frames = []
+    for field, column in (("prices", "price"), ("market_caps", "market_cap"), ("total_volumes", "total_volume")):
+        points = pd.DataFrame(data.get(field) or [], columns=["timestamp", column])
+        frames.append(points.set_index("timestamp")[column])
+    df = pd.concat(frames, axis=1).astype("float64")
+    if df.empty:
+        return df
+    df.index = pd.to_datetime(df.index, unit="ms").floor(GRANULARITIES[granularity][0])
+    df.index.name = "timestamp"
+    return df.groupby(level=0).first()
+
 class CryptoData:
-    def __init__(self):
+    def __init__(self, http_client=None, universe_dir=UNIVERSE_DIR, price_store=None):
+        self.http = http_client or get_default_client()
         self.base_url = "https://api.coingecko.com/api/v3"
+        self.universe_dir = universe_dir
+        # Optional SeriesStore of price history; when set, only new points are downloaded.
+        self.price_store = price_store
 
     def get_price_chart(self, coin_id, vs_currency="usd", days="30"):
         """Get historical market data for a cryptocurrency."""
+        if self.price_store is not None:
+            try:
+                history = self.fetch_price_history(coin_id, vs_currency, days)
+            except Exception as e:
+                console.print(f"[bold red]Error fetching price chart for {coin_id}:[/bold red] {e}")
+                return None
+            if history is None or history.empty:
+                console.print(f"[yellow]No price data found for {coin_id}.[/yellow]")
+                return None
+            prices = history.reset_index()
+            console.print(f"[green]Price chart for {coin_id.upper()} ({days} days):[/green]")
+            console.print(prices.tail())
+            return prices
         try:
             url = f"{self.base_url}/coins/{coin_id}/market_chart"
             params = {"vs_currency": vs_currency, "days": days}
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             response.raise_for_status()  # Raise an exception for HTTP errors
             data = response.json()
             
@@ -31,6 +113,62 @@ class CryptoData:
             console.print(f"[bold red]Error fetching price chart for {coin_id}:[/bold red] {e}")
             return None
 
+    def fetch_price_history(self, coin_id, vs_currency="usd", days="30"):
+        """Serve a ``days`` window of price history from the store, fetching only new points.
+
+        The first call downloads the window; later calls request ``/market_chart/range``
+        from the last stored timestamp. Returns a frame indexed by UTC timestamp.
+        """
+        granularity = granularity_for_days(days)
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        start = None if str(days) == "max" else now - pd.Timedelta(days=float(days))
+
+        def fetcher(range_start, range_end):
+            try:
+                if range_start is None:
+                    url = f"{self.base_url}/coins/{coin_id}/market_chart"
+                    params = {"vs_currency": vs_currency, "days": "max"}
+                else:
+                    url = f"{self.base_url}/coins/{coin_id}/market_chart/range"
+                    params = {
+                        "vs_currency": vs_currency,
+                        "from": int(range_start.tz_localize("UTC").timestamp()),
+                        "to": int((range_end or now).tz_localize("UTC").timestamp()),
+                    }
+                response = self.http.get(url, params=params)
+                response.raise_for_status()
+                return market_chart_frame(response.json(), granularity)
+            except requests.exceptions.RequestException as e:
+                console.print(f"[bold red]Error fetching price chart for {coin_id}:[/bold red] {e}")
+                return None
+
+        key = (coin_id.lower(), vs_currency.lower(), granularity)
+        refresh_seconds = GRANULARITIES[granularity][1]
+        return self.price_store.fetch_incremental(key, start, fetcher, refresh_seconds=refresh_seconds, now=now)
+
+    def load_price_history(self, coin_id, vs_currency="usd", granularity=None, interval=None):
+        """Return stored price history as Open/High/Low/Close/Volume bars without a network call.
+
+        ``granularity`` picks the stored series (``daily``, ``hourly`` or ``5m``; the first
+        stored one by default). ``interval`` is an optional pandas rule (e.g. ``1D``) to
+        resample finer points into candles. Returns None when nothing is stored.
+        """
+        if self.price_store is None:
+            return None
+        for candidate in ([granularity] if granularity else ["daily", "hourly", "5m"]):
+            history = self.price_store.read((coin_id.lower(), vs_currency.lower(), candidate))
+            if history is not None and not history.empty:
+                break
+        else:
+            return None
+        rule = interval or GRANULARITIES[candidate][0]
+        bars = history["price"].resample(rule).ohlc().rename(columns=str.capitalize)
+        bars["Volume"] = history["total_volume"].resample(rule).last()
+        bars["Market Cap"] = history["market_cap"].resample(rule).last()
+        bars = bars.dropna(subset=["Close"])
+        bars.index.name = "Date"
+        return bars
+
     def get_market_cap_rankings(self, vs_currency="usd", per_page=10, page=1):
         """Get market cap rankings for cryptocurrencies."""
         try:
@@ -42,32 +180,12 @@ class CryptoData:
                 "page": page,
                 "sparkline": False
             }
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
             if data:
-                table = Table(title=f"[bold blue]Top {per_page} Cryptocurrencies by Market Cap[/bold blue]")
-                table.add_column("Rank", style="cyan")
-                table.add_column("Name", style="magenta")
-                table.add_column("Symbol", style="yellow")
-                table.add_column("Price", style="green")
-                table.add_column("Market Cap", style="blue")
-                table.add_column("24h Change", style="red")
-                
-                for coin in data:
-                    rank = str(coin.get("market_cap_rank", "N/A"))
-                    name = coin.get("name", "N/A")
-                    symbol = coin.get("symbol", "").upper()
-                    price = f"${coin.get('current_price', 0):,.2f}"
-                    market_cap = f"${coin.get('market_cap', 0):,}"
-                    change_24h = coin.get("price_change_percentage_24h", 0)
-                    change_color = "green" if change_24h >= 0 else "red"
-                    change_str = f"[{change_color}]{change_24h:.2f}%[/{change_color}]"
-                    
-                    table.add_row(rank, name, symbol, price, market_cap, change_str)
-                
-                console.print(table)
+                self._print_rankings(data, f"Top {per_page} Cryptocurrencies by Market Cap")
                 return data
             else:
                 console.print("[yellow]No market cap data found.[/yellow]")
@@ -76,11 +194,136 @@ class CryptoData:
             console.print(f"[bold red]Error fetching market cap rankings:[/bold red] {e}")
             return None
 
+    def _print_rankings(self, coins, title):
+        table = Table(title=f"[bold blue]{title}[/bold blue]")
+        table.add_column("Rank", style="cyan")
+        table.add_column("Name", style="magenta")
+        table.add_column("Symbol", style="yellow")
+        table.add_column("Price", style="green")
+        table.add_column("Market Cap", style="blue")
+        table.add_column("24h Change", style="red")
+
+        for coin in coins:
+            rank = str(coin.get("market_cap_rank", "N/A"))
+            name = coin.get("name", "N/A")
+            symbol = coin.get("symbol", "").upper()
+            price = f"${coin.get('current_price', 0):,.2f}"
+            market_cap = f"${coin.get('market_cap', 0):,.0f}"
+            change_24h = coin.get("price_change_percentage_24h", 0)
+            change_color = "green" if change_24h >= 0 else "red"
+            change_str = f"[{change_color}]{change_24h:.2f}%[/{change_color}]"
+
+            table.add_row(rank, name, symbol, price, market_cap, change_str)
+
+        console.print(table)
+
+    def get_universe(self, top=1000, vs_currency="usd", max_workers=4, save=True):
+        """Fetch the top-N coins by market cap into a typed DataFrame.
+
+        All pages are requested concurrently as bulk work under the CoinGecko rate
+        limit. The result is saved as a timestamped snapshot so later rankings and
+        screens can be answered locally. Returns ``(df, failed_pages)``.
+        """
+        pages = list(range(1, math.ceil(top / MAX_PER_PAGE) + 1))
+        url = f"{self.base_url}/coins/markets"
+
+        def fetch_page(page):
+            params = {
+                "vs_currency": vs_currency,
+                "order": "market_cap_desc",
+                "per_page": MAX_PER_PAGE,
+                "page": page,
+                "sparkline": False,
+            }
+            with priority(BULK):
+                try:
+                    response = self.http.get(url, params=params)
+                    response.raise_for_status()
+                    return page, response.json(), None
+                except requests.exceptions.RequestException as e:
+                    return page, None, str(e)
+
+        records = []
+        failed_pages = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page, data, error in executor.map(fetch_page, pages):
+                if error:
+                    failed_pages[page] = error
+                elif data:
+                    records.extend(data)
+
+        if failed_pages:
+            console.print(f"[yellow]Failed to fetch {len(failed_pages)} of {len(pages)} pages: "
+                          f"{', '.join(str(p) for p in sorted(failed_pages))}[/yellow]")
+        if not records:
+            return None, failed_pages
+
+        df = pd.DataFrame.from_records(records)
+        for column, dtype in UNIVERSE_DTYPES.items():
+            if column not in df.columns:
+                df[column] = None
+            if dtype == "string":
+                df[column] = df[column].astype(dtype)
+            else:
+                df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+        df["last_updated"] = pd.to_datetime(df.get("last_updated"), utc=True, errors="coerce")
+        df = df[list(UNIVERSE_DTYPES) + ["last_updated"]]
+        df = df.drop_duplicates("id").sort_values("market_cap_rank", na_position="last").head(top).reset_index(drop=True)
+
+        if save:
+            os.makedirs(self.universe_dir, exist_ok=True)
+            stamp = pd.Timestamp.now(tz="UTC").strftime("%Y%m%dT%H%M%SZ")
+            write_columnar(df, os.path.join(self.universe_dir, f"{vs_currency.lower()}_{stamp}.parquet"), fmt="parquet")
+        return df, failed_pages
+
+    def load_universe_snapshot(self, vs_currency="usd", max_age=None):
+        """Return ``(df, taken_at)`` for the latest saved universe snapshot, or ``(None, None)``.
+
+        Snapshots older than ``max_age`` seconds are ignored.
+        """
+        paths = sorted(glob.glob(os.path.join(self.universe_dir, f"{vs_currency.lower()}_*.parquet")))
+        if not paths:
+            return None, None
+        latest = paths[-1]
+        taken_at = pd.Timestamp(os.path.basename(latest)[len(vs_currency) + 1:-len(".parquet")])
+        if max_age is not None and (pd.Timestamp.now(tz="UTC") - taken_at).total_seconds() > max_age:
+            return None, None
+        return read_columnar(latest, fmt="parquet"), taken_at
+
+    def get_local_rankings(self, vs_currency="usd", per_page=10, page=1):
+        """Render market cap rankings from the latest universe snapshot without a network call."""
+        df, taken_at = self.load_universe_snapshot(vs_currency)
+        if df is None:
+            console.print("[yellow]No universe snapshot found. Run ('crypto universe') first.[/yellow]")
+            return None
+        rows = df.iloc[(page - 1) * per_page:page * per_page]
+        coins = rows.astype(object).where(rows.notna(), None).to_dict("records")
+        coins = [{k: v for k, v in coin.items() if v is not None} for coin in coins]
+        self._print_rankings(coins, f"Top {per_page} Cryptocurrencies by Market Cap (snapshot {taken_at:%Y-%m-%d %H:%M} UTC)")
+        return rows
+
+    def screen_universe(self, vs_currency="usd", min_market_cap=None, min_volume=None, min_change_24h=None, max_change_24h=None):
+        """Filter the latest universe snapshot with vectorized predicates."""
+        df, _ = self.load_universe_snapshot(vs_currency)
+        if df is None:
+            console.print("[yellow]No universe snapshot found. Run ('crypto universe') first.[/yellow]")
+            return None
+        mask = pd.Series(True, index=df.index)
+        if min_market_cap is not None:
+            mask &= df["market_cap"] >= min_market_cap
+        if min_volume is not None:
+            mask &= df["total_volume"] >= min_volume
+        if min_change_24h is not None:
+            mask &= df["price_change_percentage_24h"] >= min_change_24h
+        if max_change_24h is not None:
+            mask &= df["price_change_percentage_24h"] <= max_change_24h
+        return df[mask.fillna(False)].reset_index(drop=True)
+
     def get_coin_info(self, coin_id):
         """Get detailed information about a specific cryptocurrency."""
         try:
             url = f"{self.base_url}/coins/{coin_id}"
-            response = requests.get(url)
+            response = self.http.get(url)
             response.raise_for_status()
             data = response.json()
             
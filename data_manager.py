@@ -1,20 +1,330 @@
 import pandas as pd
+import glob
+import hashlib
+import io
 import json
 import os
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.json as pa_json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from rich.console import Console
+from rich.table import Table
+from columnar_io import read_columnar, write_columnar
+
+console = Console()
+
+# Rows per chunk for streaming CSV imports.
+DEFAULT_CHUNKSIZE = 250_000
+
+# Records per batch when streaming newline-delimited JSON.
+DEFAULT_NDJSON_BATCH = 50_000
+# Leading records sampled to type the projected fields of a newline-delimited JSON file.
+NDJSON_SAMPLE_RECORDS = 1000
+
+# Converted Excel sheets are cached here as Feather files, evicted least-recently-used first.
+EXCEL_CACHE_DIR = os.path.join(os.path.expanduser("~/.quant_app_cache"), "excel")
+DEFAULT_EXCEL_CACHE_BYTES = 2 * 1024 ** 3
+
+def _apply_dtypes(df, dtypes):
+    """Cast columns to the requested dtypes, parsing any datetime targets."""
+    for column, dtype in (dtypes or {}).items():
+        if column not in df.columns:
+            continue
+        if str(dtype).startswith("datetime"):
+            df[column] = pd.to_datetime(df[column])
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+def _dotted(record, keys):
+    """Value at a dotted path of a parsed JSON record, or None where it is missing."""
+    for key in keys:
+        record = record.get(key) if isinstance(record, dict) else None
+    return record
+
+def _ndjson_frame(lines, paths):
+    """Parse NDJSON lines in Python, copying only ``paths`` or, when None, flattening every record."""
+    records = [json.loads(line) for line in lines if line.strip()]
+    if paths is None:
+        return pd.json_normalize(records)
+    return pd.DataFrame({field: [_dotted(record, keys) for record in records] for field, keys in paths})
+
+def _ndjson_leaf_type(values, dtype):
+    """Arrow type for a projected field from sampled values and its dtype hint; None if not a scalar."""
+    kinds = {type(value) for value in values if value is not None}
+    if kinds & {dict, list}:
+        return None
+    if str in kinds:
+        return pa.string()  # Dates and quoted numbers are converted by the dtype hints afterwards.
+    if kinds == {bool}:
+        return pa.bool_()
+    if kinds:
+        integer = pd.api.types.is_integer_dtype(dtype) if dtype is not None else kinds == {int}
+        return pa.int64() if integer else pa.float64()
+    # Nothing sampled: follow the hint.
+    if dtype is None or str(dtype).startswith("datetime"):
+        return pa.string()
+    try:
+        return pa.from_numpy_dtype(np.dtype(dtype))
+    except (TypeError, pa.ArrowNotImplementedError):
+        return pa.string()
+
+def _ndjson_schema(paths, types):
+    """Nested Arrow schema holding only the projected (dotted) fields."""
+    tree = {}
+    for field, keys in paths:
+        node = tree
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = types[field]
+
+    def build(node):
+        return [pa.field(key, pa.struct(build(value)) if isinstance(value, dict) else value) for key, value in node.items()]
+
+    return pa.schema(build(tree))
+
+def _read_csv_for_glob(file_path, symbol_column, date_column, symbol_from):
+    """Parse one file of a glob import in a worker process.
+
+    Returns ``(file_path, df, error)`` so one bad file never aborts the batch.
+    """
+    try:
+        df = pd.read_csv(file_path, parse_dates=[date_column])
+        if symbol_column not in df.columns:
+            if symbol_from == "parent":
+                symbol = os.path.basename(os.path.dirname(os.path.abspath(file_path)))
+            else:
+                symbol = os.path.splitext(os.path.basename(file_path))[0]
+            df[symbol_column] = symbol.upper()
+        return file_path, df, None
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}"
 
 class DataManager:
-    def __init__(self):
-        pass
+    def __init__(self, excel_cache_dir=EXCEL_CACHE_DIR, excel_cache_max_bytes=DEFAULT_EXCEL_CACHE_BYTES):
+        self.excel_cache_dir = excel_cache_dir
+        self.excel_cache_max_bytes = excel_cache_max_bytes
 
     def load_csv(self, file_path):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         return pd.read_csv(file_path)
 
-    def load_excel(self, file_path, sheet_name=0):
+    def iter_csv_chunks(self, file_path, chunksize=DEFAULT_CHUNKSIZE, columns=None, dtypes=None,
+                        date_column=None, symbols=None, symbol_column="Symbol", start=None, end=None):
+        """Yield filtered DataFrame chunks from a CSV file without reading it whole.
+
+        Column projection, dtype hints and date parsing are applied by the parser for
+        each chunk, and symbol/date-range filters are applied before a chunk is yielded,
+        so only matching rows are ever kept.
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
-        return pd.read_excel(file_path, sheet_name=sheet_name)
+
+        symbols = {s.upper() for s in symbols} if symbols else None
+        start = pd.Timestamp(start) if start else None
+        end = pd.Timestamp(end) if end else None
+        if (start is not None or end is not None) and not date_column:
+            raise ValueError("A date column is required to filter by start/end date.")
+
+        usecols = None
+        if columns:
+            # Filter columns must be parsed even when they are not part of the projection.
+            needed = list(columns)
+            for col in (date_column, symbol_column if symbols else None):
+                if col and col not in needed:
+                    needed.append(col)
+            usecols = needed
+
+        reader = pd.read_csv(
+            file_path,
+            chunksize=chunksize,
+            usecols=usecols,
+            dtype=dtypes,
+            parse_dates=[date_column] if date_column else None,
+        )
+        with reader:
+            for chunk in reader:
+                rows_read = len(chunk)
+                if symbols is not None:
+                    chunk = chunk[chunk[symbol_column].astype(str).str.upper().isin(symbols)]
+                if start is not None:
+                    chunk = chunk[chunk[date_column] >= start]
+                if end is not None:
+                    chunk = chunk[chunk[date_column] <= end]
+                if columns:
+                    chunk = chunk[list(columns)]
+                yield chunk, rows_read
+
+    def _progress_chunks(self, file_path, show_progress, **options):
+        """Yield the non-empty chunks of ``iter_csv_chunks``, reporting rows/sec as they are read."""
+        total_read = 0
+        total_kept = 0
+        started = time.perf_counter()
+        status = console.status("[green]Reading CSV...[/green]") if show_progress else None
+        if status:
+            status.start()
+        try:
+            for chunk, rows_read in self.iter_csv_chunks(file_path, **options):
+                total_read += rows_read
+                if not chunk.empty:
+                    total_kept += len(chunk)
+                    yield chunk
+                if status:
+                    elapsed = max(time.perf_counter() - started, 1e-9)
+                    status.update(f"[green]Read {total_read:,} rows, kept {total_kept:,} "
+                                  f"({total_read / elapsed:,.0f} rows/sec)...[/green]")
+        finally:
+            if status:
+                status.stop()
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        if show_progress:
+            console.print(f"[green]Read {total_read:,} rows in {elapsed:.2f}s "
+                          f"({total_read / elapsed:,.0f} rows/sec), kept {total_kept:,}.[/green]")
+
+    def _empty_csv_frame(self, file_path, columns):
+        # Preserve the projected schema even when nothing matched.
+        return pd.read_csv(file_path, nrows=0, usecols=list(columns) if columns else None)
+
+    def load_csv_chunked(self, file_path, chunksize=DEFAULT_CHUNKSIZE, columns=None, dtypes=None,
+                         date_column=None, symbols=None, symbol_column="Symbol", start=None, end=None,
+                         show_progress=True):
+        """Stream a large CSV file in chunks and return the matching rows as one DataFrame.
+
+        Only matching rows are kept, so memory grows with the result rather than the
+        file; use ``scan_csv`` or ``iter_csv_chunks`` when the result itself is large.
+        """
+        kept = list(self._progress_chunks(
+            file_path, show_progress, chunksize=chunksize, columns=columns, dtypes=dtypes,
+            date_column=date_column, symbols=symbols, symbol_column=symbol_column, start=start, end=end,
+        ))
+        if not kept:
+            return self._empty_csv_frame(file_path, columns)
+        return pd.concat(kept, ignore_index=True)
+
+    def scan_csv(self, file_path, chunksize=DEFAULT_CHUNKSIZE, columns=None, dtypes=None, date_column=None,
+                 symbols=None, symbol_column="Symbol", start=None, end=None, head_rows=5, show_progress=True):
+        """Stream a CSV file and return ``(matching row count, first head_rows matching rows)``.
+
+        Only one chunk and the head are held at a time, so peak memory stays flat
+        regardless of file size.
+        """
+        rows = 0
+        head = None
+        for chunk in self._progress_chunks(
+            file_path, show_progress, chunksize=chunksize, columns=columns, dtypes=dtypes,
+            date_column=date_column, symbols=symbols, symbol_column=symbol_column, start=start, end=end,
+        ):
+            rows += len(chunk)
+            if head is None:
+                head = chunk.head(head_rows).reset_index(drop=True)
+            elif len(head) < head_rows:
+                head = pd.concat([head, chunk.head(head_rows - len(head))], ignore_index=True)
+        return rows, head if head is not None else self._empty_csv_frame(file_path, columns)
+
+    def load_glob(self, pattern, symbol_column="Symbol", date_column="Date", symbol_from="stem", max_workers=None):
+        """Parse every CSV file matching a glob pattern in parallel across processes.
+
+        Files are combined into one frame indexed by (symbol, timestamp). Files without
+        a symbol column take their symbol from the file name (``symbol_from="stem"``) or
+        from the parent directory name (``symbol_from="parent"``). Returns
+        ``(df, failures)`` where ``failures`` lists ``(file_path, error)`` pairs.
+        """
+        files = sorted(glob.glob(pattern, recursive=True))
+        if not files:
+            raise FileNotFoundError(f"No files match pattern: {pattern}")
+
+        frames = []
+        failures = []
+        started = time.perf_counter()
+        with console.status(f"[green]Parsing {len(files):,} files...[/green]") as status:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_read_csv_for_glob, path, symbol_column, date_column, symbol_from)
+                           for path in files]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    path, df, error = future.result()
+                    if error:
+                        failures.append((path, error))
+                    elif not df.empty:
+                        frames.append(df)
+                    status.update(f"[green]Parsed {done:,}/{len(files):,} files...[/green]")
+
+        elapsed = time.perf_counter() - started
+        console.print(f"[green]Parsed {len(files) - len(failures):,} of {len(files):,} files in {elapsed:.2f}s.[/green]")
+        if failures:
+            table = Table(title="[bold red]Files that failed to import[/bold red]")
+            table.add_column("File", style="cyan")
+            table.add_column("Error", style="red")
+            for path, error in failures:
+                table.add_row(path, error)
+            console.print(table)
+
+        if not frames:
+            return None, failures
+        combined = pd.concat(frames, ignore_index=True)
+        combined = combined.set_index([symbol_column, date_column]).sort_index()
+        return combined, failures
+
+    def load_excel(self, file_path, sheet_name=0, use_cache=True):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        # Only single sheets are cached; sheet_name=None or a list returns a dict of frames.
+        if not use_cache or not isinstance(sheet_name, (int, str)):
+            return pd.read_excel(file_path, sheet_name=sheet_name)
+
+        cache_path = self._excel_cache_path(file_path, sheet_name)
+        if os.path.exists(cache_path):
+            os.utime(cache_path)  # Mark as recently used for eviction.
+            return read_columnar(cache_path, fmt="feather")
+
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        try:
+            os.makedirs(self.excel_cache_dir, exist_ok=True)
+            write_columnar(df, cache_path, fmt="feather")
+            self._evict_excel_cache()
+        except Exception as e:
+            # Mixed-type columns cannot always be stored columnar; serve the parsed frame uncached.
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            console.print(f"[yellow]Could not cache {file_path} (sheet {sheet_name}): {e}[/yellow]")
+        return df
+
+    def _excel_cache_path(self, file_path, sheet_name):
+        """Cache file for a (path, mtime, size, sheet) combination; edits to the workbook miss the cache."""
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{type(sheet_name).__name__}:{sheet_name}"
+        return os.path.join(self.excel_cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".feather")
+
+    def _evict_excel_cache(self):
+        """Delete least-recently-used cache files until the cache fits its size budget."""
+        entries = []
+        for name in os.listdir(self.excel_cache_dir):
+            path = os.path.join(self.excel_cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.excel_cache_max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear_excel_cache(self):
+        """Remove all cached Excel conversions."""
+        if os.path.isdir(self.excel_cache_dir):
+            for name in os.listdir(self.excel_cache_dir):
+                os.remove(os.path.join(self.excel_cache_dir, name))
+
+    def load_parquet(self, file_path, columns=None):
+        """Load a Parquet file, memory-mapped and projected to the requested columns."""
+        return read_columnar(file_path, columns=columns, fmt="parquet")
+
+    def load_feather(self, file_path, columns=None):
+        """Load an Arrow IPC/Feather file, memory-mapped and projected to the requested columns."""
+        return read_columnar(file_path, columns=columns, fmt="feather")
 
     def load_json(self, file_path):
         if not os.path.exists(file_path):
@@ -22,4 +332,76 @@ class DataManager:
         with open(file_path, 'r') as f:
             return json.load(f)
 
+    def iter_ndjson(self, file_path, fields=None, dtypes=None, batch_size=DEFAULT_NDJSON_BATCH):
+        """Yield typed DataFrame batches of about ``batch_size`` records from a newline-delimited JSON file.
+
+        ``fields`` is a list of (optionally dotted) paths such as ``"price"`` or
+        ``"trade.side"``. They are read by pyarrow's JSON parser with an explicit schema
+        typed from the dtype hints and the first records, so other keys are skipped by
+        the parser and never materialised. Blocks with values that do not fit that
+        schema, and files read without ``fields`` (every record flattened), are parsed
+        record by record in Python.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        paths = [(field, field.split(".")) for field in fields] if fields else None
+        sample = []
+        with open(file_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    sample.append(line)
+                    if len(sample) == NDJSON_SAMPLE_RECORDS:
+                        break
+        if not sample:
+            return
+        schema = None
+        if paths:
+            records = [json.loads(line) for line in sample]
+            types = {field: _ndjson_leaf_type([_dotted(record, keys) for record in records], (dtypes or {}).get(field))
+                     for field, keys in paths}
+            if all(leaf is not None for leaf in types.values()):
+                schema = _ndjson_schema(paths, types)
+        if schema is None:
+            yield from self._iter_ndjson_python(file_path, paths, dtypes, batch_size)
+            return
+
+        options = pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior="ignore")
+        block_bytes = max(batch_size * sum(map(len, sample)) // len(sample), 1)
+        with open(file_path, "rb") as f:
+            while True:
+                block = f.read(block_bytes)
+                if not block:
+                    break
+                if not block.endswith(b"\n"):
+                    block += f.readline()  # End the block on a record boundary.
+                if not block.strip():
+                    continue
+                try:
+                    table = pa_json.read_json(io.BytesIO(block), parse_options=options)
+                    while any(pa.types.is_struct(column.type) for column in table.schema):
+                        table = table.flatten()
+                    df = table.select(list(fields)).to_pandas()
+                except pa.ArrowInvalid:
+                    df = _ndjson_frame(block.splitlines(), paths)
+                yield _apply_dtypes(df, dtypes)
+
+    def _iter_ndjson_python(self, file_path, paths, dtypes, batch_size):
+        lines = []
+        with open(file_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lines.append(line)
+                if len(lines) == batch_size:
+                    yield _apply_dtypes(_ndjson_frame(lines, paths), dtypes)
+                    lines = []
+        if lines:
+            yield _apply_dtypes(_ndjson_frame(lines, paths), dtypes)
 
+    def load_ndjson(self, file_path, fields=None, dtypes=None, batch_size=DEFAULT_NDJSON_BATCH):
+        """Stream a newline-delimited JSON file into a single typed DataFrame."""
+        batches = list(self.iter_ndjson(file_path, fields=fields, dtypes=dtypes, batch_size=batch_size))
+        if not batches:
+            return _apply_dtypes(pd.DataFrame(columns=list(fields) if fields else []), dtypes)
+        return pd.concat(batches, ignore_index=True)
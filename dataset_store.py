@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+MANIFEST_NAME = "_manifest.json"
+DEFAULT_READ_WORKERS = 8
+
+def _dataset_frame(df, symbol=None):
+    """Flatten a frame into Symbol and naive-UTC Date columns followed by its value columns."""
+    if isinstance(df.index, pd.DatetimeIndex) and not any(str(c).lower() in ("date", "datetime", "timestamp", "index") for c in df.columns):
+        # A DatetimeIndex is the date whatever it is called (e.g. crypto bars are named by coin).
+        df = df.rename_axis("Date")
+    df = df.reset_index()
+    lookup = {str(column).lower(): column for column in df.columns}
+    date_column = next((lookup[name] for name in ("date", "datetime", "timestamp", "index") if name in lookup), None)
+    if date_column is None:
+        raise ValueError("Dataset tables need a Date index or column.")
+    if "symbol" in lookup:
+        symbols = df[lookup["symbol"]].astype(str).str.upper()
+    elif symbol:
+        symbols = pd.Series(symbol.upper(), index=df.index)
+    else:
+        raise ValueError("Dataset tables need a symbol (pass --symbol or include a Symbol column).")
+    dates = pd.DatetimeIndex(pd.to_datetime(df[date_column], utc=True)).tz_convert(None)
+    values = df.drop(columns=[c for c in (date_column, lookup.get("symbol")) if c is not None])
+    flat = pd.DataFrame({"Symbol": symbols.to_numpy(), "Date": dates.astype("datetime64[ns]")})
+    return pd.concat([flat, values.reset_index(drop=True)], axis=1)
+
+class PartitionedDataset:
+    """Parquet tables partitioned by symbol and year, indexed by a small JSON manifest.
+
+    A table is a directory of ``symbol=<SYMBOL>/year=<YYYY>/part-<n>.parquet`` files.
+    The manifest lists every file with its symbol, row count, columns and date range,
+    so reads skip partitions outside the requested symbols and dates without opening
+    them and decode the remaining files in parallel. Writes only ever add files: new
+    rows go to new parts and the manifest is replaced atomically, so readers never see
+    a partial write. Where parts overlap, rows from the newest part win.
+    """
+
+    def __init__(self, root, max_workers=DEFAULT_READ_WORKERS):
+        self.root = root
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def _manifest_path(self, table_name):
+        return os.path.join(self.root, table_name, MANIFEST_NAME)
+
+    def manifest(self, table_name):
+        """Return the table's manifest, or None if the table does not exist."""
+        try:
+            with open(self._manifest_path(table_name), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_manifest(self, table_name, manifest):
+        path = self._manifest_path(table_name)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+
+    def list_tables(self):
+        """List tables that have a manifest."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.exists(self._manifest_path(name)))
+
+    def append(self, df, table_name, symbol=None):
+        """Append rows as new part files, one per (symbol, year); returns the rows written."""
+        flat = _dataset_frame(df, symbol)
+        if flat.empty:
+            return 0
+        directory = os.path.join(self.root, table_name)
+        with self._lock:
+            manifest = self.manifest(table_name) or {"next_part": 0, "files": []}
+            entries = []
+            for (part_symbol, year), group in flat.groupby(["Symbol", flat["Date"].dt.year], sort=True):
+                relative = os.path.join(f"symbol={part_symbol}", f"year={year}", f"part-{manifest['next_part']:06d}.parquet")
+                manifest["next_part"] += 1
+                entries.append(self._write_part(directory, relative, part_symbol, year, group.drop(columns="Symbol")))
+            manifest["files"].extend(entries)
+            self._write_manifest(table_name, manifest)
+        return len(flat)
+
+    def _write_part(self, directory, relative, symbol, year, frame):
+        path = os.path.join(directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame = frame.sort_values("Date", kind="stable")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+        return {
+            "path": relative,
+            "symbol": symbol,
+            "year": int(year),
+            "rows": len(frame),
+            "columns": [column for column in frame.columns if column != "Date"],
+            "start": frame["Date"].iloc[0].isoformat(),
+            "end": frame["Date"].iloc[-1].isoformat(),
+        }
+
+    def files(self, table_name, symbols=None, start=None, end=None):
+        """Return the manifest entries a read with these filters has to open."""
+        manifest = self.manifest(table_name)
+        if manifest is None:
+            return []
+        symbols = {s.upper() for s in ([symbols] if isinstance(symbols, str) else symbols or [])}
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        return [
+            entry for entry in manifest["files"]
+            if (not symbols or entry["symbol"] in symbols)
+            and (start is None or pd.Timestamp(entry["end"]) >= start)
+            and (end is None or pd.Timestamp(entry["start"]) <= end)
+        ]
+
+    def read(self, table_name, columns=None, symbols=None, start=None, end=None, limit=None):
+        """Read matching rows, indexed by Date (one symbol) or by [Symbol, Date].
+
+        Returns None if the table does not exist.
+        """
+        if self.manifest(table_name) is None:
+            return None
+        entries = self.files(table_name, symbols, start, end)
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        directory = os.path.join(self.root, table_name)
+
+        def read_part(entry):
+            wanted = [c for c in columns if c in entry["columns"]] if columns else entry["columns"]
+            with pq.ParquetFile(os.path.join(directory, entry["path"])) as part:
+                table = part.read(columns=["Date"] + wanted)
+            # Only parts straddling a bound need row filtering.
+            if start is not None and pd.Timestamp(entry["start"]) < start:
+                table = table.filter(pc.greater_equal(table["Date"], pa.scalar(start, type=table.schema.field("Date").type)))
+            if end is not None and pd.Timestamp(entry["end"]) > end:
+                table = table.filter(pc.less_equal(table["Date"], pa.scalar(end, type=table.schema.field("Date").type)))
+            return table
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tables = list(executor.map(read_part, entries))
+        if tables:
+            df = pa.concat_tables(tables, promote_options="default").to_pandas()
+            df.insert(0, "Symbol", np.repeat([entry["symbol"] for entry in entries], [len(t) for t in tables]))
+            if len({(entry["symbol"], entry["year"]) for entry in entries}) < len(entries):
+                # Entries are in write order, so keeping the last duplicate keeps the newest row.
+                df = df.drop_duplicates(["Symbol", "Date"], keep="last")
+            df = df.sort_values(["Symbol", "Date"], kind="stable", ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=["Symbol", "Date"] + list(columns or []))
+        if columns:
+            df = df[["Symbol", "Date"] + [c for c in columns if c in df.columns]]
+        if limit:
+            df = df.head(limit)
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols or [])
+        if len(symbols) == 1 if symbols else df["Symbol"].nunique() == 1:
+            return df.drop(columns="Symbol").set_index("Date")
+        return df.set_index(["Symbol", "Date"])
+
+    def compact(self, table_name):
+        """Merge each partition's parts into one file; returns the number of files removed."""
+        directory = os.path.join(self.root, table_name)
+        with self._lock:
+            manifest = self.manifest(table_name)
+            if manifest is None:
+                return 0
+            partitions = {}
+            for entry in manifest["files"]:
+                partitions.setdefault((entry["symbol"], entry["year"]), []).append(entry)
+            files, obsolete = [], []
+            for (symbol, year), entries in partitions.items():
+                if len(entries) == 1:
+                    files.extend(entries)
+                    continue
+                frame = pa.concat_tables([pq.read_table(os.path.join(directory, e["path"]), partitioning=None) for e in entries],
+                                         promote_options="default").to_pandas().drop_duplicates("Date", keep="last")
+                relative = os.path.join(f"symbol={symbol}", f"year={year}", f"part-{manifest['next_part']:06d}.parquet")
+                manifest["next_part"] += 1
+                files.append(self._write_part(directory, relative, symbol, year, frame))
+                obsolete.extend(entry["path"] for entry in entries)
+            manifest["files"] = files
+            self._write_manifest(table_name, manifest)
+        for relative in obsolete:
+            os.remove(os.path.join(directory, relative))
+        return len(obsolete)
@@ -1,45 +1,528 @@
-import sqlite3
+import numpy as np
 import pandas as pd
 import os
+from columnar_io import read_columnar, write_columnar, COLUMNAR_FORMATS
+from db_pool import ConnectionPool, benchmark_reads
+from dataset_store import PartitionedDataset
+from bar_codec import encode_block, decode_block
+
+# Applied to every connection: WAL lets readers run alongside a writer, and NORMAL sync is
+# durable across application crashes while avoiding an fsync per transaction.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64 * 1024,  # KiB
+    "mmap_size": 256 * 1024 * 1024,
+}
+# Typed OHLCV columns of time-series tables and the DataFrame columns they map to.
+TIMESERIES_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adj_close": "Adj Close",
+    "volume": "Volume",
+}
+DEFAULT_UPSERT_BATCH = 50_000
+# (symbol, month) keys looked up per query when merging into compressed blocks (two parameters each).
+COMPRESSED_KEY_BATCH = 400
+DEFAULT_CHUNK_ROWS = 100_000
+
+def _timeseries_frame(df, symbol=None):
+    """Flatten bars into symbol, epoch-second ts and OHLCV columns.
+
+    Accepts a DatetimeIndex (with ``symbol`` or a Symbol column), a [Symbol, Date]
+    MultiIndex, or Symbol/Date columns. Missing OHLCV columns are left NULL.
+    """
+    if isinstance(df.index, pd.DatetimeIndex) and not any(str(c).lower() in ("date", "datetime", "timestamp", "ts", "index") for c in df.columns):
+        # A DatetimeIndex is the date whatever it is called (e.g. crypto bars are named by coin).
+        df = df.rename_axis("Date")
+    df = df.reset_index()
+    lookup = {str(column).lower().replace(" ", "_"): column for column in df.columns}
+    date_column = next((lookup[name] for name in ("date", "datetime", "timestamp", "ts", "index") if name in lookup), None)
+    if date_column is None:
+        raise ValueError("Time-series data needs a Date index or column.")
+    if "symbol" in lookup:
+        symbols = df[lookup["symbol"]].astype(str).str.upper()
+    elif symbol:
+        symbols = pd.Series(symbol.upper(), index=df.index)
+    else:
+        raise ValueError("Time-series data needs a symbol (pass --symbol or include a Symbol column).")
+    ts = pd.DatetimeIndex(pd.to_datetime(df[date_column], utc=True)).tz_convert(None)
+    flat = pd.DataFrame({"symbol": symbols.to_numpy(), "ts": ts.asi8 // 10**9})
+    for column in TIMESERIES_COLUMNS:
+        flat[column] = pd.to_numeric(df[lookup[column]], errors="coerce").astype("float64") if column in lookup else np.nan
+    return flat
+
+def _epoch_seconds(timestamp):
+    """Epoch seconds of a timestamp; naive timestamps are taken as UTC."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.value // 10**9
+
+def _month_keys(ts):
+    """Months since 1970-01 of epoch-second timestamps; compressed tables hold one block per symbol-month."""
+    return np.asarray(ts, dtype="int64").astype("datetime64[s]").astype("datetime64[M]").astype("int64")
+
+def _timeseries_columns(columns):
+    """Map requested column names (either spelling) to time-series table columns."""
+    lookup = {name.lower(): column for column, name in TIMESERIES_COLUMNS.items()}
+    lookup.update({column: column for column in TIMESERIES_COLUMNS})
+    selected = []
+    for column in columns or TIMESERIES_COLUMNS:
+        if column.lower() not in lookup:
+            raise ValueError(f"Unknown column: {column}")
+        selected.append(lookup[column.lower()])
+    return list(dict.fromkeys(selected))
+
+def _decode_blocks(stored):
+    """Decode (symbol, data) blocks into one (symbol, ts, ohlcv) row frame."""
+    symbols, stamps, columns = [], [], [[] for _ in TIMESERIES_COLUMNS]
+    for symbol, data in stored:
+        ts, values = decode_block(data)
+        symbols.append(np.full(len(ts), symbol, dtype=object))
+        stamps.append(ts)
+        for column, block_values in zip(columns, values):
+            column.append(block_values)
+    rows = pd.DataFrame({"symbol": np.concatenate(symbols) if symbols else np.array([], dtype=object),
+                         "ts": np.concatenate(stamps) if stamps else np.array([], dtype="int64")})
+    for name, column in zip(TIMESERIES_COLUMNS, columns):
+        rows[name] = np.concatenate(column) if column else np.array([], dtype="float64")
+    return rows
+
+def _from_timeseries_rows(df, single_symbol=None, drop_empty=True):
+    """Turn (symbol, ts, ohlcv) rows back into a bar frame.
+
+    A single symbol is indexed by Date alone; ``single_symbol`` forces the choice
+    instead of inferring it, so every chunk of a stream has the same shape.
+    """
+    df["ts"] = pd.to_datetime(df["ts"], unit="s")
+    df = df.rename(columns={"symbol": "Symbol", "ts": "Date", **TIMESERIES_COLUMNS})
+    # Columns that are NULL throughout come back from SQLite as objects.
+    df = df.astype({c: "float64" for c in TIMESERIES_COLUMNS.values() if c in df.columns})
+    if drop_empty and not df.empty:
+        df = df.drop(columns=[c for c in TIMESERIES_COLUMNS.values() if c in df.columns and df[c].isna().all()])
+    if single_symbol is None:
+        single_symbol = df["Symbol"].nunique() == 1
+    if single_symbol:
+        return df.drop(columns="Symbol").set_index("Date")
+    return df.set_index(["Symbol", "Date"])
 
 class DBManager:
+    """SQLite storage that is safe to share across threads.
+
+    Reads use a per-thread connection; writes are queued to a single writer thread
+    that commits concurrent writes together (see ``ConnectionPool``).
+    """
+
     def __init__(self, db_path="new_session.db"):
         self.db_path = db_path
-        self.conn = None
+        self.pool = ConnectionPool(db_path, pragmas=SQLITE_PRAGMAS)
+        # Columnar tables are stored as one file per table next to the SQLite database.
+        self.columnar_dir = os.path.splitext(db_path)[0] + "_columnar"
+        # Partitioned Parquet tables (symbol/year parts plus a manifest) live in their own directory.
+        self.dataset = PartitionedDataset(os.path.splitext(db_path)[0] + "_dataset")
+
+    @property
+    def conn(self):
+        """This thread's read connection."""
+        return self.pool.connection()
 
     def connect(self):
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
+        return self.conn
 
     def close(self):
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        self.pool.close()
 
     def save_dataframe(self, df, table_name, if_exists="replace"):
         """Save a pandas DataFrame to the database."""
-        self.connect()
-        df.to_sql(table_name, self.conn, if_exists=if_exists, index=False)
+        self.pool.write(lambda conn: df.to_sql(table_name, conn, if_exists=if_exists, index=False))
 
     def load_dataframe(self, table_name):
         """Load a pandas DataFrame from the database."""
-        self.connect()
         try:
             return pd.read_sql_query(f"SELECT * FROM {table_name}", self.conn)
         except pd.errors.DatabaseError:
             return None
 
+    def create_timeseries_table(self, table_name):
+        """Create a typed OHLCV table keyed by (symbol, ts) if it does not exist."""
+        self.pool.write(lambda conn: self._create_timeseries_table(conn, table_name))
+
+    def _create_timeseries_table(self, conn, table_name):
+        columns = ", ".join(f"{column} REAL" for column in TIMESERIES_COLUMNS)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} (symbol TEXT NOT NULL, ts INTEGER NOT NULL, "
+            f"{columns}, PRIMARY KEY (symbol, ts)) WITHOUT ROWID"
+        )
+        # Date-range queries across all symbols use this; per-symbol ranges use the primary key.
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_ts ON {table_name} (ts)")
+
+    def is_timeseries_table(self, table_name):
+        columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table_name})")}
+        return {"symbol", "ts"}.issubset(columns)
+
+    def _create_compressed_table(self, conn, table_name):
+        # Blocks are large BLOBs, so this is a rowid table rather than WITHOUT ROWID.
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} (symbol TEXT NOT NULL, month INTEGER NOT NULL, "
+            f"rows INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (symbol, month))"
+        )
+
+    def is_compressed_table(self, table_name):
+        columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table_name})")}
+        return {"symbol", "month", "data"}.issubset(columns)
+
+    def save_timeseries(self, df, table_name, symbol=None, batch_size=DEFAULT_UPSERT_BATCH, compress=None):
+        """Upsert OHLCV bars into a time-series table; returns the number of rows written.
+
+        Only the given rows are touched: existing (symbol, ts) rows are updated in place
+        and new ones inserted, in batched executemany calls within one transaction.
+        Safe to call from many threads; their writes are committed together.
+
+        With ``compress=True`` the table stores one encoded block per symbol-month (see
+        ``bar_codec``) instead of a row per bar. Existing tables keep their layout when
+        ``compress`` is None; ``query`` and ``iter_chunks`` read either layout.
+        """
+        exists = table_name in self.list_tables()
+        compressed = exists and self.is_compressed_table(table_name)
+        if compress is None:
+            compress = compressed
+        elif exists and compress != compressed:
+            raise ValueError(f"Table {table_name} is stored {'compressed' if compressed else 'uncompressed'}.")
+        flat = _timeseries_frame(df, symbol)
+        if compress:
+            return self._save_compressed(flat, table_name)
+        columns = ["symbol", "ts"] + list(TIMESERIES_COLUMNS)
+        updates = ", ".join(f"{column}=excluded.{column}" for column in TIMESERIES_COLUMNS)
+        sql = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(symbol, ts) DO UPDATE SET {updates}"
+        )
+        symbols = flat["symbol"].tolist()
+        values = [flat[column].tolist() for column in columns[1:]]
+
+        def upsert(conn):
+            self._create_timeseries_table(conn, table_name)
+            for start in range(0, len(flat), batch_size):
+                stop = start + batch_size
+                # NaN floats are stored as NULL by SQLite.
+                conn.executemany(sql, zip(symbols[start:stop], *(column[start:stop] for column in values)))
+            return len(flat)
+
+        return self.pool.write(upsert)
+
+    def _save_compressed(self, flat, table_name):
+        flat = flat.drop_duplicates(["symbol", "ts"], keep="last").sort_values(["symbol", "ts"], kind="stable")
+        symbols = flat["symbol"].to_numpy()
+        ts = flat["ts"].to_numpy()
+        months = _month_keys(ts)
+        values = [flat[column].to_numpy() for column in TIMESERIES_COLUMNS]
+        # Rows are sorted by (symbol, ts), so each symbol-month block is one contiguous slice.
+        breaks = np.flatnonzero((symbols[1:] != symbols[:-1]) | (months[1:] != months[:-1])) + 1
+        bounds = np.concatenate(([0], breaks, [len(flat)]))
+        sql = (
+            f"INSERT INTO {table_name} (symbol, month, rows, data) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT(symbol, month) DO UPDATE SET rows=excluded.rows, data=excluded.data"
+        )
+
+        keys = [(symbols[start], int(months[start])) for start in bounds[:-1]]
+
+        def upsert(conn):
+            self._create_compressed_table(conn, table_name)
+            # Only the blocks this write touches are read back, a batch of keys per query.
+            stored = {}
+            for i in range(0, len(keys), COMPRESSED_KEY_BATCH):
+                batch = keys[i:i + COMPRESSED_KEY_BATCH]
+                # Joining a VALUES list seeks the full (symbol, month) key; row-value IN only seeks symbol.
+                rows = conn.execute(
+                    f"WITH keys(symbol, month) AS (VALUES {', '.join(['(?, ?)'] * len(batch))}) "
+                    f"SELECT symbol, month, t.data FROM keys JOIN {table_name} AS t USING (symbol, month)",
+                    [value for key in batch for value in key],
+                )
+                stored.update(((symbol, month), data) for symbol, month, data in rows)
+            records = []
+            for (symbol, month), start, stop in zip(keys, bounds[:-1], bounds[1:]):
+                block_ts, block_values = ts[start:stop], [column[start:stop] for column in values]
+                if (symbol, month) in stored:
+                    old_ts, old_values = decode_block(stored[(symbol, month)])
+                    # Stable sort keeps stored rows before new ones, so the last of each ts is the new bar.
+                    merged_ts = np.concatenate([old_ts, block_ts])
+                    order = np.argsort(merged_ts, kind="stable")
+                    merged_ts = merged_ts[order]
+                    keep = np.append(merged_ts[1:] != merged_ts[:-1], True)
+                    block_ts = merged_ts[keep]
+                    block_values = [np.concatenate([old, new])[order][keep] for old, new in zip(old_values, block_values)]
+                records.append((symbol, month, len(block_ts), encode_block(block_ts, block_values)))
+            conn.executemany(sql, records)
+            return len(flat)
+
+        return self.pool.write(upsert)
+
+    def _iter_compressed(self, table_name, chunk_rows, columns, symbols, start, end, limit):
+        """Yield (symbol, ts, columns) rows of a compressed table, decoding a few blocks at a time.
+
+        Blocks are pruned by symbol and month in SQL. Each query fetches consecutive
+        blocks holding about ``chunk_rows`` rows (all of them when None).
+        """
+        selected = _timeseries_columns(columns)
+        start = _epoch_seconds(start) if start is not None else None
+        end = _epoch_seconds(end) if end is not None else None
+        where, params = [], []
+        if symbols:
+            where.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbol.upper() for symbol in symbols)
+        if start is not None:
+            where.append("month >= ?")
+            params.append(int(_month_keys([start])[0]))
+        if end is not None:
+            where.append("month <= ?")
+            params.append(int(_month_keys([end])[0]))
+        where = " AND ".join(where) or "1"
+        blocks = self.conn.execute(
+            f"SELECT symbol, month, rows FROM {table_name} WHERE {where} ORDER BY symbol, month", params
+        ).fetchall()
+        groups, group, group_rows = [], [], 0
+        for block in blocks:
+            group.append(block)
+            group_rows += block[2]
+            if chunk_rows and group_rows >= chunk_rows:
+                groups.append(group)
+                group, group_rows = [], 0
+        if group:
+            groups.append(group)
+        remaining = limit
+        pending = None
+        for group in groups:
+            (first_symbol, first_month, _), (last_symbol, last_month, _) = group[0], group[-1]
+            stored = self.conn.execute(
+                f"SELECT symbol, data FROM {table_name} WHERE {where} AND (symbol, month) BETWEEN (?, ?) AND (?, ?) "
+                f"ORDER BY symbol, month", params + [first_symbol, first_month, last_symbol, last_month]
+            ).fetchall()
+            rows = _decode_blocks(stored)
+            if start is not None:
+                rows = rows[rows["ts"] >= start]
+            if end is not None:
+                rows = rows[rows["ts"] <= end]
+            rows = rows[["symbol", "ts"] + selected]
+            if remaining is not None:
+                rows = rows.iloc[:remaining]
+                remaining -= len(rows)
+            # Rows left over from the previous group start the next chunk, so chunks are full.
+            pending = rows if pending is None else pd.concat([pending, rows])
+            pending = pending.reset_index(drop=True)
+            step = chunk_rows or len(pending)
+            while step and len(pending) >= step:
+                yield pending.iloc[:step].reset_index(drop=True)
+                pending = pending.iloc[step:]
+            if remaining == 0:
+                break
+        if pending is not None and len(pending):
+            yield pending.reset_index(drop=True)
+
+    def load_timeseries(self, table_name):
+        """Load a time-series table indexed by Date (one symbol) or by [Symbol, Date]."""
+        return self.query(table_name)
+
+    def query(self, table_name, columns=None, symbols=None, start=None, end=None, limit=None, chunksize=None,
+              symbol_column="Symbol", date_column="Date"):
+        """Load only the requested rows and columns of a table, filtered in SQL.
+
+        Symbols, the [start, end] date range, the column list and the row limit become a
+        parameterized WHERE/SELECT/LIMIT, served by the (symbol, ts) primary key on
+        time-series tables. Plain tables are filtered on ``symbol_column`` and
+        ``date_column`` when they exist. Compressed time-series tables are pruned to the
+        matching symbol-month blocks and decoded. With ``chunksize``, returns an iterator
+        of DataFrames instead of one DataFrame. Returns None if the table does not exist.
+        """
+        if table_name not in self.list_tables():
+            return None
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols or [])
+        if self.is_compressed_table(table_name):
+            single_symbol = len(symbols) == 1 if (chunksize or symbols) else None
+            convert = lambda df: _from_timeseries_rows(df, single_symbol=single_symbol,
+                                                       drop_empty=not (columns or chunksize))
+            chunks = self._iter_compressed(table_name, chunksize, columns, symbols, start, end, limit)
+            if chunksize:
+                return (convert(chunk) for chunk in chunks)
+            chunks = list(chunks)
+            empty = pd.DataFrame(columns=["symbol", "ts"] + _timeseries_columns(columns))
+            return convert(pd.concat(chunks, ignore_index=True) if chunks else empty)
+        if self.is_timeseries_table(table_name):
+            sql, params = self._timeseries_sql(table_name, columns, symbols, start, end, limit)
+            # Chunks must share one shape, so only infer the index layout and drop empty
+            # columns for whole results.
+            single_symbol = len(symbols) == 1 if (chunksize or symbols) else None
+            convert = lambda df: _from_timeseries_rows(df, single_symbol=single_symbol,
+                                                       drop_empty=not (columns or chunksize))
+        else:
+            sql, params = self._table_sql(table_name, columns, symbols, start, end, limit, symbol_column, date_column)
+            convert = lambda df: df
+        if chunksize:
+            return (convert(chunk) for chunk in pd.read_sql_query(sql, self.conn, params=params, chunksize=chunksize))
+        return convert(pd.read_sql_query(sql, self.conn, params=params))
+
+    def iter_chunks(self, table_name, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None, symbols=None, start=None, end=None,
+                    symbol_column="Symbol", date_column="Date"):
+        """Yield a table as DataFrames of at most ``chunk_rows`` rows, in key order.
+
+        Takes the same filters as ``query``. Each chunk is its own keyset query that
+        resumes after the last key of the previous one (``(symbol, ts)`` on time-series
+        tables, ``rowid`` otherwise), so no read stays open between chunks and memory is
+        bounded by one chunk. Time-series chunks all have the index layout of the full
+        result and keep every requested column, even if empty within a chunk.
+        """
+        if table_name not in self.list_tables():
+            return
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols or [])
+        if self.is_compressed_table(table_name):
+            for rows in self._iter_compressed(table_name, chunk_rows, columns, symbols, start, end, None):
+                yield _from_timeseries_rows(rows, single_symbol=len(symbols) == 1, drop_empty=False)
+            return
+        timeseries = self.is_timeseries_table(table_name)
+        after = None if timeseries else 0
+        while True:
+            if timeseries:
+                sql, params = self._timeseries_sql(table_name, columns, symbols, start, end, chunk_rows, after=after)
+            else:
+                sql, params = self._table_sql(table_name, columns, symbols, start, end, chunk_rows,
+                                              symbol_column, date_column, after=after)
+            rows = pd.read_sql_query(sql, self.conn, params=params)
+            if rows.empty:
+                return
+            if timeseries:
+                after = (rows["symbol"].iloc[-1], int(rows["ts"].iloc[-1]))
+                yield _from_timeseries_rows(rows, single_symbol=len(symbols) == 1, drop_empty=False)
+            else:
+                after = int(rows["_rowid"].iloc[-1])
+                yield rows.drop(columns="_rowid")
+            if len(rows) < chunk_rows:
+                return
+
+    def _timeseries_sql(self, table_name, columns, symbols, start, end, limit, after=None):
+        selected = _timeseries_columns(columns)
+        where, params = [], []
+        if symbols:
+            where.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbol.upper() for symbol in symbols)
+        if start is not None:
+            where.append("ts >= ?")
+            params.append(_epoch_seconds(start))
+        if end is not None:
+            where.append("ts <= ?")
+            params.append(_epoch_seconds(end))
+        if after is not None:
+            where.append("(symbol, ts) > (?, ?)")
+            params.extend(after)
+        sql = f"SELECT symbol, ts, {', '.join(selected)} FROM {table_name}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY symbol, ts"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return sql, params
+
+    def _table_sql(self, table_name, columns, symbols, start, end, limit, symbol_column, date_column, after=None):
+        available = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table_name})")]
+        for column in columns or []:
+            if column not in available:
+                raise ValueError(f"Unknown column: {column}")
+        selected = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        where, params = [], []
+        # Plain tables keep symbols as written, so match them case-insensitively.
+        if symbols and symbol_column in available:
+            where.append(f'UPPER("{symbol_column}") IN ({", ".join("?" * len(symbols))})')
+            params.extend(symbol.upper() for symbol in symbols)
+        # Dates are stored as ISO text, with or without a time part; datetime() brings
+        # both sides to one 'YYYY-MM-DD HH:MM:SS' form so they compare correctly as text.
+        if start is not None and date_column in available:
+            where.append(f'datetime("{date_column}") >= datetime(?)')
+            params.append(pd.Timestamp(start).isoformat(sep=" "))
+        if end is not None and date_column in available:
+            where.append(f'datetime("{date_column}") <= datetime(?)')
+            params.append(pd.Timestamp(end).isoformat(sep=" "))
+        if after is not None:
+            selected = f"rowid AS _rowid, {selected}"
+            where.append("rowid > ?")
+            params.append(after)
+        sql = f"SELECT {selected} FROM {table_name}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if after is not None:
+            sql += " ORDER BY rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return sql, params
+
+    def benchmark_reads(self, table_name, thread_counts=(1, 2, 4, 8), queries=200, window_days=30):
+        """Measure range-query throughput on a time-series table at several thread counts.
+
+        Each query aggregates a random ``window_days`` range of a random symbol through
+        the primary key. Returns {threads: queries per second}.
+        """
+        ranges = self.conn.execute(f"SELECT symbol, MIN(ts), MAX(ts) FROM {table_name} GROUP BY symbol").fetchall()
+        if not ranges:
+            return {}
+        window = window_days * 24 * 60 * 60
+        rng = np.random.default_rng(0)
+        params = []
+        for _ in range(max(queries, 1)):
+            symbol, first, last = ranges[rng.integers(len(ranges))]
+            start = int(rng.integers(first, max(first + 1, last - window + 1)))
+            params.append((symbol, start, start + window))
+        sql = (f"SELECT COUNT(*), AVG(close), MAX(high), MIN(low) FROM {table_name} "
+               f"WHERE symbol = ? AND ts BETWEEN ? AND ?")
+        return benchmark_reads(self.pool, sql, params, thread_counts, queries)
+
+    def _columnar_path(self, table_name, fmt):
+        return os.path.join(self.columnar_dir, f"{table_name}{COLUMNAR_FORMATS[fmt][0]}")
+
+    def save_columnar(self, df, table_name, fmt="parquet"):
+        """Save a pandas DataFrame, including its index, as a Parquet or Feather table."""
+        os.makedirs(self.columnar_dir, exist_ok=True)
+        return write_columnar(df, self._columnar_path(table_name, fmt), fmt=fmt)
+
+    def load_columnar(self, table_name, fmt="parquet", columns=None):
+        """Load a Parquet or Feather table, reading only the requested columns."""
+        path = self._columnar_path(table_name, fmt)
+        if not os.path.exists(path):
+            return None
+        return read_columnar(path, columns=columns, fmt=fmt)
+
+    def list_columnar_tables(self):
+        """List all Parquet/Feather tables stored alongside the database."""
+        if not os.path.isdir(self.columnar_dir):
+            return []
+        tables = []
+        for name in sorted(os.listdir(self.columnar_dir)):
+            stem, ext = os.path.splitext(name)
+            for fmt, extensions in COLUMNAR_FORMATS.items():
+                if ext == extensions[0]:
+                    tables.append((stem, fmt))
+        return tables
+
+    def save_dataset(self, df, table_name, symbol=None):
+        """Append bars to a partitioned Parquet table; returns the number of rows written."""
+        return self.dataset.append(df, table_name, symbol=symbol)
+
+    def load_dataset(self, table_name, columns=None, symbols=None, start=None, end=None, limit=None):
+        """Load a partitioned Parquet table, opening only partitions that match the filters."""
+        return self.dataset.read(table_name, columns=columns, symbols=symbols, start=start, end=end, limit=limit)
+
+    def list_dataset_tables(self):
+        """List all partitioned Parquet tables stored alongside the database."""
+        return self.dataset.list_tables()
+
     def execute_query(self, query):
         """Execute a raw SQL query."""
-        self.connect()
-        cursor = self.conn.cursor()
-        cursor.execute(query)
-        self.conn.commit()
-        return cursor.fetchall()
+        return self.pool.write(lambda conn: conn.execute(query).fetchall())
 
     def list_tables(self):
         """List all tables in the database."""
-        self.connect()
         cursor = self.conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type=\'table\';")
         return [table[0] for table in cursor.fetchall()]
@@ -0,0 +1,161 @@
+import queue
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Most write jobs committed together in one transaction.
+DEFAULT_MAX_BATCH = 256
+
+class ConnectionPool:
+    """Thread-safe access to one SQLite database.
+
+    Every thread reads through its own connection, so readers run concurrently (WAL
+    lets them proceed while a write is in progress). All writes go through a single
+    writer thread: jobs queued while it is busy are committed together in one
+    transaction, each inside its own savepoint so a failing job does not undo the
+    others. Every connection gets the same pragmas. Connections are kept per thread
+    and closed once their thread has exited.
+    """
+
+    def __init__(self, db_path, pragmas=None, max_batch=DEFAULT_MAX_BATCH):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._connections = {}  # Thread -> connection.
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._writer = None
+        self.commits = 0
+        self.jobs_written = 0
+
+    def _open(self):
+        # Each connection is only used by the thread that opened it; the flag only
+        # allows close() to run from another thread.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        with self._lock:
+            self._connections[threading.current_thread()] = conn
+        self.prune()
+        return conn
+
+    def prune(self):
+        """Close the connections of threads that have exited; returns how many were closed."""
+        with self._lock:
+            dead = [thread for thread in self._connections if not thread.is_alive()]
+            stale = [self._connections.pop(thread) for thread in dead]
+        for conn in stale:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        return len(stale)
+
+    def connection(self):
+        """Return this thread's read connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    def submit(self, job):
+        """Queue ``job(conn)`` for the writer thread; returns a Future of its result."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="sqlite-writer", daemon=True)
+                self._writer.start()
+        future = Future()
+        self._jobs.put((job, future))
+        return future
+
+    def write(self, job):
+        """Run ``job(conn)`` on the writer thread and wait until it is committed."""
+        return self.submit(job).result()
+
+    def _run_writer(self):
+        conn = self._open()
+        conn.isolation_level = None  # Transactions are managed explicitly below.
+        stopping = False
+        while not stopping:
+            batch = [self._jobs.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [item for item in batch if item is not None]
+            if batch:
+                self._write_batch(conn, batch)
+
+    def _write_batch(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for job, future in batch:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")  # A previous job committed on its own.
+            conn.execute("SAVEPOINT job")
+            try:
+                results.append((future, job(conn), None))
+                if conn.in_transaction:
+                    conn.execute("RELEASE job")
+            except BaseException as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                results.append((future, None, e))
+        try:
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            results = [(future, None, error or e) for future, _, error in results]
+        self.commits += 1
+        self.jobs_written += len(batch)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """Stop the writer after queued jobs finish and close every connection."""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._jobs.put(None)
+            writer.join(timeout=10)
+        self._writer = None
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+def benchmark_reads(pool, sql, params, thread_counts=(1, 2, 4, 8), queries=200):
+    """Run ``queries`` reads at each thread count; returns {threads: queries per second}.
+
+    ``params`` is a list of parameter tuples sampled for each query.
+    """
+    results = {}
+    for threads in thread_counts:
+        def run(_):
+            pool.connection().execute(sql, random.choice(params)).fetchall()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(run, range(queries)))
+        results[threads] = queries / (time.perf_counter() - started)
+        pool.prune()
+    return results
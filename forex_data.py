@@ -1,45 +1,113 @@
+import pandas as pd
 import requests
 from rich.console import Console
 from rich.table import Table
+from http_client import get_default_client
+from fx_matrix import RateMatrix, DEFAULT_FX_MAX_AGE
 
 console = Console()
 
 class ForexData:
-    def __init__(self):
+    def __init__(self, http_client=None, max_age=DEFAULT_FX_MAX_AGE, matrix_path=None, anchor="USD", history=None,
+                 record_history=False):
+        self.http = http_client or get_default_client()
         # Using a free API for demonstration. Real applications would need a more robust solution.
         self.base_url = "https://api.exchangerate-api.com/v4/latest/"
+        # Every base is derived locally from one anchor fetch while it is fresh.
+        self.anchor = anchor.upper()
+        self.matrix = RateMatrix(max_age=max_age, path=matrix_path)
+        # Optional FXHistory. Snapshots are recorded by record_snapshot(), and on every
+        # fetch only when record_history is set, so interactive lookups stay read-only.
+        self.history = history
+        self.record_history = record_history
+        self._last_fetch = None
 
-    def get_live_rates(self, base_currency="USD"):
-        """Get live exchange rates for a base currency."""
-        try:
-            url = f"{self.base_url}{base_currency}"
-            response = requests.get(url)
+    def refresh_rates(self, base_currency=None):
+        """Fetch the anchor rate vector into the matrix.
+
+        If the anchor response does not quote ``base_currency``, that base is fetched
+        directly instead. Returns whether the matrix now has ``base_currency``.
+        """
+        base = (base_currency or self.anchor).upper()
+        for fetch_base in dict.fromkeys([self.anchor, base]):
+            response = self.http.get(f"{self.base_url}{fetch_base}")
             response.raise_for_status()
             data = response.json()
-            
-            if data and "rates" in data:
-                table = Table(title=f"[bold blue]Live Exchange Rates (Base: {base_currency.upper()})[/bold blue]")
-                table.add_column("Currency", style="cyan")
-                table.add_column("Rate", style="magenta")
-                
-                for currency, rate in data["rates"].items():
-                    table.add_row(currency, f"{rate:.4f}")
-                
-                console.print(table)
-                return data["rates"]
-            else:
-                console.print(f"[yellow]No live rates found for {base_currency.upper()}.[/yellow]")
-                return None
+            if data and data.get("rates"):
+                self.matrix.update(fetch_base, data["rates"])
+                updated = data.get("time_last_updated")
+                self._last_fetch = (fetch_base, data["rates"], pd.Timestamp(updated, unit="s", tz="UTC") if updated else None)
+                if self.record_history and self.history is not None:
+                    self.history.record_snapshot(*self._last_fetch)
+                if self.matrix.has(base):
+                    return True
+        return False
+
+    def get_live_rates(self, base_currency="USD", refresh=False):
+        """Get live exchange rates for a base currency, derived locally while the stored rates are fresh."""
+        base = base_currency.upper()
+        try:
+            if refresh or not (self.matrix.is_fresh() and self.matrix.has(base)):
+                if not self.refresh_rates(base):
+                    console.print(f"[yellow]No live rates found for {base}.[/yellow]")
+                    return None
+            rates = self.matrix.rates(base)
         except requests.exceptions.RequestException as e:
             console.print(f"[bold red]Error fetching live rates for {base_currency}:[/bold red] {e}")
             return None
 
+        age = self.matrix.age()
+        table = Table(title=f"[bold blue]Live Exchange Rates (Base: {base}, {age:.0f}s old)[/bold blue]")
+        table.add_column("Currency", style="cyan")
+        table.add_column("Rate", style="magenta")
+
+        for currency, rate in rates.items():
+            table.add_row(currency, f"{rate:.4f}")
+
+        console.print(table)
+        return rates.to_dict()
+
+    def record_snapshot(self):
+        """Fetch the anchor rates now and record them in the history; returns the number of rates."""
+        if self.history is None:
+            console.print("[yellow]No FX history store configured.[/yellow]")
+            return None
+        try:
+            if not self.refresh_rates():
+                console.print("[yellow]No live rates returned.[/yellow]")
+                return None
+        except requests.exceptions.RequestException as e:
+            console.print(f"[bold red]Error fetching live rates:[/bold red] {e}")
+            return None
+        if self.record_history:
+            return len(self._last_fetch[1])  # Already recorded by refresh_rates.
+        return self.history.record_snapshot(*self._last_fetch)
+
+    def get_cross_matrix(self, currencies=None):
+        """Return the N x N cross-rate matrix for ``currencies`` (all known ones by default)."""
+        try:
+            if not self.matrix.is_fresh():
+                self.refresh_rates()
+            return self.matrix.matrix(currencies)
+        except requests.exceptions.RequestException as e:
+            console.print(f"[bold red]Error fetching live rates:[/bold red] {e}")
+        except KeyError as e:
+            console.print(f"[bold red]Error:[/bold red] {e.args[0]}")
+        return None
+
     def get_historical_chart(self, base_currency, target_currency, date):
         """Get historical exchange rate for a specific date."""
+        if self.history is not None:
+            # Latest recorded rate at or before the end of that day.
+            rate = self.history.rate_at(base_currency, target_currency, pd.Timestamp(date) + pd.Timedelta(days=1) - pd.Timedelta(1))
+            if pd.notna(rate):
+                console.print(f"[green]{base_currency.upper()}/{target_currency.upper()} on {date}: {rate:.4f}[/green]")
+                return rate
+            console.print(f"[yellow]No recorded rate for {base_currency.upper()}/{target_currency.upper()} on or before {date}.[/yellow]")
+            console.print("[yellow]Record snapshots with ('forex snapshot') or import history with ('forex import').[/yellow]")
+            return None
         # This free API only provides latest rates, not historical data directly.
         # For historical charts, a different API or data source would be needed.
         console.print("[yellow]Historical charts are not supported by the current free API.[/yellow]")
         console.print("[yellow]Please consider integrating with a more comprehensive Forex API for this feature.[/yellow]")
         return None
-
-
@@ -0,0 +1,199 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from columnar_io import COLUMNAR_FORMATS, detect_format, read_columnar
+from series_store import SeriesStore
+
+# Live snapshots are kept as one wide table per base (a column per quote currency),
+# so recording a snapshot is a single merge instead of one per pair.
+SNAPSHOT_KEY = "snapshots"
+
+class FXHistory:
+    """Historical FX rates per currency pair with vectorized as-of lookups.
+
+    Each pair ``(BASE, QUOTE)`` is a SeriesStore entry with a float ``rate`` column
+    (units of QUOTE per BASE) indexed by naive UTC timestamp. Lookups use the sorted
+    timestamp and rate arrays, so a whole column of timestamps resolves with one
+    ``searchsorted`` per currency. Missing pairs fall back to the inverse pair, then
+    to two legs through the ``anchor`` currency.
+    """
+
+    def __init__(self, store=None, anchor="USD"):
+        self.store = store or SeriesStore("fx")
+        self.anchor = anchor.upper()
+        self._legs = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _invalidate(self):
+        with self._lock:
+            self._legs.clear()
+            self._snapshots.clear()
+
+    def pairs(self):
+        """List stored (base, quote) pairs, including those only seen in snapshots."""
+        pairs = []
+        for key in self.store.keys():
+            first, second = key.split("__")
+            if first == SNAPSHOT_KEY:
+                frame = self._snapshot_frame(second)
+                pairs.extend((second, quote) for quote in (frame.columns if frame is not None else []))
+            else:
+                pairs.append((first, second))
+        return list(dict.fromkeys(pairs))
+
+    def append(self, base, quote, rates):
+        """Merge a Series of rates indexed by timestamp into the ``(base, quote)`` history."""
+        rates = pd.Series(rates, dtype="float64").dropna()
+        rates.index = pd.DatetimeIndex(pd.to_datetime(rates.index, utc=True)).tz_convert(None)
+        frame = rates.to_frame("rate")
+        frame.index.name = "timestamp"
+        key = (base.upper(), quote.upper())
+        self.store.merge(key, frame)
+        self._invalidate()
+        return len(frame)
+
+    def record_snapshot(self, base, rates, timestamp=None):
+        """Append one live-rate snapshot (quote currency -> rate) for ``base`` in a single write."""
+        timestamp = pd.Timestamp(timestamp if timestamp is not None else pd.Timestamp.now(tz="UTC"))
+        base = base.upper()
+        row = {quote.upper(): float(rate) for quote, rate in rates.items() if quote.upper() != base and rate}
+        if not row:
+            return 0
+        frame = pd.DataFrame([row], index=pd.DatetimeIndex(_to_utc_naive([timestamp]), name="timestamp"))
+        self.store.merge((SNAPSHOT_KEY, base), frame)
+        self._invalidate()
+        return len(row)
+
+    def import_frame(self, df, base=None, quote=None, date_column="Date", rate_column="Close",
+                     base_column="base", quote_column="quote"):
+        """Import rates from a DataFrame; returns rows imported per pair.
+
+        Either pass ``base`` and ``quote`` for a single-pair file, or provide
+        ``base_column`` and ``quote_column`` for a long file with many pairs.
+        """
+        if date_column not in df.columns and df.index.name == date_column:
+            df = df.reset_index()
+        if base and quote:
+            groups = [((base, quote), df)]
+        else:
+            groups = df.groupby([df[base_column].str.upper(), df[quote_column].str.upper()])
+        imported = {}
+        for (pair_base, pair_quote), group in groups:
+            rates = pd.Series(pd.to_numeric(group[rate_column], errors="coerce").values, index=group[date_column])
+            imported[(pair_base.upper(), pair_quote.upper())] = self.append(pair_base, pair_quote, rates)
+        return imported
+
+    def import_file(self, file_path, **kwargs):
+        """Import a CSV, Parquet or Feather file of rates; see ``import_frame``."""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        extension = os.path.splitext(file_path)[1].lower()
+        if any(extension in extensions for extensions in COLUMNAR_FORMATS.values()):
+            df = read_columnar(file_path, fmt=detect_format(file_path))
+        else:
+            df = pd.read_csv(file_path)
+        return self.import_frame(df, **kwargs)
+
+    def _snapshot_frame(self, base):
+        with self._lock:
+            if base in self._snapshots:
+                return self._snapshots[base]
+        frame = self.store.read((SNAPSHOT_KEY, base))
+        with self._lock:
+            self._snapshots[base] = frame
+        return frame
+
+    def _stored_arrays(self, base, quote):
+        series = []
+        frame = self.store.read((base, quote))
+        if frame is not None and not frame.empty:
+            series.append(frame["rate"])
+        snapshots = self._snapshot_frame(base)
+        if snapshots is not None and quote in snapshots.columns:
+            series.append(snapshots[quote].dropna())
+        if not series:
+            return None
+        rates = pd.concat(series).sort_index(kind="stable")
+        rates = rates[~rates.index.duplicated(keep="last")]
+        if rates.empty:
+            return None
+        return rates.index.values.astype("datetime64[ns]"), rates.to_numpy(dtype="float64")
+
+    def _pair_legs(self, base, quote):
+        """Return the (timestamps, rates) legs whose product gives ``quote`` per ``base``, or None.
+
+        A stored or inverted pair is one leg; a cross through the anchor is two, each
+        looked up on its own timestamps so ``tolerance`` applies to every leg.
+        """
+        key = (base, quote)
+        with self._lock:
+            if key in self._legs:
+                return self._legs[key]
+        legs = None
+        arrays = self._stored_arrays(base, quote)
+        if arrays is None:
+            inverse = self._stored_arrays(quote, base)
+            if inverse is not None:
+                arrays = inverse[0], 1.0 / inverse[1]
+        if arrays is not None:
+            legs = [arrays]
+        elif self.anchor not in key:
+            first = self._pair_legs(base, self.anchor)
+            second = self._pair_legs(self.anchor, quote)
+            if first is not None and second is not None:
+                legs = first + second
+        with self._lock:
+            self._legs[key] = legs
+        return legs
+
+    def rates_asof(self, base, quote, timestamps, tolerance=None):
+        """Return the latest rate at or before each timestamp (NaN where none is known).
+
+        With ``tolerance``, a rate is NaN when any leg's last observation is older than that.
+        """
+        base, quote = base.upper(), quote.upper()
+        times = _to_utc_naive(timestamps)
+        if base == quote:
+            return np.ones(len(times))
+        legs = self._pair_legs(base, quote)
+        if legs is None:
+            return np.full(len(times), np.nan)
+        result = np.ones(len(times))
+        for leg in legs:
+            result *= _asof(leg, times, tolerance)
+        return result
+
+    def rate_at(self, base, quote, timestamp):
+        return float(self.rates_asof(base, quote, [timestamp])[0])
+
+    def convert(self, df, amount_column, currency_column, date_column, to="USD", tolerance=None):
+        """Convert a column of amounts in mixed currencies into ``to`` at each row's as-of rate.
+
+        Rows are grouped by currency and each group is resolved with one vectorized
+        lookup. Returns a float Series aligned with ``df``; rows without a rate are NaN.
+        """
+        codes, currencies = pd.factorize(df[currency_column].astype(str).str.upper())
+        times = _to_utc_naive(df[date_column])
+        amounts = pd.to_numeric(df[amount_column], errors="coerce").to_numpy(dtype="float64")
+        rates = np.full(len(df), np.nan)
+        for code, currency in enumerate(currencies):
+            mask = codes == code
+            rates[mask] = self.rates_asof(currency, to, times[mask], tolerance)
+        return pd.Series(amounts * rates, index=df.index, name=f"{amount_column}_{to.upper()}")
+
+def _to_utc_naive(timestamps):
+    times = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True)).tz_convert(None)
+    return times.values.astype("datetime64[ns]")
+
+def _asof(arrays, times, tolerance=None):
+    """Vectorized as-of lookup of ``times`` in sorted ``(timestamps, rates)`` arrays."""
+    stamps, rates = arrays
+    positions = np.searchsorted(stamps, times, side="right") - 1
+    found = positions >= 0
+    result = np.where(found, rates[positions.clip(0)], np.nan)
+    if tolerance is not None:
+        too_old = times - stamps[positions.clip(0)] > pd.Timedelta(tolerance).to_timedelta64()
+        result[too_old] = np.nan
+    return result
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Latest anchor rate vector, persisted so one-shot commands can reuse it.
+FX_MATRIX_PATH = os.path.join(os.path.expanduser("~/.quant_app_cache"), "fx", "latest_rates.json")
+# Rates younger than this are served locally instead of being fetched again.
+DEFAULT_FX_MAX_AGE = 5 * 60
+
+class RateMatrix:
+    """Latest FX rates for one anchor currency, from which every cross is derived.
+
+    The anchor response is kept as a vector ``v`` of units of each currency per unit
+    of the anchor. Rates for any base ``b`` are ``v / v[b]`` and the full cross
+    matrix is ``outer(1 / v, v)``, so one fetch serves every base.
+    """
+
+    def __init__(self, max_age=DEFAULT_FX_MAX_AGE, path=None):
+        self.max_age = max_age
+        self.path = path
+        self.anchor = None
+        self.currencies = np.array([], dtype=object)
+        self.vector = np.array([], dtype="float64")
+        self.fetched_at = None
+        self._positions = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def update(self, anchor, rates, fetched_at=None):
+        """Replace the rate vector with ``rates`` (currency -> units per ``anchor``)."""
+        anchor = anchor.upper()
+        rates = {currency.upper(): rate for currency, rate in rates.items() if rate}
+        rates[anchor] = 1.0
+        currencies = np.array(sorted(rates), dtype=object)
+        vector = np.array([rates[c] for c in currencies], dtype="float64")
+        with self._lock:
+            self.anchor = anchor
+            self.currencies = currencies
+            self.vector = vector
+            self.fetched_at = fetched_at if fetched_at is not None else time.time()
+            self._positions = {currency: i for i, currency in enumerate(currencies)}
+        if self.path:
+            self._save()
+
+    def age(self, now=None):
+        """Seconds since the vector was fetched, or None when empty."""
+        if self.fetched_at is None:
+            return None
+        return (now if now is not None else time.time()) - self.fetched_at
+
+    def is_fresh(self, now=None):
+        age = self.age(now)
+        return age is not None and age <= self.max_age
+
+    def has(self, currency):
+        return currency.upper() in self._positions
+
+    def rates(self, base):
+        """Return a Series of units of each currency per unit of ``base``."""
+        with self._lock:
+            position = self._positions.get(base.upper())
+            if position is None:
+                raise KeyError(f"No rate for {base.upper()}")
+            return pd.Series(self.vector / self.vector[position], index=self.currencies, name=base.upper())
+
+    def matrix(self, currencies=None):
+        """Return the cross matrix; cell (row, column) is units of column per unit of row."""
+        with self._lock:
+            if currencies:
+                missing = [c.upper() for c in currencies if c.upper() not in self._positions]
+                if missing:
+                    raise KeyError(f"No rate for {', '.join(missing)}")
+                positions = np.array([self._positions[c.upper()] for c in currencies])
+            else:
+                positions = np.arange(len(self.currencies))
+            vector = self.vector[positions]
+            labels = self.currencies[positions]
+        return pd.DataFrame(np.outer(1.0 / vector, vector), index=labels, columns=labels)
+
+    def convert(self, amounts, from_currency, to_currency):
+        """Convert a scalar or array of amounts between two currencies."""
+        with self._lock:
+            try:
+                ratio = self.vector[self._positions[to_currency.upper()]] / self.vector[self._positions[from_currency.upper()]]
+            except KeyError as e:
+                raise KeyError(f"No rate for {e.args[0]}") from None
+        return np.asarray(amounts, dtype="float64") * ratio
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            state = {"anchor": self.anchor, "fetched_at": self.fetched_at,
+                     "rates": dict(zip(self.currencies.tolist(), self.vector.tolist()))}
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        path, self.path = self.path, None  # Do not rewrite the file while loading it.
+        self.update(state["anchor"], state["rates"], state["fetched_at"])
+        self.path = path
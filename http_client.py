@@ -0,0 +1,123 @@
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import acquire_for_url
+from single_flight import get_default_group
+from cassette import get_default_cassette
+
+# (connect, read) timeouts in seconds for provider requests.
+DEFAULT_TIMEOUT = (5, 30)
+# Keep-alive connections kept open per host; requests beyond this wait for a free connection.
+DEFAULT_POOL_MAXSIZE = 8
+# Responses retried with exponential backoff (honouring Retry-After).
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Query parameters left out of cassette keys so recordings never contain credentials.
+SECRET_PARAMS = ("api_key", "apikey", "token")
+
+class HTTPClient:
+    """Shared pooled HTTP client for the REST data providers.
+
+    A single ``requests.Session`` keeps connections alive across calls, caps the
+    connections opened per host, applies default timeouts, and retries 429/5xx
+    responses and connection errors with exponential backoff. Every attempt, retries
+    included, waits for the provider's rate limiter, so retries never exceed its rate.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff_factor=0.5,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_connections=10, single_flight=None, cassette=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.single_flight = single_flight or get_default_group()
+        self.cassette = cassette or get_default_cassette()
+        # Retries happen in _fetch, not in the adapter, so each one goes through the limiter.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=0,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url, params=None, priority=None, **kwargs):
+        """Issue a GET through the pooled session, after the provider's rate limiter releases it.
+
+        Identical concurrent GETs (same URL and params) share one request and response.
+        """
+        key = ("http", url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        return self.single_flight.do(key, lambda: self._get(url, params, priority, **kwargs))
+
+    def _get(self, url, params, priority, **kwargs):
+        if self.cassette.mode == "off":
+            return self._fetch(url, params, priority, **kwargs)
+        key = (url, tuple(sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)))
+        recorded = self.cassette.call("http", key, lambda: _serialize(self._fetch(url, params, priority, **kwargs)))
+        return _deserialize(recorded)
+
+    def _fetch(self, url, params, priority, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.retries + 1):
+            acquire_for_url(url, priority)
+            try:
+                response = self.session.get(url, params=params, **kwargs)
+            except requests.ConnectionError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff_factor * 2 ** attempt)
+                continue
+            # Read the body now so followers can share the response (and the connection is reused).
+            response.content
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            delay = _retry_after(response)
+            time.sleep(self.backoff_factor * 2 ** attempt if delay is None else delay)
+
+    def close(self):
+        self.session.close()
+
+def _retry_after(response):
+    """Seconds to wait from a Retry-After header (seconds or an HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _serialize(response):
+    """Reduce a response to plain data for the cassette store, dropping the query string."""
+    return {
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "content": response.content,
+        "encoding": response.encoding,
+        "url": response.url.split("?", 1)[0],
+    }
+
+def _deserialize(recorded):
+    response = requests.Response()
+    response.status_code = recorded["status_code"]
+    response.reason = recorded["reason"]
+    response.headers.update(recorded["headers"])
+    response._content = recorded["content"]
+    response.encoding = recorded["encoding"]
+    response.url = recorded["url"]
+    return response
+
+_default_client = None
+
+def get_default_client():
+    """Return the process-wide client shared by CryptoData, ForexData and MacroData."""
+    global _default_client
+    if _default_client is None:
+        _default_client = HTTPClient()
+    return _default_client
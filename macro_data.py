@@ -1,45 +1,98 @@
+import pandas as pd
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
+from http_client import get_default_client
 
 console = Console()
 
+# FRED series are revised and extended at most daily; stored series younger than this are not re-checked.
+DEFAULT_FRED_REFRESH_SECONDS = 6 * 60 * 60
+
+# Panel frequencies as pandas rules. FRED dates observations at the start of each period.
+PANEL_FREQUENCIES = {"D": "D", "W": "W", "M": "MS", "Q": "QS", "A": "YS"}
+PANEL_AGGREGATIONS = ("last", "first", "mean", "sum")
+PANEL_FILLS = ("ffill", "interpolate", "none")
+
+def parse_observations(observations):
+    """Parse FRED observation dicts into a float ``value`` column indexed by date.
+
+    FRED sends values as strings with ``.`` for missing; the whole column is converted
+    in one pass, with missing values as NaN.
+    """
+    df = pd.DataFrame.from_records(observations or [], columns=["date", "value"])
+    values = pd.to_numeric(df["value"], errors="coerce").astype("float64")
+    index = pd.DatetimeIndex(pd.to_datetime(df["date"], format="%Y-%m-%d"), name="date")
+    return pd.DataFrame({"value": values.to_numpy()}, index=index)
+
 class MacroData:
-    def __init__(self):
+    def __init__(self, http_client=None, series_store=None, refresh_seconds=DEFAULT_FRED_REFRESH_SECONDS):
+        self.http = http_client or get_default_client()
         # FRED API key is required for most endpoints. Store it in config.
         self.base_url = "https://api.stlouisfed.org/fred/series/observations"
+        # Optional SeriesStore of parsed observations; when set, only new observations are requested.
+        self.series_store = series_store
+        self.refresh_seconds = refresh_seconds
+
+    def _request_observations(self, series_id, api_key, observation_start=None, observation_end=None):
+        params = {
+            "series_id": series_id,
+            "api_key": api_key,
+            "file_type": "json",
+        }
+        if observation_start is not None:
+            params["observation_start"] = pd.Timestamp(observation_start).strftime("%Y-%m-%d")
+        if observation_end is not None:
+            params["observation_end"] = pd.Timestamp(observation_end).strftime("%Y-%m-%d")
+        response = self.http.get(self.base_url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        if not data or "observations" not in data:
+            return None
+        return parse_observations(data["observations"])
+
+    def fetch_series(self, series_id, api_key, observation_start=None, observation_end=None):
+        """Return a FRED series as a float DataFrame, served from the local store when one is set.
+
+        With a store, the first call downloads from ``observation_start`` (or the full
+        history) and later calls request only observations from the last stored date on.
+        """
+        series_id = series_id.upper()
+        if self.series_store is None:
+            return self._request_observations(series_id, api_key, observation_start, observation_end)
+
+        def fetcher(range_start, range_end):
+            try:
+                return self._request_observations(series_id, api_key, range_start, range_end)
+            except requests.exceptions.RequestException as e:
+                console.print(f"[bold red]Error fetching FRED series {series_id}:[/bold red] {e}")
+                return None
+
+        df = self.series_store.fetch_incremental(series_id, observation_start, fetcher, refresh_seconds=self.refresh_seconds)
+        if df is not None and observation_end is not None:
+            df = df[df.index <= pd.Timestamp(observation_end)]
+        return df
 
     def get_fred_series(self, series_id, api_key, observation_start=None, observation_end=None):
-        """Get observations for a FRED series."""
+        """Get observations for a FRED series as a DataFrame with a float ``value`` column."""
         if not api_key:
             console.print("[bold red]Error:[/bold red] FRED API key not configured. Use 'config set fred_api_key YOUR_KEY'.")
             return None
 
         try:
-            params = {
-                "series_id": series_id,
-                "api_key": api_key,
-                "file_type": "json",
-            }
-            if observation_start:
-                params["observation_start"] = observation_start
-            if observation_end:
-                params["observation_end"] = observation_end
-
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data and "observations" in data:
+            df = self.fetch_series(series_id, api_key, observation_start, observation_end)
+
+            if df is not None and not df.empty:
                 table = Table(title=f"[bold blue]FRED Series: {series_id.upper()}[/bold blue]")
                 table.add_column("Date", style="cyan")
                 table.add_column("Value", style="magenta")
 
-                for obs in data["observations"]:
-                    table.add_row(obs["date"], obs["value"])
+                for date, value in df["value"].items():
+                    table.add_row(date.strftime("%Y-%m-%d"), "." if pd.isna(value) else f"{value:g}")
                 
                 console.print(table)
-                return data["observations"]
+                return df
             else:
                 console.print(f"[yellow]No data found for FRED series {series_id.upper()}.[/yellow]")
                 return None
@@ -47,6 +100,52 @@ class MacroData:
             console.print(f"[bold red]Error fetching FRED series {series_id}:[/bold red] {e}")
             return None
 
+    def get_panel(self, series_ids, api_key, freq="M", how="last", fill="ffill", observation_start=None,
+                  observation_end=None, max_workers=4):
+        """Fetch several FRED series concurrently and align them on one frequency.
+
+        Series observed more often than ``freq`` are aggregated with ``how``; slower
+        series are spread onto the finer grid with ``fill`` (``ffill`` carries the
+        latest known value forward). Leading rows before every series has started are
+        dropped. Returns ``(panel, failures)`` where ``failures`` maps series to errors.
+        """
+        rule = PANEL_FREQUENCIES[freq.upper()]
+        series_ids = list(dict.fromkeys(s.upper() for s in series_ids))
+
+        def fetch(series_id):
+            try:
+                df = self.fetch_series(series_id, api_key, observation_start, observation_end)
+                if df is None or df.empty:
+                    return series_id, None, "no observations"
+                return series_id, df["value"], None
+            except requests.exceptions.RequestException as e:
+                return series_id, None, str(e)
+
+        columns = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for series_id, values, error in executor.map(fetch, series_ids):
+                if error:
+                    failures[series_id] = error
+                else:
+                    resampled = values.dropna().resample(rule)
+                    # min_count keeps empty periods NaN so they can be filled instead of summing to 0.
+                    columns[series_id] = resampled.sum(min_count=1) if how == "sum" else resampled.agg(how)
+        if not columns:
+            return None, failures
+
+        panel = pd.concat(columns, axis=1).sort_index()
+        if fill == "ffill":
+            panel = panel.ffill()
+        elif fill == "interpolate":
+            panel = panel.interpolate(method="time", limit_area="inside")
+        starts = [panel[column].first_valid_index() for column in panel.columns]
+        starts = [start for start in starts if start is not None]
+        if starts:
+            panel = panel.loc[max(starts):]
+        panel.index.name = "date"
+        return panel, failures
+
     def get_inflation_rate(self, api_key, start_date=None, end_date=None):
         """Get US inflation rate (CPIAUCSL series)."""
         console.print("[green]Fetching US Inflation Rate (CPIAUCSL)...[/green]")
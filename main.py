@@ -15,16 +15,17 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.completion import WordCompleter
 import json
+import pandas as pd
 import time
 
 # Import DataManager, APIManager, DBManager, MarketData, CryptoData, ForexData, MacroData, Charting, Analytics, PortfolioManager, TradingSimulator, Reporting, ConfigManager, and SecurityManager
-from data_manager import DataManager
+from data_manager import DataManager, DEFAULT_CHUNKSIZE, DEFAULT_NDJSON_BATCH
 from api_manager import APIManager
-from db_manager import DBManager
+from db_manager import DBManager, DEFAULT_CHUNK_ROWS
 from market_data import MarketData
 from crypto_data import CryptoData
 from forex_data import ForexData
-from macro_data import MacroData
+from macro_data import MacroData, PANEL_FREQUENCIES, PANEL_AGGREGATIONS, PANEL_FILLS
 from charting import Charting
 from analytics import Analytics
 from portfolio_manager import PortfolioManager
@@ -32,6 +33,14 @@ from trading_simulator import TradingSimulator
 from reporting import Reporting
 from config_manager import ConfigManager
 from security import SecurityManager
+from series_store import SeriesStore
+from cache import TTLCache, CACHE_DIR
+from columnar_io import COLUMNAR_FORMATS, detect_format
+from rate_limiter import configure_rate_limits
+from single_flight import get_default_group
+from cassette import get_default_cassette, CASSETTE_DIR
+from fx_matrix import FX_MATRIX_PATH, DEFAULT_FX_MAX_AGE
+from fx_history import FXHistory
 
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -49,19 +58,38 @@ session = PromptSession(history=FileHistory(HISTORY_FILE))
 command_completer = WordCompleter([], ignore_case=True)
 
 # Initialize managers
+config_manager = ConfigManager()
+configure_rate_limits(config_manager.get_rate_limits())
+# Reuse a finished fetch for identical requests issued within this many seconds (e.g. from scripts and aliases).
+get_default_group().linger = float(config_manager.get("single_flight_linger", 2.0))
+# Record provider responses, or replay them offline with artificial latency ('config cassette').
+get_default_cassette().configure(
+    mode=config_manager.get("cassette_mode", "off"),
+    latency=config_manager.get("cassette_latency", 0.0),
+    directory=config_manager.get("cassette_dir", CASSETTE_DIR),
+)
+bar_store = SeriesStore("ohlcv")
+ticker_cache = TTLCache(
+    ttls=config_manager.get("cache_ttls", {}),
+    max_entries=int(config_manager.get("cache_max_entries", 512)),
+    disk_dir=CACHE_DIR if config_manager.get("cache_persist", True) else None,
+)
 data_manager = DataManager()
-api_manager = APIManager()
+api_manager = APIManager(bar_store=bar_store)
 db_manager = DBManager()
-market_data = MarketData()
-crypto_data = CryptoData()
-forex_data = ForexData()
-macro_data = MacroData()
+market_data = MarketData(bar_store=bar_store, cache=ticker_cache)
+crypto_data = CryptoData(price_store=SeriesStore("crypto"))
+# Any base and the cross matrix are derived from the latest USD rates while younger than 'fx_max_age' seconds.
+# Set 'fx_record_rates' to also record every live fetch in the FX history ('forex snapshot' always records).
+forex_data = ForexData(max_age=float(config_manager.get("fx_max_age", DEFAULT_FX_MAX_AGE)), matrix_path=FX_MATRIX_PATH,
+                       history=FXHistory(SeriesStore("fx")),
+                       record_history=str(config_manager.get("fx_record_rates", False)).lower() in ("1", "true", "yes"))
+macro_data = MacroData(series_store=SeriesStore("fred"))
 charting = Charting()
 analytics = Analytics()
 portfolio_manager = PortfolioManager()
 trading_simulator = TradingSimulator()
 reporting = Reporting()
-config_manager = ConfigManager()
 security_manager = SecurityManager()
 
 # Global variable to store loaded stock data
@@ -153,6 +181,47 @@ def load(ctx, ticker):
     else:
         console.print(f"[bold red]Error:[/bold red] Could not load data for {ticker.upper()}.")
 
+@stocks.command(name="load-many")
+@click.argument("tickers", nargs=-1)
+@click.option("--file", "ticker_file", help="File with tickers, separated by commas, spaces or newlines.")
+@click.option("--period", default="1y", help="Period for historical data (e.g., 1mo, 1y, 5y, max).")
+@click.option("--interval", default="1d", help="Interval for historical data (e.g., 1h, 1d, 1wk).")
+@click.option("--batch_size", default=50, type=int, help="Tickers per download request.")
+@click.option("--workers", default=4, type=int, help="Maximum concurrent download requests.")
+@click.option("--layout", default="long", type=click.Choice(["long", "wide"]), help="Panel layout: long (Symbol, Date rows) or wide (Symbol columns).")
+@click.pass_context
+def load_many(ctx, tickers, ticker_file, period, interval, batch_size, workers, layout):
+    """Load stock data for many tickers in batched, concurrent downloads."""
+    global current_stock_data
+    symbols = list(tickers)
+    if ticker_file:
+        try:
+            with open(ticker_file, "r") as f:
+                symbols.extend(f.read().replace(",", " ").split())
+        except OSError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            return
+    if not symbols:
+        console.print("[bold red]Error:[/bold red] Provide tickers as arguments or with --file.")
+        return
+    console.print(f"[green]Loading stock data for {len(symbols)} tickers...[/green]")
+    df, failures, elapsed = ctx.obj["API_MANAGER"].get_yfinance_batch_data(
+        symbols, period=period, interval=interval, batch_size=batch_size, max_workers=workers, layout=layout
+    )
+    if failures:
+        table = Table(title="[bold red]Tickers that failed to load[/bold red]")
+        table.add_column("Ticker", style="cyan")
+        table.add_column("Error", style="red")
+        for symbol, error in failures.items():
+            table.add_row(symbol, error)
+        console.print(table)
+    if df is not None:
+        current_stock_data = df
+        console.print(f"[green]Loaded {len(symbols) - len(failures)} of {len(symbols)} tickers in {elapsed:.2f}s. Shape: {df.shape}[/green]")
+        console.print(df.tail())
+    else:
+        console.print(f"[bold red]Error:[/bold red] Could not load data for any ticker ({elapsed:.2f}s).")
+
 @stocks.command()
 @click.argument("ticker")
 @click.pass_context
@@ -179,6 +248,44 @@ def fundamentals(ctx, ticker):
     console.print(f"[green]Fetching company fundamentals for {ticker.upper()}...[/green]")
     ctx.obj["MARKET_DATA"].get_company_fundamentals(ticker)
 
+@stocks.command(name="fundamentals-many")
+@click.argument("tickers", nargs=-1)
+@click.option("--file", "ticker_file", help="File with tickers, separated by commas, spaces or newlines.")
+@click.option("--workers", default=8, type=int, help="Maximum concurrent requests.")
+@click.pass_context
+def fundamentals_many(ctx, tickers, ticker_file, workers):
+    """Fetch fundamentals and financial statements for many tickers concurrently."""
+    symbols = list(tickers)
+    if ticker_file:
+        try:
+            with open(ticker_file, "r") as f:
+                symbols.extend(f.read().replace(",", " ").split())
+        except OSError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            return
+    if not symbols:
+        console.print("[bold red]Error:[/bold red] Provide tickers as arguments or with --file.")
+        return
+    console.print(f"[green]Fetching fundamentals for {len(symbols)} tickers...[/green]")
+    results, elapsed = ctx.obj["MARKET_DATA"].get_fundamentals_bundle(symbols, max_workers=workers)
+
+    def rows(frame):
+        return str(len(frame)) if frame is not None and not frame.empty else "-"
+
+    table = Table(title=f"[bold blue]Fundamentals ({elapsed:.2f}s)[/bold blue]")
+    table.add_column("Ticker", style="cyan")
+    table.add_column("Sector", style="magenta")
+    table.add_column("Income", style="green")
+    table.add_column("Balance", style="green")
+    table.add_column("Cash Flow", style="green")
+    table.add_column("Errors", style="red")
+    for symbol, result in results.items():
+        info = result.get("info") or {}
+        table.add_row(symbol, str(info.get("sector", "-")), rows(result.get("income_statement")),
+                      rows(result.get("balance_sheet")), rows(result.get("cash_flow")),
+                      "; ".join(f"{part}: {message}" for part, message in result["errors"].items()) or "-")
+    console.print(table)
+
 @stocks.command()
 @click.argument("ticker")
 @click.pass_context
@@ -187,6 +294,28 @@ def financials(ctx, ticker):
     console.print(f"[green]Fetching financial statements for {ticker.upper()}...[/green]")
     ctx.obj["MARKET_DATA"].get_financial_statements(ticker)
 
+@stocks.command()
+@click.option("--clear", is_flag=True, help="Clear all cached quotes, fundamentals and statements.")
+@click.pass_context
+def cache(ctx, clear):
+    """Show hit/miss statistics for the quote and fundamentals cache."""
+    quote_cache = ctx.obj["MARKET_DATA"].cache
+    if quote_cache is None:
+        console.print("[yellow]Caching is disabled.[/yellow]")
+        return
+    if clear:
+        quote_cache.clear()
+        console.print("[green]Cache cleared.[/green]")
+    stats = quote_cache.stats()
+    table = Table(title=f"[bold blue]Ticker Cache ({stats['entries']} entries)[/bold blue]")
+    table.add_column("Kind", style="cyan")
+    table.add_column("TTL (s)", style="magenta")
+    table.add_column("Hits", style="green")
+    table.add_column("Misses", style="red")
+    for kind, kind_stats in stats["kinds"].items():
+        table.add_row(kind, str(kind_stats["ttl"]), str(kind_stats["hits"]), str(kind_stats["misses"]))
+    console.print(table)
+
 @stocks.command()
 @click.pass_context
 def chart(ctx):
@@ -216,11 +345,51 @@ def chart(ctx, coin_id, days):
 
 @crypto.command()
 @click.option("--per_page", default=10, help="Number of cryptocurrencies to display.")
+@click.option("--local", is_flag=True, help="Answer from the latest universe snapshot instead of the API.")
+@click.option("--vs_currency", default="usd", help="Quote currency.")
 @click.pass_context
-def rankings(ctx, per_page):
+def rankings(ctx, per_page, local, vs_currency):
     """Get market cap rankings for cryptocurrencies."""
+    if local:
+        ctx.obj["CRYPTO_DATA"].get_local_rankings(vs_currency=vs_currency, per_page=per_page)
+        return
     console.print("[green]Fetching market cap rankings...[/green]")
-    ctx.obj["CRYPTO_DATA"].get_market_cap_rankings(per_page=per_page)
+    ctx.obj["CRYPTO_DATA"].get_market_cap_rankings(vs_currency=vs_currency, per_page=per_page)
+
+@crypto.command()
+@click.option("--top", default=1000, type=int, help="Number of coins to fetch by market cap.")
+@click.option("--vs_currency", default="usd", help="Quote currency.")
+@click.option("--workers", default=4, type=int, help="Maximum concurrent page requests.")
+@click.pass_context
+def universe(ctx, top, vs_currency, workers):
+    """Fetch the top-N coin universe concurrently and save it as a local snapshot."""
+    console.print(f"[green]Fetching the top {top} cryptocurrencies...[/green]")
+    start_time = time.perf_counter()
+    df, failed_pages = ctx.obj["CRYPTO_DATA"].get_universe(top=top, vs_currency=vs_currency, max_workers=workers)
+    elapsed = time.perf_counter() - start_time
+    if df is not None:
+        console.print(f"[green]Saved a snapshot of {len(df)} coins in {elapsed:.2f}s.[/green]")
+        console.print(df.head())
+    else:
+        console.print(f"[bold red]Error:[/bold red] Could not fetch the coin universe ({len(failed_pages)} pages failed).")
+
+@crypto.command()
+@click.option("--vs_currency", default="usd", help="Quote currency.")
+@click.option("--min_market_cap", type=float, help="Minimum market cap.")
+@click.option("--min_volume", type=float, help="Minimum 24h volume.")
+@click.option("--min_change", type=float, help="Minimum 24h price change (%).")
+@click.option("--max_change", type=float, help="Maximum 24h price change (%).")
+@click.option("--limit", default=20, type=int, help="Number of matches to display.")
+@click.pass_context
+def screen(ctx, vs_currency, min_market_cap, min_volume, min_change, max_change, limit):
+    """Screen the latest universe snapshot locally."""
+    df = ctx.obj["CRYPTO_DATA"].screen_universe(
+        vs_currency=vs_currency, min_market_cap=min_market_cap, min_volume=min_volume,
+        min_change_24h=min_change, max_change_24h=max_change,
+    )
+    if df is not None:
+        console.print(f"[green]{len(df)} coins match.[/green]")
+        console.print(df[["market_cap_rank", "symbol", "name", "current_price", "market_cap", "total_volume", "price_change_percentage_24h"]].head(limit))
 
 @crypto.command()
 @click.argument("coin_id")
@@ -232,11 +401,21 @@ def info(ctx, coin_id):
 
 @crypto.command()
 @click.argument("symbol")
-def load(symbol):
-    """Load cryptocurrency data for a given symbol."""
+@click.option("--vs_currency", default="usd", help="Quote currency.")
+@click.option("--granularity", type=click.Choice(["daily", "hourly", "5m"]), help="Stored series to load (default: first available).")
+@click.option("--interval", help="Resample into candles of this pandas rule (e.g. 4h, 1D, 1W).")
+@click.pass_context
+def load(ctx, symbol, vs_currency, granularity, interval):
+    """Load stored cryptocurrency price history for analysis and charting."""
+    global current_stock_data
     console.print(f"[green]Loading crypto data for {symbol.upper()}...[/green]")
-    # TODO: Implement crypto data loading
-    console.print(f"[yellow]Crypto data loading for {symbol.upper()} - Not implemented yet[/yellow]")
+    df = ctx.obj["CRYPTO_DATA"].load_price_history(symbol, vs_currency=vs_currency, granularity=granularity, interval=interval)
+    if df is not None:
+        current_stock_data = df
+        console.print(f"[green]Successfully loaded stored price history for {symbol.upper()}. Shape: {df.shape}[/green]")
+        console.print(df.tail())
+    else:
+        console.print(f"[yellow]No stored price history for {symbol}. Use ('crypto chart {symbol}') to fetch it first.[/yellow]")
 
 @cli.group()
 def forex():
@@ -245,11 +424,30 @@ def forex():
 
 @forex.command()
 @click.argument("base_currency")
+@click.option("--refresh", is_flag=True, help="Fetch new rates even if the stored ones are fresh.")
 @click.pass_context
-def rates(ctx, base_currency):
+def rates(ctx, base_currency, refresh):
     """Get live exchange rates for a base currency."""
     console.print(f"[green]Fetching live rates for {base_currency.upper()}...[/green]")
-    ctx.obj["FOREX_DATA"].get_live_rates(base_currency)
+    ctx.obj["FOREX_DATA"].get_live_rates(base_currency, refresh=refresh)
+
+@forex.command()
+@click.argument("currencies", nargs=-1)
+@click.pass_context
+def matrix(ctx, currencies):
+    """Show the cross-rate matrix for the given currencies (e.g. USD EUR JPY GBP)."""
+    if len(currencies) < 2:
+        console.print("[bold red]Error:[/bold red] Provide at least two currencies.")
+        return
+    cross = ctx.obj["FOREX_DATA"].get_cross_matrix([c.upper() for c in currencies])
+    if cross is not None:
+        table = Table(title="[bold blue]Cross Rates (units of column per unit of row)[/bold blue]")
+        table.add_column("", style="cyan")
+        for currency in cross.columns:
+            table.add_column(currency, style="magenta")
+        for currency, row in cross.iterrows():
+            table.add_row(currency, *[f"{rate:.4f}" for rate in row])
+        console.print(table)
 
 @forex.command()
 @click.argument("base_currency")
@@ -261,6 +459,59 @@ def history(ctx, base_currency, target_currency, date):
     console.print(f"[green]Fetching historical rate for {base_currency.upper()}/{target_currency.upper()} on {date}...[/green]")
     ctx.obj["FOREX_DATA"].get_historical_chart(base_currency, target_currency, date)
 
+@forex.command()
+@click.pass_context
+def snapshot(ctx):
+    """Fetch the latest rates and record them in the FX history (run periodically, e.g. from cron)."""
+    console.print("[green]Recording an FX rate snapshot...[/green]")
+    recorded = ctx.obj["FOREX_DATA"].record_snapshot()
+    if recorded:
+        console.print(f"[green]Recorded {recorded} rates.[/green]")
+
+@forex.command(name="import")
+@click.argument("file_path")
+@click.option("--base", help="Base currency, for a file holding a single pair.")
+@click.option("--quote", help="Quote currency, for a file holding a single pair.")
+@click.option("--date_column", default="Date", help="Timestamp column.")
+@click.option("--rate_column", default="Close", help="Rate column (units of quote per base).")
+@click.pass_context
+def import_fx(ctx, file_path, base, quote, date_column, rate_column):
+    """Bulk import FX history from CSV/Parquet/Feather (single pair, or long with base/quote columns)."""
+    try:
+        imported = ctx.obj["FOREX_DATA"].history.import_file(
+            file_path, base=base, quote=quote, date_column=date_column, rate_column=rate_column
+        )
+    except (OSError, KeyError, ValueError) as e:
+        console.print(f"[bold red]Error importing FX history:[/bold red] {e}")
+        return
+    for (pair_base, pair_quote), rows in imported.items():
+        console.print(f"[green]Imported {rows} rates for {pair_base}/{pair_quote}.[/green]")
+
+@forex.command()
+@click.option("--amount_column", default="Amount", help="Column with amounts to convert.")
+@click.option("--currency_column", default="Currency", help="Column with each row's currency.")
+@click.option("--date_column", default="Date", help="Column with each row's timestamp.")
+@click.option("--to", "to_currency", default="USD", help="Target currency.")
+@click.option("--tolerance", help="Ignore rates older than this (e.g. 3D, 12h).")
+@click.pass_context
+def convert(ctx, amount_column, currency_column, date_column, to_currency, tolerance):
+    """Convert a column of the loaded data to one currency using as-of historical rates."""
+    global current_stock_data
+    if current_stock_data is None or current_stock_data.empty:
+        console.print("[yellow]No data loaded to convert. Use ('import_data csv <FILE>') first.[/yellow]")
+        return
+    df = current_stock_data.reset_index() if date_column not in current_stock_data.columns else current_stock_data
+    try:
+        converted = ctx.obj["FOREX_DATA"].history.convert(
+            df, amount_column, currency_column, date_column, to=to_currency, tolerance=tolerance
+        )
+    except KeyError as e:
+        console.print(f"[bold red]Error:[/bold red] Column {e} not found.")
+        return
+    current_stock_data[converted.name] = converted.values
+    console.print(f"[green]Added column {converted.name}; {int(converted.isna().sum())} rows had no rate.[/green]")
+    console.print(current_stock_data.tail())
+
 @cli.group()
 def macro():
     """Macroeconomic data commands."""
@@ -324,6 +575,37 @@ def unemployment(ctx, start_date, end_date):
         console.print("[bold red]Error:[/bold red] FRED API key not configured. Use ('config set fred_api_key YOUR_KEY').")       
     return ctx.obj["MACRO_DATA"].get_unemployment_rate(api_key, start_date, end_date)
 
+@macro.command()
+@click.argument("series_ids", nargs=-1)
+@click.option("--freq", default="M", type=click.Choice(list(PANEL_FREQUENCIES), case_sensitive=False), help="Common frequency: D, W, M, Q or A.")
+@click.option("--how", default="last", type=click.Choice(PANEL_AGGREGATIONS), help="Aggregation for series faster than --freq.")
+@click.option("--fill", default="ffill", type=click.Choice(PANEL_FILLS), help="Fill for series slower than --freq.")
+@click.option("--start_date", help="Start date (YYYY-MM-DD).")
+@click.option("--end_date", help="End date (YYYY-MM-DD).")
+@click.option("--workers", default=4, type=int, help="Maximum concurrent requests.")
+@click.pass_context
+def panel(ctx, series_ids, freq, how, fill, start_date, end_date, workers):
+    """Fetch several FRED series concurrently into one aligned panel (e.g. CPIAUCSL GDP FEDFUNDS UNRATE)."""
+    global current_stock_data
+    api_key = ctx.obj["CONFIG_MANAGER"].get("fred_api_key")
+    if not api_key:
+        console.print("[bold red]Error:[/bold red] FRED API key not configured. Use ('config set fred_api_key YOUR_KEY').")
+        return
+    if not series_ids:
+        console.print("[bold red]Error:[/bold red] Provide at least one FRED series ID.")
+        return
+    console.print(f"[green]Fetching {len(series_ids)} FRED series...[/green]")
+    df, failures = ctx.obj["MACRO_DATA"].get_panel(
+        series_ids, api_key, freq=freq, how=how, fill=fill,
+        observation_start=start_date, observation_end=end_date, max_workers=workers,
+    )
+    for series_id, error in failures.items():
+        console.print(f"[bold red]Error:[/bold red] Could not load {series_id}: {error}")
+    if df is not None:
+        current_stock_data = df
+        console.print(f"[green]Loaded a {freq.upper()} panel of {df.shape[1]} series. Shape: {df.shape}[/green]")
+        console.print(df.tail())
+
 @cli.group()
 def portfolio():
     """Portfolio management commands."""
@@ -449,6 +731,45 @@ def delete_alias(ctx, alias):
     """Delete a command alias."""
     ctx.obj["CONFIG_MANAGER"].delete_alias(alias)
 
+@config.command()
+@click.argument("provider", type=click.Choice(["coingecko", "fred", "exchangerate", "yfinance"]))
+@click.argument("rate", type=click.FloatRange(min=0, min_open=True))
+@click.option("--burst", default=5, type=int, help="Requests allowed back-to-back before throttling.")
+@click.pass_context
+def rate_limit(ctx, provider, rate, burst):
+    """Set the request rate limit (requests/sec) for a data provider."""
+    ctx.obj["CONFIG_MANAGER"].set_rate_limit(provider, rate, burst)
+    configure_rate_limits({provider: {"rate": rate, "burst": burst}})
+
+@config.command()
+def fetch_stats():
+    """Show how many data requests were fetched and how many were deduplicated."""
+    stats = get_default_group().stats()
+    if not stats:
+        console.print("[yellow]No data requests made yet.[/yellow]")
+        return
+    table = Table(title="[bold blue]Request Coalescing[/bold blue]")
+    table.add_column("Source", style="cyan")
+    table.add_column("Fetched", style="green")
+    table.add_column("Deduplicated", style="magenta")
+    for source, counts in stats.items():
+        table.add_row(source, str(counts["calls"]), str(counts["deduplicated"]))
+    console.print(table)
+
+@config.command()
+@click.argument("mode", type=click.Choice(["off", "record", "replay"]))
+@click.option("--latency", default="0", help="Replay delay in seconds, or 'recorded' to reuse the measured delay.")
+@click.option("--directory", default=None, help="Directory for recorded responses.")
+@click.pass_context
+def cassette(ctx, mode, latency, directory):
+    """Record provider responses or replay them offline."""
+    latency_value = latency if latency == "recorded" else float(latency)
+    ctx.obj["CONFIG_MANAGER"].set("cassette_mode", mode)
+    ctx.obj["CONFIG_MANAGER"].set("cassette_latency", latency_value)
+    if directory:
+        ctx.obj["CONFIG_MANAGER"].set("cassette_dir", directory)
+    get_default_cassette().configure(mode=mode, latency=latency_value, directory=directory)
+
 @config.command()
 @click.argument("theme_name")
 @click.pass_context
@@ -463,13 +784,38 @@ def import_data():
 
 @import_data.command(name='csv')
 @click.argument('file_path')
+@click.option('--stream', is_flag=True, help='Read the file in bounded chunks instead of all at once.')
+@click.option('--chunksize', default=None, type=int, help='Rows per chunk when streaming (implies --stream).')
+@click.option('--columns', multiple=True, help='Columns to keep (e.g., --columns Date --columns Close).')
+@click.option('--dtype', 'dtypes', multiple=True, help='Dtype hint as COLUMN=TYPE (e.g., --dtype Close=float32).')
+@click.option('--date_column', help='Column to parse as dates and to filter by --start/--end.')
+@click.option('--symbol', 'symbols', multiple=True, help='Keep only rows for these symbols.')
+@click.option('--symbol_column', default='Symbol', help='Column holding the symbol for --symbol filtering.')
+@click.option('--start', help='Keep rows on or after this date (YYYY-MM-DD).')
+@click.option('--end', help='Keep rows on or before this date (YYYY-MM-DD).')
 @click.pass_context
-def import_csv(ctx, file_path):
+def import_csv(ctx, file_path, stream, chunksize, columns, dtypes, date_column, symbols, symbol_column, start, end):
     """Import data from a CSV file."""
     try:
-        df = ctx.obj["DATA_MANAGER"].load_csv(file_path)
-        console.print(f"[green]Successfully loaded CSV from {file_path}. Shape: {df.shape}[/green]")
-        console.print(df.head())
+        if stream or chunksize or columns or dtypes or date_column or symbols or start or end:
+            # Only the row count and the first rows are shown, so never hold more than one chunk.
+            rows, head = ctx.obj["DATA_MANAGER"].scan_csv(
+                file_path,
+                chunksize=chunksize or DEFAULT_CHUNKSIZE,
+                columns=list(columns) or None,
+                dtypes=dict(d.split('=', 1) for d in dtypes) or None,
+                date_column=date_column,
+                symbols=list(symbols) or None,
+                symbol_column=symbol_column,
+                start=start,
+                end=end,
+            )
+            console.print(f"[green]Successfully scanned CSV from {file_path}. Shape: {(rows, len(head.columns))}[/green]")
+            console.print(head)
+        else:
+            df = ctx.obj["DATA_MANAGER"].load_csv(file_path)
+            console.print(f"[green]Successfully loaded CSV from {file_path}. Shape: {df.shape}[/green]")
+            console.print(df.head())
     except FileNotFoundError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
     except Exception as e:
@@ -478,11 +824,12 @@ def import_csv(ctx, file_path):
 @import_data.command(name='excel')
 @click.argument('file_path')
 @click.option('--sheet', default=0, help='Sheet name or index to load from Excel file.')
+@click.option('--no_cache', is_flag=True, help='Re-parse the workbook instead of using the conversion cache.')
 @click.pass_context
-def import_excel(ctx, file_path, sheet):
+def import_excel(ctx, file_path, sheet, no_cache):
     """Import data from an Excel file."""
     try:
-        df = ctx.obj["DATA_MANAGER"].load_excel(file_path, sheet_name=sheet)
+        df = ctx.obj["DATA_MANAGER"].load_excel(file_path, sheet_name=sheet, use_cache=not no_cache)
         console.print(f"[green]Successfully loaded Excel from {file_path} (Sheet: {sheet}). Shape: {df.shape}[/green]")
         console.print(df.head())
     except FileNotFoundError as e:
@@ -490,6 +837,86 @@ def import_excel(ctx, file_path, sheet):
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/bold red] {e}")
 
+@import_data.command(name='parquet')
+@click.argument('file_path')
+@click.option('--columns', multiple=True, help='Columns to read (e.g., --columns Close). Reads all columns if omitted.')
+@click.pass_context
+def import_parquet(ctx, file_path, columns):
+    """Import data from a Parquet file."""
+    global current_stock_data
+    try:
+        df = ctx.obj["DATA_MANAGER"].load_parquet(file_path, columns=list(columns) or None)
+        current_stock_data = df
+        console.print(f"[green]Successfully loaded Parquet from {file_path}. Shape: {df.shape}[/green]")
+        console.print(df.head())
+    except FileNotFoundError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+    except Exception as e:
+        console.print(f"[bold red]An error occurred:[/bold red] {e}")
+
+@import_data.command(name='feather')
+@click.argument('file_path')
+@click.option('--columns', multiple=True, help='Columns to read (e.g., --columns Close). Reads all columns if omitted.')
+@click.pass_context
+def import_feather(ctx, file_path, columns):
+    """Import data from an Arrow IPC/Feather file."""
+    global current_stock_data
+    try:
+        df = ctx.obj["DATA_MANAGER"].load_feather(file_path, columns=list(columns) or None)
+        current_stock_data = df
+        console.print(f"[green]Successfully loaded Feather from {file_path}. Shape: {df.shape}[/green]")
+        console.print(df.head())
+    except FileNotFoundError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+    except Exception as e:
+        console.print(f"[bold red]An error occurred:[/bold red] {e}")
+
+def _columnar_output(ctx, param, value):
+    """Validate an output path whose extension selects Parquet or Feather."""
+    if value is None:
+        return None
+    try:
+        detect_format(value)
+    except ValueError:
+        extensions = ", ".join(ext for exts in COLUMNAR_FORMATS.values() for ext in exts)
+        raise click.BadParameter(f"unknown file extension; use one of {extensions}.")
+    return value
+
+@import_data.command(name='glob')
+@click.argument('pattern')
+@click.option('--symbol_column', default='Symbol', help='Column holding the symbol; derived from the path if missing.')
+@click.option('--date_column', default='Date', help='Column holding the timestamp.')
+@click.option('--symbol_from', default='stem', type=click.Choice(['stem', 'parent']), help='Derive missing symbols from the file name or its parent directory.')
+@click.option('--workers', default=None, type=int, help='Number of worker processes (defaults to all cores).')
+@click.option('--output', callback=_columnar_output, help='Write the combined frame to a Parquet (.parquet/.pq) or Feather (.feather/.arrow/.ipc) file.')
+@click.option('--table', help='Write the combined frame to this SQLite table.')
+@click.pass_context
+def import_glob(ctx, pattern, symbol_column, date_column, symbol_from, workers, output, table):
+    """Import many CSV files matching a glob pattern in parallel."""
+    global current_stock_data
+    try:
+        df, failures = ctx.obj["DATA_MANAGER"].load_glob(
+            pattern, symbol_column=symbol_column, date_column=date_column,
+            symbol_from=symbol_from, max_workers=workers,
+        )
+        if df is None:
+            console.print(f"[yellow]No data imported from {pattern}.[/yellow]")
+            return
+        current_stock_data = df
+        console.print(f"[green]Successfully loaded files matching {pattern}. Shape: {df.shape}[/green]")
+        console.print(df.head())
+        if output and detect_format(output) == "parquet":
+            ctx.obj["REPORTING"].export_dataframe_to_parquet(df, output)
+        elif output:
+            ctx.obj["REPORTING"].export_dataframe_to_feather(df, output)
+        if table:
+            ctx.obj["DB_MANAGER"].save_dataframe(df.reset_index(), table)
+            console.print(f"[green]Successfully saved data to table ('{table}').[/green]")
+    except FileNotFoundError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+    except Exception as e:
+        console.print(f"[bold red]An error occurred:[/bold red] {e}")
+
 @import_data.command(name='json')
 @click.argument('file_path')
 @click.pass_context
@@ -504,6 +931,39 @@ def import_json(ctx, file_path):
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/bold red] {e}")
 
+@import_data.command(name='ndjson')
+@click.argument('file_path')
+@click.option('--fields', multiple=True, help='Fields to keep, dotted for nested keys (e.g., --fields price --fields trade.side).')
+@click.option('--dtype', 'dtypes', multiple=True, help='Dtype hint as FIELD=TYPE (e.g., --dtype price=float64 --dtype ts=datetime64[ns]).')
+@click.option('--batch_size', default=DEFAULT_NDJSON_BATCH, type=int, help='Records per streamed batch.')
+@click.pass_context
+def import_ndjson(ctx, file_path, fields, dtypes, batch_size):
+    """Import data from a newline-delimited JSON file."""
+    global current_stock_data
+    try:
+        df = ctx.obj["DATA_MANAGER"].load_ndjson(
+            file_path,
+            fields=list(fields) or None,
+            dtypes=dict(d.split('=', 1) for d in dtypes) or None,
+            batch_size=batch_size,
+        )
+        current_stock_data = df
+        console.print(f"[green]Successfully loaded NDJSON from {file_path}. Shape: {df.shape}[/green]")
+        console.print(df.head())
+    except FileNotFoundError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+    except Exception as e:
+        console.print(f"[bold red]An error occurred:[/bold red] {e}")
+
+# Storage formats of the 'db' commands; 'config set db_backend <format>' picks the default.
+DB_FORMATS = ['sqlite', 'timeseries', 'parquet', 'feather', 'dataset']
+
+def _db_format(ctx, fmt):
+    fmt = fmt or ctx.obj["CONFIG_MANAGER"].get("db_backend", "sqlite")
+    if fmt not in DB_FORMATS:
+        raise click.BadParameter(f"db_backend must be one of {', '.join(DB_FORMATS)}, not '{fmt}'.")
+    return fmt
+
 @cli.group()
 def db():
     """Database management commands."""
@@ -511,13 +971,26 @@ def db():
 
 @db.command()
 @click.argument('table_name')
+@click.option('--format', 'fmt', type=click.Choice(DB_FORMATS), help="Storage format for the table (timeseries: typed OHLCV table with upserts; dataset: partitioned Parquet). Defaults to the 'db_backend' setting.")
+@click.option('--symbol', help='Symbol for single-ticker data saved as timeseries or dataset.')
+@click.option('--compress', is_flag=True, help='Store a new timeseries table as compressed symbol-month blocks.')
 @click.pass_context
-def save(ctx, table_name):
+def save(ctx, table_name, fmt, symbol, compress):
     """Save the currently loaded stock data to the database."""
     global current_stock_data
+    fmt = _db_format(ctx, fmt)
     if current_stock_data is not None:
         try:
-            ctx.obj["DB_MANAGER"].save_dataframe(current_stock_data, table_name)
+            if fmt == 'dataset':
+                rows = ctx.obj["DB_MANAGER"].save_dataset(current_stock_data, table_name, symbol=symbol)
+                console.print(f"[green]Appended {rows} rows.[/green]")
+            elif fmt == 'sqlite':
+                ctx.obj["DB_MANAGER"].save_dataframe(current_stock_data, table_name)
+            elif fmt == 'timeseries':
+                rows = ctx.obj["DB_MANAGER"].save_timeseries(current_stock_data, table_name, symbol=symbol, compress=compress or None)
+                console.print(f"[green]Upserted {rows} bars.[/green]")
+            else:
+                ctx.obj["DB_MANAGER"].save_columnar(current_stock_data, table_name, fmt=fmt)
             console.print(f"[green]Successfully saved data to table ('{table_name}').[/green]")
         except Exception as e:
             console.print(f"[bold red]Error saving to DB:[/bold red] {e}")
@@ -526,12 +999,30 @@ def save(ctx, table_name):
 
 @db.command()
 @click.argument('table_name')
+@click.option('--format', 'fmt', type=click.Choice(DB_FORMATS), help="Storage format of the table. Defaults to the 'db_backend' setting.")
+@click.option('--columns', multiple=True, help='Columns to read (e.g., --columns Close).')
+@click.option('--symbol', 'symbols', multiple=True, help='Only rows for this symbol (repeatable).')
+@click.option('--start', help='Only rows on or after this date (YYYY-MM-DD).')
+@click.option('--end', help='Only rows on or before this date (YYYY-MM-DD).')
+@click.option('--limit', type=int, help='Maximum number of rows.')
 @click.pass_context
-def load(ctx, table_name):
+def load(ctx, table_name, fmt, columns, symbols, start, end, limit):
     """Load data from a database table."""
     global current_stock_data
+    fmt = _db_format(ctx, fmt)
     try:
-        df = ctx.obj["DB_MANAGER"].load_dataframe(table_name)
+        if fmt == 'dataset':
+            df = ctx.obj["DB_MANAGER"].load_dataset(
+                table_name, columns=list(columns) or None, symbols=list(symbols) or None,
+                start=start, end=end, limit=limit,
+            )
+        elif fmt in ('sqlite', 'timeseries'):
+            df = ctx.obj["DB_MANAGER"].query(
+                table_name, columns=list(columns) or None, symbols=list(symbols) or None,
+                start=start, end=end, limit=limit,
+            )
+        else:
+            df = ctx.obj["DB_MANAGER"].load_columnar(table_name, fmt=fmt, columns=list(columns) or None)
         if df is not None:
             current_stock_data = df
             console.print(f"[green]Successfully loaded data from table ('{table_name}'). Shape: {df.shape}[/green]")
@@ -541,16 +1032,59 @@ def load(ctx, table_name):
     except Exception as e:
         console.print(f"[bold red]Error loading from DB:[/bold red] {e}")
 
+@db.command()
+@click.argument('table_name')
+@click.option('--threads', default='1,2,4,8', help='Comma-separated reader thread counts to measure.')
+@click.option('--queries', default=500, type=int, help='Range queries per thread count.')
+@click.option('--window_days', default=30, type=int, help='Length of each queried date range.')
+@click.pass_context
+def benchmark(ctx, table_name, threads, queries, window_days):
+    """Measure read throughput of a time-series table as reader threads increase."""
+    try:
+        thread_counts = [int(count) for count in threads.split(',') if count.strip()]
+        results = ctx.obj["DB_MANAGER"].benchmark_reads(table_name, thread_counts=thread_counts, queries=queries, window_days=window_days)
+    except Exception as e:
+        console.print(f"[bold red]Error running benchmark:[/bold red] {e}")
+        return
+    if not results:
+        console.print(f"[yellow]Table ('{table_name}') not found or empty.[/yellow]")
+        return
+    baseline = results[thread_counts[0]]
+    table = Table(title=f"[bold blue]Read Throughput ({table_name})[/bold blue]")
+    table.add_column("Threads", style="cyan")
+    table.add_column("Queries/s", style="green")
+    table.add_column("Speedup", style="magenta")
+    for count, rate in results.items():
+        table.add_row(str(count), f"{rate:,.0f}", f"{rate / baseline:.2f}x")
+    console.print(table)
+
+@db.command()
+@click.argument('table_name')
+@click.pass_context
+def compact(ctx, table_name):
+    """Merge the appended parts of each partition of a dataset table."""
+    try:
+        removed = ctx.obj["DB_MANAGER"].dataset.compact(table_name)
+        console.print(f"[green]Compacted table ('{table_name}'): {removed} part files merged.[/green]")
+    except Exception as e:
+        console.print(f"[bold red]Error compacting table:[/bold red] {e}")
+
 @db.command(name='list')
 @click.pass_context
 def list_tables(ctx):
     """List all tables in the database."""
     try:
         tables = ctx.obj["DB_MANAGER"].list_tables()
-        if tables:
+        columnar_tables = ctx.obj["DB_MANAGER"].list_columnar_tables()
+        dataset_tables = ctx.obj["DB_MANAGER"].list_dataset_tables()
+        if tables or columnar_tables or dataset_tables:
             console.print("[green]Available tables:[/green]")
             for table in tables:
                 console.print(f"- {table}")
+            for table, fmt in columnar_tables:
+                console.print(f"- {table} ({fmt})")
+            for table in dataset_tables:
+                console.print(f"- {table} (dataset)")
         else:
             console.print("[yellow]No tables found in the database.[/yellow]")
     except Exception as e:
@@ -561,12 +1095,40 @@ def analyze():
     """Quantitative analysis and technical indicators commands."""
     pass
 
+def _symbol_tails(results, rows):
+    """Keep the last ``rows`` rows of a chunked analytics stream, per symbol for [Symbol, Date] results."""
+    tails = {}
+    for result in results:
+        name = None
+        if isinstance(result.index, pd.MultiIndex):
+            name = result.index.get_level_values("Symbol")[0]
+            result = result.droplevel("Symbol")
+        tails[name] = result.tail(rows) if name not in tails else pd.concat([tails[name], result]).tail(rows)
+    return tails
+
 @analyze.command()
+@click.option("--table", "table_name", help="Stream this database table in chunks instead of using the loaded data.")
+@click.option("--symbol", help="Symbol to analyze in a multi-symbol table.")
+@click.option("--chunk_rows", default=DEFAULT_CHUNK_ROWS, type=int, help="Rows read per chunk with --table.")
 @click.pass_context
-def ta(ctx):
+def ta(ctx, table_name, symbol, chunk_rows):
     """Calculate and display technical indicators for the loaded stock data."""
     global current_stock_data
-    if current_stock_data is not None and not current_stock_data.empty:
+    if table_name:
+        console.print(f"[green]Calculating technical indicators over table ('{table_name}')...[/green]")
+        chunks = ctx.obj["DB_MANAGER"].iter_chunks(table_name, chunk_rows=chunk_rows, symbols=symbol)
+        try:
+            tails = _symbol_tails(ctx.obj["ANALYTICS"].iter_technical_indicators(chunks), 10)
+        except Exception as e:
+            console.print(f"[bold red]Error calculating technical indicators:[/bold red] {e}")
+            return
+        if not tails:
+            ctx.obj["ANALYTICS"].display_technical_indicators(None)
+        for name, tail in tails.items():
+            if name is not None:
+                console.print(f"[bold]{name}[/bold]")
+            ctx.obj["ANALYTICS"].display_technical_indicators(tail)
+    elif current_stock_data is not None and not current_stock_data.empty:
         console.print("[green]Calculating technical indicators...[/green]")
         df_with_ta = ctx.obj["ANALYTICS"].calculate_technical_indicators(current_stock_data.copy())
         if df_with_ta is not None:
@@ -589,11 +1151,29 @@ def correlation(ctx, columns):
 @analyze.command()
 @click.option("--column", default="Close", help="Column to calculate volatility for.")
 @click.option("--window", default=20, type=int, help="Rolling window for volatility calculation.")
+@click.option("--table", "table_name", help="Stream this database table in chunks instead of using the loaded data.")
+@click.option("--symbol", help="Symbol to analyze in a multi-symbol table.")
+@click.option("--chunk_rows", default=DEFAULT_CHUNK_ROWS, type=int, help="Rows read per chunk with --table.")
 @click.pass_context
-def volatility(ctx, column, window):
+def volatility(ctx, column, window, table_name, symbol, chunk_rows):
     """Calculate and display rolling volatility for the loaded stock data."""
     global current_stock_data
-    if current_stock_data is not None and not current_stock_data.empty:
+    if table_name:
+        console.print(f"[green]Calculating volatility over table ('{table_name}')...[/green]")
+        chunks = ctx.obj["DB_MANAGER"].iter_chunks(table_name, chunk_rows=chunk_rows, symbols=symbol)
+        try:
+            tails = _symbol_tails(ctx.obj["ANALYTICS"].iter_volatility(chunks, column, window), 5)
+        except Exception as e:
+            console.print(f"[bold red]Error calculating volatility:[/bold red] {e}")
+            return
+        if not tails:
+            console.print(f"[yellow]Table ('{table_name}') not found or empty.[/yellow]")
+            return
+        for name, tail in tails.items():
+            label = f" ({name})" if name is not None else ""
+            console.print(f"[green]Rolling {window}-day Annualized Volatility for {column}{label}:[/green]")
+            console.print(tail)
+    elif current_stock_data is not None and not current_stock_data.empty:
         console.print("[green]Calculating volatility...[/green]")
         ctx.obj["ANALYTICS"].calculate_volatility(current_stock_data, column, window)
     else:
@@ -701,6 +1281,28 @@ def export_excel(ctx, filename):
     else:
         console.print("[yellow]No stock data loaded to export. Use ('stocks load <TICKER>') first.[/yellow]")
 
+@report.command(name='parquet')
+@click.argument('filename')
+@click.pass_context
+def export_parquet(ctx, filename):
+    """Export currently loaded stock data to a Parquet file."""
+    global current_stock_data
+    if current_stock_data is not None and not current_stock_data.empty:
+        ctx.obj["REPORTING"].export_dataframe_to_parquet(current_stock_data, filename)
+    else:
+        console.print("[yellow]No stock data loaded to export. Use ('stocks load <TICKER>') first.[/yellow]")
+
+@report.command(name='feather')
+@click.argument('filename')
+@click.pass_context
+def export_feather(ctx, filename):
+    """Export currently loaded stock data to an Arrow IPC/Feather file."""
+    global current_stock_data
+    if current_stock_data is not None and not current_stock_data.empty:
+        ctx.obj["REPORTING"].export_dataframe_to_feather(current_stock_data, filename)
+    else:
+        console.print("[yellow]No stock data loaded to export. Use ('stocks load <TICKER>') first.[/yellow]")
+
 @report.command(name='pdf')
 @click.argument('filename')
 @click.option('--title', default='Quant Report', help='Title of the PDF report.')
@@ -1,18 +1,57 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 import yfinance as yf
 import pandas as pd
 from rich.console import Console
 from rich.table import Table
+from api_manager import fetch_history
+from rate_limiter import BULK, INTERACTIVE, get_limiter, priority
+from single_flight import get_default_group
+from cassette import get_default_cassette
 
 console = Console()
 
+# yfinance Ticker attributes fetched for each statement, keyed by result name.
+STATEMENT_ATTRIBUTES = {
+    "income_statement": "financials",
+    "balance_sheet": "balance_sheet",
+    "cash_flow": "cashflow",
+}
+DEFAULT_FUNDAMENTALS_WORKERS = 8
+
 class MarketData:
-    def __init__(self):
-        pass
+    def __init__(self, bar_store=None, cache=None, single_flight=None):
+        # Optional SeriesStore of OHLCV bars shared with APIManager.
+        self.bar_store = bar_store
+        # Optional TTLCache for Ticker.info and statement frames.
+        self.cache = cache
+        # Coalesces identical in-flight yfinance requests.
+        self.single_flight = single_flight or get_default_group()
+
+    def _cached(self, kind, key, fetch, view=None):
+        def shared_fetch():
+            return self.single_flight.do(
+                ("yf_" + kind, key),
+                lambda: get_default_cassette().call("yfinance", (kind, key), lambda: self._limited(fetch)),
+            )
+
+        if self.cache is None:
+            return shared_fetch()
+        return self.cache.get_or_fetch(kind, key, shared_fetch, view)
+
+    def _info(self, ticker, view):
+        """Ticker.info, downloaded once and cached for both the quote and fundamentals views."""
+        ticker = ticker.upper()
+        return self._cached("info", ticker, lambda: yf.Ticker(ticker).info, view=view)
+
+    def _limited(self, fetch):
+        """Run a yfinance call once the shared yfinance rate limiter releases it."""
+        get_limiter("yfinance").acquire()
+        return fetch()
 
     def get_quote_snapshot(self, ticker):
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._info(ticker, "quote")
             if info:
                 table = Table(title=f"[bold blue]{ticker.upper()} Quote Snapshot[/bold blue]")
                 table.add_column("Metric", style="cyan")
@@ -58,8 +97,8 @@ class MarketData:
 
     def get_ohlcv_history(self, ticker, period="1y", interval="1d"):
         try:
-            data = yf.download(ticker, period=period, interval=interval)
-            if data.empty:
+            data = fetch_history(ticker, period, interval, self.bar_store, self.single_flight)
+            if data is None or data.empty:
                 console.print(f"[yellow]No OHLCV data found for {ticker.upper()} with period {period} and interval {interval}.[/yellow]")
                 return None
             console.print(f"[green]OHLCV history for {ticker.upper()} ({period}, {interval}):[/green]")
@@ -71,8 +110,7 @@ class MarketData:
 
     def get_company_fundamentals(self, ticker):
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._info(ticker, "fundamentals")
             if info:
                 console.print(f"[bold blue]{ticker.upper()} Company Fundamentals:[/bold blue]")
                 fundamentals = {
@@ -92,42 +130,56 @@ class MarketData:
             console.print(f"[bold red]Error fetching company fundamentals for {ticker}:[/bold red] {e}")
             return None
 
+    def _fetch_statement(self, ticker, name):
+        attribute = STATEMENT_ATTRIBUTES[name]
+        # A Ticker per call keeps concurrent fetches from sharing yfinance's lazy state.
+        return self._cached("statements", (ticker.upper(), attribute), lambda: getattr(yf.Ticker(ticker), attribute))
+
     def get_financial_statements(self, ticker):
         try:
-            stock = yf.Ticker(ticker)
             console.print(f"[bold blue]{ticker.upper()} Financial Statements:[/bold blue]")
+            with ThreadPoolExecutor(max_workers=len(STATEMENT_ATTRIBUTES)) as executor:
+                futures = {name: executor.submit(self._fetch_statement, ticker, name) for name in STATEMENT_ATTRIBUTES}
+                statements = {name: future.result() for name, future in futures.items()}
 
-            # Income Statement
-            income_stmt = stock.financials
-            if not income_stmt.empty:
-                console.print("[green]Income Statement:[/green]")
-                console.print(income_stmt.T)
-            else:
-                console.print("[yellow]No Income Statement available.[/yellow]")
+            for name, label in (("income_statement", "Income Statement"), ("balance_sheet", "Balance Sheet"), ("cash_flow", "Cash Flow")):
+                if not statements[name].empty:
+                    console.print(f"[green]{label}:[/green]")
+                    console.print(statements[name].T)
+                else:
+                    console.print(f"[yellow]No {label} available.[/yellow]")
 
-            # Balance Sheet
-            balance_sheet = stock.balance_sheet
-            if not balance_sheet.empty:
-                console.print("[green]Balance Sheet:[/green]")
-                console.print(balance_sheet.T)
-            else:
-                console.print("[yellow]No Balance Sheet available.[/yellow]")
-
-            # Cash Flow
-            cash_flow = stock.cashflow
-            if not cash_flow.empty:
-                console.print("[green]Cash Flow:[/green]")
-                console.print(cash_flow.T)
-            else:
-                console.print("[yellow]No Cash Flow available.[/yellow]")
-
-            return {
-                "income_statement": income_stmt,
-                "balance_sheet": balance_sheet,
-                "cash_flow": cash_flow
-            }
+            return statements
         except Exception as e:
             console.print(f"[bold red]Error fetching financial statements for {ticker}:[/bold red] {e}")
             return None
 
+    def get_fundamentals_bundle(self, tickers, max_workers=DEFAULT_FUNDAMENTALS_WORKERS):
+        """Fetch info and all three statements for one or many tickers concurrently.
+
+        Every (ticker, part) request is submitted at once to a pool of ``max_workers``
+        threads, so a single ticker takes about as long as its slowest call. Returns
+        ``({ticker: {"info": ..., "income_statement": ..., "balance_sheet": ...,
+        "cash_flow": ..., "errors": {...}}}, elapsed)``.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        level = BULK if len(tickers) > 1 else INTERACTIVE
+        parts = ["info"] + list(STATEMENT_ATTRIBUTES)
+
+        def fetch(ticker, part):
+            with priority(level):
+                if part == "info":
+                    return self._info(ticker, "fundamentals")
+                return self._fetch_statement(ticker, part)
 
+        started = time.perf_counter()
+        results = {ticker: {"errors": {}} for ticker in tickers}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {(ticker, part): executor.submit(fetch, ticker, part) for ticker in tickers for part in parts}
+            for (ticker, part), future in futures.items():
+                try:
+                    results[ticker][part] = future.result()
+                except Exception as e:
+                    results[ticker][part] = None
+                    results[ticker]["errors"][part] = str(e)
+        return results, time.perf_counter() - started
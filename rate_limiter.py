@@ -0,0 +1,124 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Request priorities; lower values are released first.
+INTERACTIVE = 0
+BULK = 10
+
+# Default (requests per second, burst size) per provider. Override with the 'rate_limits' config key.
+DEFAULT_RATE_LIMITS = {
+    "coingecko": {"rate": 0.25, "burst": 5},
+    "fred": {"rate": 2.0, "burst": 10},
+    "exchangerate": {"rate": 1.0, "burst": 5},
+    "yfinance": {"rate": 2.0, "burst": 5},
+}
+
+# Hosts of the REST providers, used to pick a limiter for each HTTP request.
+PROVIDER_HOSTS = {
+    "api.coingecko.com": "coingecko",
+    "api.stlouisfed.org": "fred",
+    "api.exchangerate-api.com": "exchangerate",
+}
+
+_local = threading.local()
+
+def current_priority():
+    return getattr(_local, "priority", INTERACTIVE)
+
+@contextmanager
+def priority(level):
+    """Run the enclosed requests on this thread at the given priority (e.g. BULK for backfills)."""
+    previous = current_priority()
+    _local.priority = level
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+class RateLimiter:
+    """Token bucket that queues callers and releases them in priority order.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Waiting callers are served
+    lowest priority value first, then first come first served, so interactive
+    commands overtake queued bulk backfills.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self.granted = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=None):
+        """Block until a token is available and this caller is first in line."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                self._refill()
+                if self._waiting[0] == ticket and self._tokens >= 1:
+                    heapq.heappop(self._waiting)
+                    self._tokens -= 1
+                    self.granted += 1
+                    self.total_wait += time.monotonic() - started
+                    self._cond.notify_all()
+                    return
+                timeout = (1 - self._tokens) / self.rate if self._tokens < 1 and self.rate > 0 else None
+                self._cond.wait(timeout=timeout)
+
+    def configure(self, rate=None, burst=None):
+        with self._cond:
+            self._refill()
+            if rate is not None:
+                self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(float(burst), 1.0)
+                self._tokens = min(self._tokens, self.burst)
+            self._cond.notify_all()
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider):
+    """Return the shared limiter for a provider, creating it from the defaults if needed."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            limits = DEFAULT_RATE_LIMITS.get(provider, {"rate": 1.0, "burst": 5})
+            _limiters[provider] = RateLimiter(limits["rate"], limits["burst"])
+        return _limiters[provider]
+
+def configure_rate_limits(limits):
+    """Apply ``{provider: {"rate": ..., "burst": ...}}`` overrides, e.g. from ConfigManager.
+
+    Raises ValueError for a rate that is not positive, which would never release a request.
+    """
+    for provider, settings in (limits or {}).items():
+        if settings.get("rate") is not None and float(settings["rate"]) <= 0:
+            raise ValueError(f"Rate limit for {provider} must be positive, got {settings['rate']}.")
+    for provider, settings in (limits or {}).items():
+        get_limiter(provider).configure(settings.get("rate"), settings.get("burst"))
+
+def provider_for_url(url):
+    return PROVIDER_HOSTS.get(urlparse(url).hostname)
+
+def acquire_for_url(url, priority=None):
+    """Wait for the limiter of the provider serving ``url``; unknown hosts are not limited."""
+    provider = provider_for_url(url)
+    if provider:
+        get_limiter(provider).acquire(priority)
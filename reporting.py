@@ -3,6 +3,7 @@ from rich.console import Console
 from rich.table import Table
 from fpdf import FPDF
 import os
+from columnar_io import write_columnar
 
 console = Console()
 
@@ -26,6 +27,22 @@ class Reporting:
         except Exception as e:
             console.print(f"[bold red]Error exporting to Excel:[/bold red] {e}")
 
+    def export_dataframe_to_parquet(self, df, filename="output.parquet"):
+        """Export a pandas DataFrame, including its index, to a Parquet file."""
+        try:
+            write_columnar(df, filename, fmt="parquet")
+            console.print(f"[green]DataFrame successfully exported to {filename}[/green]")
+        except Exception as e:
+            console.print(f"[bold red]Error exporting to Parquet:[/bold red] {e}")
+
+    def export_dataframe_to_feather(self, df, filename="output.feather"):
+        """Export a pandas DataFrame, including its index, to an Arrow IPC/Feather file."""
+        try:
+            write_columnar(df, filename, fmt="feather")
+            console.print(f"[green]DataFrame successfully exported to {filename}[/green]")
+        except Exception as e:
+            console.print(f"[bold red]Error exporting to Feather:[/bold red] {e}")
+
     def generate_pdf_report(self, title, content_dict, filename="report.pdf"):
         """Generate a simple PDF report from a dictionary of content."""
         try:
@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import pandas as pd
+from columnar_io import read_columnar, write_columnar
+
+# Root directory for locally stored time series, shared by all data modules.
+SERIES_STORE_DIR = os.path.join(os.path.expanduser("~/.quant_app_cache"), "series")
+
+# Coverage younger than this is considered current and is served without a network call.
+DEFAULT_REFRESH_SECONDS = 15 * 60
+
+def _align_tz(ts, index):
+    """Make a bound comparable with an index, whichever of the two is timezone-aware."""
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(tz)
+    if tz is None and ts.tzinfo is not None:
+        return ts.tz_convert(None)
+    return ts
+
+class SeriesStore:
+    """On-disk store of time-indexed DataFrames, one Parquet file per key.
+
+    Each entry also records its coverage: the time range that has actually been
+    fetched from the provider. Coverage, not the first/last row, decides what is
+    still missing, so weekends and holidays are never re-requested.
+    """
+
+    def __init__(self, namespace, root=SERIES_STORE_DIR):
+        self.directory = os.path.join(root, namespace)
+
+    def _base_path(self, key):
+        parts = key if isinstance(key, (tuple, list)) else (key,)
+        name = "__".join(re.sub(r"[^A-Za-z0-9._=^-]", "_", str(part)) for part in parts)
+        return os.path.join(self.directory, name)
+
+    def keys(self):
+        """List stored keys as file stems."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(".parquet")] for name in os.listdir(self.directory) if name.endswith(".parquet"))
+
+    def read(self, key, start=None, end=None, columns=None):
+        """Return the stored frame for ``key`` sliced to [start, end], or None if absent."""
+        path = self._base_path(key) + ".parquet"
+        if not os.path.exists(path):
+            return None
+        df = read_columnar(path, columns=columns, fmt="parquet")
+        start = _align_tz(start, df.index)
+        end = _align_tz(end, df.index)
+        if start is not None:
+            df = df[df.index >= start]
+        if end is not None:
+            df = df[df.index <= end]
+        return df
+
+    def write(self, key, df):
+        """Replace the stored frame for ``key``."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._base_path(key) + ".parquet"
+        tmp_path = path + ".tmp"
+        write_columnar(df, tmp_path, fmt="parquet")
+        os.replace(tmp_path, path)
+
+    def merge(self, key, df):
+        """Merge new rows into the stored frame; newer values win on duplicate timestamps."""
+        existing = self.read(key)
+        if existing is not None and not existing.empty:
+            df = pd.concat([existing, df])
+            df = df[~df.index.duplicated(keep="last")]
+        df = df.sort_index()
+        self.write(key, df)
+        return df
+
+    def coverage(self, key):
+        """Return the fetched (start, end) range for ``key``; a start of None means full history."""
+        path = self._base_path(key) + ".json"
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            meta = json.load(f)
+        start = pd.Timestamp(meta["start"]) if meta.get("start") else None
+        return start, pd.Timestamp(meta["end"])
+
+    def set_coverage(self, key, start, end):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._base_path(key) + ".json", "w") as f:
+            json.dump({"start": start.isoformat() if start is not None else None, "end": end.isoformat()}, f)
+
+    def delete(self, key):
+        for ext in (".parquet", ".json"):
+            path = self._base_path(key) + ext
+            if os.path.exists(path):
+                os.remove(path)
+
+    def fetch_incremental(self, key, start, fetcher, refresh_seconds=DEFAULT_REFRESH_SECONDS, now=None):
+        """Serve [start, now] for ``key``, calling ``fetcher`` only for ranges not yet stored.
+
+        ``fetcher(range_start, range_end)`` must return a time-indexed DataFrame or None;
+        either bound may be None (open-ended). The tail is re-fetched from the last
+        stored row, so a still-forming latest bar is replaced rather than kept stale.
+        """
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+        start = pd.Timestamp(start) if start is not None else None
+        covered = self.coverage(key)
+
+        if covered is None:
+            ranges = [("full", start, None)]
+        else:
+            covered_start, covered_end = covered
+            ranges = []
+            if covered_start is not None and (start is None or start < covered_start):
+                ranges.append(("head", start, covered_start))
+            if (now - covered_end).total_seconds() > refresh_seconds:
+                stored = self.read(key)
+                tail_start = covered_end
+                if stored is not None and not stored.empty:
+                    last = stored.index[-1]
+                    last = last.tz_convert(None) if last.tzinfo is not None else last
+                    tail_start = min(last, covered_end)
+                ranges.append(("tail", tail_start, None))
+
+        new_start, new_end = covered if covered is not None else (start, None)
+        for kind, range_start, range_end in ranges:
+            df = fetcher(range_start, range_end)
+            if df is None:
+                continue  # Leave coverage unchanged so the range is retried next time.
+            if not df.empty:
+                self.merge(key, df)
+            if kind in ("full", "head"):
+                new_start = start
+            if kind in ("full", "tail"):
+                new_end = now
+        if new_end is not None:
+            self.set_coverage(key, new_start, new_end)
+        return self.read(key, start=start)
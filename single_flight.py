@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import Counter
+import pandas as pd
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+def _share(value):
+    """Give each follower its own copy of pandas results so callers cannot mutate each other's data."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+class SingleFlight:
+    """Coalesce identical requests into a single in-flight fetch.
+
+    Concurrent calls with the same key wait for the first caller's fetch and share its
+    result (or its exception). With ``linger`` > 0, a successful result is also reused
+    by identical calls made within that many seconds after it completed, which covers
+    back-to-back commands in scripts and aliases.
+    """
+
+    def __init__(self, linger=0.0):
+        self.linger = linger
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = Counter()
+        self.deduplicated = Counter()
+
+    def do(self, key, fetch):
+        """Return ``fetch()`` for ``key``, sharing one execution among identical callers."""
+        namespace = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            self._expire()
+            call = self._calls.get(key)
+            if call is not None:
+                self.deduplicated[namespace] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.calls[namespace] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _share(call.result)
+
+        try:
+            call.result = fetch()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                call.finished_at = time.monotonic()
+                if call.error is not None or self.linger <= 0:
+                    self._calls.pop(key, None)
+            call.event.set()
+        # A lingering result is handed to later callers, so the leader gets its own copy too.
+        return _share(call.result) if self.linger > 0 else call.result
+
+    def _expire(self):
+        """Drop lingering results older than ``linger``. Caller holds the lock."""
+        now = time.monotonic()
+        for key in [k for k, c in self._calls.items() if c.finished_at is not None and now - c.finished_at > self.linger]:
+            del self._calls[key]
+
+    def forget(self, key):
+        """Drop a completed result so the next identical call fetches again."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.finished_at is not None:
+                del self._calls[key]
+
+    def stats(self):
+        """Fetches executed and calls deduplicated, per key namespace."""
+        namespaces = sorted(set(self.calls) | set(self.deduplicated))
+        return {ns: {"calls": self.calls[ns], "deduplicated": self.deduplicated[ns]} for ns in namespaces}
+
+_default_group = SingleFlight()
+
+def get_default_group():
+    """Return the process-wide group shared by the data modules."""
+    return _default_group
@@ -1,11 +1,22 @@
 import unittest
 import os
+import shutil
+import tempfile
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather
+import requests
 from unittest.mock import patch, MagicMock
 import json # Added this line
+import sqlite3
 
 # Import modules to be tested
-from data_manager import DataManager
+from data_manager import DataManager, _ndjson_frame
 from api_manager import APIManager
 from db_manager import DBManager
 from market_data import MarketData
@@ -19,12 +30,23 @@ from trading_simulator import TradingSimulator
 from reporting import Reporting
 from config_manager import ConfigManager
 from security import SecurityManager
+from series_store import SeriesStore
+from cache import TTLCache
+from http_client import HTTPClient
+from rate_limiter import RateLimiter, BULK, INTERACTIVE, configure_rate_limits
+from single_flight import SingleFlight
+from cassette import Cassette, CassetteMiss
+from fx_matrix import RateMatrix
+from fx_history import FXHistory
+from bar_codec import encode_block, decode_block
 
 class TestQuantApp(unittest.TestCase):
 
     def setUp(self):
         # Initialize managers for testing
-        self.data_manager = DataManager()
+        # Keep Excel conversions out of the user's real cache directory.
+        self.excel_cache_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(excel_cache_dir=self.excel_cache_dir)
         self.api_manager = APIManager()
         self.db_manager = DBManager()
         self.market_data = MarketData()
@@ -65,6 +87,7 @@ class TestQuantApp(unittest.TestCase):
 
     def tearDown(self):
         # Clean up after tests
+        shutil.rmtree(self.excel_cache_dir, ignore_errors=True)
         if os.path.exists('test.db'):
             os.remove('test.db')
         if os.path.exists('test.csv'):
@@ -85,12 +108,110 @@ class TestQuantApp(unittest.TestCase):
         self.assertIsInstance(df, pd.DataFrame)
         self.assertFalse(df.empty)
 
+    def test_load_csv_chunked_filters(self):
+        df = self.dummy_df.reset_index()
+        df['Symbol'] = ['AAPL', 'MSFT', 'AAPL', 'MSFT', 'AAPL']
+        df.to_csv('test.csv', index=False)
+        loaded = self.data_manager.load_csv_chunked(
+            'test.csv', chunksize=2, columns=['Date', 'Close'], dtypes={'Close': 'float32'},
+            date_column='Date', symbols=['aapl'], start='2023-01-02', show_progress=False)
+        self.assertEqual(list(loaded.columns), ['Date', 'Close'])
+        self.assertEqual(loaded['Close'].tolist(), [106.0, 108.0])
+        self.assertEqual(loaded['Close'].dtype, 'float32')
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(loaded['Date']))
+
+        rows, head = self.data_manager.scan_csv('test.csv', chunksize=2, head_rows=3, show_progress=False)
+        self.assertEqual(rows, 5)
+        self.assertEqual(head['Close'].tolist(), [104, 105, 106])
+        rows, head = self.data_manager.scan_csv('test.csv', columns=['Close'], symbols=['TSLA'], show_progress=False)
+        self.assertEqual((rows, list(head.columns)), (0, ['Close']))
+
+    def test_load_glob_reports_failures(self):
+        os.makedirs('test_glob', exist_ok=True)
+        try:
+            for symbol in ('AAPL', 'MSFT'):
+                self.dummy_df.to_csv(os.path.join('test_glob', f'{symbol}.csv'))
+            with open(os.path.join('test_glob', 'BROKEN.csv'), 'w') as f:
+                f.write('Open,Close\n1,2\n')
+            df, failures = self.data_manager.load_glob(os.path.join('test_glob', '*.csv'), max_workers=2)
+            self.assertEqual(df.index.names, ['Symbol', 'Date'])
+            self.assertEqual(len(df), 10)
+            self.assertEqual(sorted(df.index.get_level_values('Symbol').unique()), ['AAPL', 'MSFT'])
+            self.assertEqual([os.path.basename(path) for path, _ in failures], ['BROKEN.csv'])
+        finally:
+            shutil.rmtree('test_glob')
+
     def test_load_excel(self):
         self.dummy_df.to_excel('test.xlsx', index=False)
         df = self.data_manager.load_excel('test.xlsx')
         self.assertIsInstance(df, pd.DataFrame)
         self.assertFalse(df.empty)
 
+    def test_parquet_and_feather_roundtrip_with_projection(self):
+        cases = [
+            ('test.parquet', self.reporting.export_dataframe_to_parquet, self.data_manager.load_parquet),
+            ('test.feather', self.reporting.export_dataframe_to_feather, self.data_manager.load_feather),
+        ]
+        for filename, export, load in cases:
+            export(self.dummy_df, filename)
+            pd.testing.assert_frame_equal(load(filename), self.dummy_df)
+            projected = load(filename, columns=['Close'])
+            self.assertEqual(list(projected.columns), ['Close'])
+            self.assertEqual(projected.index.name, 'Date')
+            os.remove(filename)
+
+    def test_feather_is_written_uncompressed_for_zero_copy_reads(self):
+        df = pd.DataFrame({'Close': np.arange(100_000, dtype='float64')})
+        self.reporting.export_dataframe_to_feather(df, 'test.feather')
+        try:
+            allocated = pa.total_allocated_bytes()
+            table = pa.feather.read_table('test.feather', memory_map=True)
+            # Uncompressed buffers are mapped from the file rather than decoded into memory.
+            self.assertEqual(pa.total_allocated_bytes() - allocated, 0)
+            self.assertEqual(table.num_rows, len(df))
+            del table
+        finally:
+            os.remove('test.feather')
+
+    def test_load_excel_uses_conversion_cache(self):
+        cached_manager = DataManager(excel_cache_dir='test_excel_cache')
+        try:
+            self.dummy_df.to_excel('test.xlsx', index=False)
+            first = cached_manager.load_excel('test.xlsx')
+            self.assertEqual(len(os.listdir('test_excel_cache')), 1)
+            with patch('pandas.read_excel') as mock_read_excel:
+                second = cached_manager.load_excel('test.xlsx')
+                mock_read_excel.assert_not_called()
+            pd.testing.assert_frame_equal(first, second)
+
+            cached_manager.excel_cache_max_bytes = 0
+            cached_manager.load_excel('test.xlsx', sheet_name='Sheet1')
+            self.assertEqual(os.listdir('test_excel_cache'), [])
+        finally:
+            shutil.rmtree('test_excel_cache', ignore_errors=True)
+
+    def test_excel_cache_misses_when_workbook_changes(self):
+        self.dummy_df.to_excel('test.xlsx', index=False)
+        self.data_manager.load_excel('test.xlsx')
+        with patch('pandas.read_excel', wraps=pd.read_excel) as read_excel:
+            self.data_manager.load_excel('test.xlsx')
+            self.assertEqual(read_excel.call_count, 0)
+
+            # Same size, new mtime: a miss.
+            stat = os.stat('test.xlsx')
+            os.utime('test.xlsx', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.data_manager.load_excel('test.xlsx')
+            self.assertEqual(read_excel.call_count, 1)
+
+            # New content and size with the mtime put back: still a miss, and the new rows are served.
+            self.dummy_df.iloc[:2].to_excel('test.xlsx', index=False)
+            os.utime('test.xlsx', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(len(self.data_manager.load_excel('test.xlsx')), 2)
+            self.assertEqual(read_excel.call_count, 2)
+            self.data_manager.load_excel('test.xlsx')
+            self.assertEqual(read_excel.call_count, 2)
+        self.assertEqual(len(os.listdir(self.excel_cache_dir)), 3)
+
     def test_load_json(self):
         with open('test.json', 'w') as f:
             json.dump({'data': 'test'}, f)
@@ -98,6 +219,36 @@ class TestQuantApp(unittest.TestCase):
         self.assertIsInstance(data, dict)
         self.assertEqual(data['data'], 'test')
 
+    def test_load_ndjson_with_projection(self):
+        with open('test.json', 'w') as f:
+            f.write('{"ts": "2024-01-01T00:00:00", "px": "1.5", "trade": {"side": "buy", "raw": {"id": 1}}}\n')
+            f.write('\n')
+            f.write('{"ts": "2024-01-01T00:00:01", "px": "2.5", "trade": {"side": "sell", "raw": {"id": 2}}}\n')
+        df = self.data_manager.load_ndjson(
+            'test.json', fields=['ts', 'px', 'trade.side'],
+            dtypes={'ts': 'datetime64[ns]', 'px': 'float64'}, batch_size=1)
+        self.assertEqual(list(df.columns), ['ts', 'px', 'trade.side'])
+        self.assertEqual(df['px'].tolist(), [1.5, 2.5])
+        self.assertEqual(df['trade.side'].tolist(), ['buy', 'sell'])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['ts']))
+
+    def test_iter_ndjson_reads_projection_with_arrow_and_falls_back(self):
+        with open('test.json', 'w') as f:
+            for i in range(6):
+                # Sizes are ints in the sampled records; the last one is a float that does not fit int64.
+                size = 2.5 if i == 5 else i
+                f.write(json.dumps({'id': i, 'size': size, 'book': {'side': 'buy', 'levels': [[1, 2]] * 10}}) + '\n')
+        with patch('data_manager.NDJSON_SAMPLE_RECORDS', 3), patch('data_manager._ndjson_frame', wraps=_ndjson_frame) as python_parse:
+            batches = list(self.data_manager.iter_ndjson('test.json', fields=['id', 'size', 'book.side', 'missing'], batch_size=2))
+        # Only the block holding the float was parsed in Python.
+        self.assertEqual(python_parse.call_count, 1)
+        self.assertGreater(len(batches), 1)
+        df = pd.concat(batches, ignore_index=True)
+        self.assertEqual(list(df.columns), ['id', 'size', 'book.side', 'missing'])
+        self.assertEqual(df['size'].tolist(), [0, 1, 2, 3, 4, 2.5])
+        self.assertEqual(df['book.side'].unique().tolist(), ['buy'])
+        self.assertTrue(df['missing'].isna().all())
+
     # Test APIManager (mock external calls)
     @patch('yfinance.download')
     def test_get_yfinance_historical_data(self, mock_yfinance_download):
@@ -106,6 +257,43 @@ class TestQuantApp(unittest.TestCase):
         self.assertIsInstance(df, pd.DataFrame)
         self.assertFalse(df.empty)
 
+    @patch('yfinance.download')
+    def test_get_yfinance_batch_data(self, mock_yfinance_download):
+        def download(batch, **kwargs):
+            frames = {ticker: self.dummy_df for ticker in batch if ticker != 'BAD'}
+            return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+        mock_yfinance_download.side_effect = download
+        panel, failures, elapsed = self.api_manager.get_yfinance_batch_data(['aapl', 'MSFT', 'BAD'], batch_size=2)
+        self.assertEqual(mock_yfinance_download.call_count, 2)
+        self.assertEqual(panel.index.names, ['Symbol', 'Date'])
+        self.assertEqual(len(panel), 10)
+        self.assertEqual(failures, {'BAD': 'No data returned'})
+        wide, _, _ = self.api_manager.get_yfinance_batch_data(['AAPL', 'MSFT'], layout='wide')
+        self.assertEqual(list(wide.columns.get_level_values(0).unique()), ['AAPL', 'MSFT'])
+
+    @patch('yfinance.download')
+    def test_bar_store_fetches_only_missing_ranges(self, mock_yfinance_download):
+        store = SeriesStore('ohlcv', root='test_series_store')
+        api_manager = APIManager(bar_store=store)
+        try:
+            mock_yfinance_download.return_value = self.dummy_df
+            with patch('pandas.Timestamp.now', return_value=pd.Timestamp('2023-01-06 12:00')):
+                first = api_manager.get_yfinance_historical_data('AAPL', period='5d')
+                second = api_manager.get_yfinance_historical_data('AAPL', period='5d')
+            self.assertEqual(mock_yfinance_download.call_count, 1)
+            pd.testing.assert_frame_equal(first, second)
+
+            newer = pd.DataFrame({'Open': [105], 'High': [110], 'Low': [104], 'Close': [109], 'Volume': [1500]},
+                                 index=pd.DatetimeIndex(['2023-01-06'], name='Date'))
+            mock_yfinance_download.return_value = newer
+            with patch('pandas.Timestamp.now', return_value=pd.Timestamp('2023-01-07 12:00')):
+                third = api_manager.get_yfinance_historical_data('AAPL', period='5d')
+            self.assertEqual(mock_yfinance_download.call_args.kwargs['start'], pd.Timestamp('2023-01-05'))
+            self.assertEqual(third.index[-1], pd.Timestamp('2023-01-06'))
+            self.assertEqual(third['Close'].iloc[-1], 109)
+        finally:
+            shutil.rmtree('test_series_store', ignore_errors=True)
+
     # Test DBManager
     def test_save_and_load_dataframe(self):
         self.db_manager.db_name = 'test.db'
@@ -115,6 +303,242 @@ class TestQuantApp(unittest.TestCase):
         self.assertFalse(loaded_df.empty)
         pd.testing.assert_frame_equal(self.dummy_df.reset_index(drop=True), loaded_df.reset_index(drop=True))
 
+    def test_save_and_load_columnar(self):
+        self.db_manager.save_columnar(self.dummy_df, 'test_columnar', fmt='parquet')
+        loaded_df = self.db_manager.load_columnar('test_columnar', fmt='parquet', columns=['Open', 'Close'])
+        pd.testing.assert_frame_equal(self.dummy_df[['Open', 'Close']], loaded_df)
+        self.assertIn(('test_columnar', 'parquet'), self.db_manager.list_columnar_tables())
+        self.assertIsNone(self.db_manager.load_columnar('missing_table'))
+        shutil.rmtree(self.db_manager.columnar_dir)
+
+    def test_timeseries_table_upserts_bars(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            db_manager.save_timeseries(self.dummy_df, 'bars', symbol='aapl')
+            panel = pd.concat({'MSFT': self.dummy_df}, names=['Symbol', 'Date'])
+            db_manager.save_timeseries(panel, 'bars')
+            update = self.dummy_df.tail(1).copy()
+            update['Close'] = 200
+            new_day = self.dummy_df.tail(1).copy()
+            new_day.index = pd.to_datetime(['2023-01-06'])
+            new_day.index.name = 'Date'
+            self.assertEqual(db_manager.save_timeseries(pd.concat([update, new_day]), 'bars', symbol='AAPL'), 2)
+
+            self.assertEqual(db_manager.execute_query('PRAGMA journal_mode')[0][0], 'wal')
+            self.assertTrue(db_manager.is_timeseries_table('bars'))
+            self.assertEqual(db_manager.execute_query('SELECT COUNT(*) FROM bars')[0][0], 11)
+            loaded = db_manager.load_timeseries('bars')
+            self.assertEqual(loaded.index.names, ['Symbol', 'Date'])
+            self.assertEqual(loaded.loc[('AAPL', pd.Timestamp('2023-01-05')), 'Close'], 200)
+            pd.testing.assert_frame_equal(loaded.loc['MSFT'], self.dummy_df.astype('float64'), check_names=False)
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+
+    def test_query_pushes_filters_into_sql(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            dates = pd.date_range('2023-01-01', periods=60, freq='D')
+            bars = pd.DataFrame({'Open': range(60), 'Close': range(1, 61)}, index=dates)
+            bars.index.name = 'Date'
+            for symbol in ('AAPL', 'MSFT', 'GOOG'):
+                db_manager.save_timeseries(bars, 'bars', symbol=symbol)
+
+            january = db_manager.query('bars', columns=['Close'], symbols='aapl', start='2023-01-10', end='2023-01-31')
+            self.assertEqual(list(january.columns), ['Close'])
+            self.assertEqual(january.index.name, 'Date')
+            self.assertEqual((january.index[0], len(january)), (pd.Timestamp('2023-01-10'), 22))
+
+            chunks = list(db_manager.query('bars', symbols=['AAPL', 'MSFT'], start='2023-02-01', chunksize=10))
+            self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 10, 10, 10, 8])
+            self.assertTrue(all(chunk.index.names == ['Symbol', 'Date'] for chunk in chunks))
+            self.assertEqual(len(db_manager.query('bars', limit=5)), 5)
+            with self.assertRaises(ValueError):
+                db_manager.query('bars', columns=['Close; DROP TABLE bars'])
+
+            sql, params = db_manager._timeseries_sql('bars', ['Close'], ['AAPL'], '2023-01-10', '2023-01-31', None)
+            plan = ' '.join(row[-1] for row in db_manager.conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+            self.assertIn('PRIMARY KEY', plan)
+
+            db_manager.save_dataframe(self.dummy_df.reset_index(), 'plain')
+            plain = db_manager.query('plain', columns=['Date', 'Close'], start='2023-01-03', limit=2)
+            self.assertEqual(plain['Close'].tolist(), [106, 107])
+            quotes = pd.DataFrame({'Date': ['2023-01-02', '2023-01-03', '2023-01-04'], 'Symbol': ['aapl', 'aapl', 'MSFT'], 'Close': [1, 2, 3]})
+            db_manager.save_dataframe(quotes, 'quotes')
+            self.assertEqual(db_manager.query('quotes', start='2023-01-03', end='2023-01-04')['Close'].tolist(), [2, 3])
+            self.assertEqual(db_manager.query('quotes', symbols='AAPL')['Close'].tolist(), [1, 2])
+            sparse = bars.assign(Volume=[float('nan')] * 50 + [1.0] * 10)
+            db_manager.save_timeseries(sparse, 'sparse', symbol='AAPL')
+            chunks = list(db_manager.query('sparse', chunksize=25))
+            self.assertEqual(len({tuple(chunk.columns) for chunk in chunks}), 1)
+            self.assertIn('Volume', chunks[0].columns)
+            self.assertIsNone(db_manager.query('missing'))
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+
+    def test_iter_chunks_streams_table_in_key_order(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            dates = pd.date_range('2023-01-01', periods=25, freq='D')
+            bars = pd.DataFrame({'Open': range(25), 'Close': range(1, 26)}, index=dates)
+            bars.index.name = 'Date'
+            for symbol in ('MSFT', 'AAPL'):
+                db_manager.save_timeseries(bars, 'bars', symbol=symbol)
+
+            chunks = list(db_manager.iter_chunks('bars', chunk_rows=20))
+            self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 10])
+            streamed = pd.concat(chunks)
+            whole = db_manager.query('bars')
+            pd.testing.assert_frame_equal(streamed[whole.columns], whole)
+
+            aapl = list(db_manager.iter_chunks('bars', chunk_rows=10, columns=['Close'], symbols='AAPL', start='2023-01-06'))
+            self.assertEqual([len(chunk) for chunk in aapl], [10, 10])
+            self.assertEqual(aapl[0].index[0], pd.Timestamp('2023-01-06'))
+            self.assertEqual(aapl[1]['Close'].iloc[-1], 25)
+
+            db_manager.save_dataframe(self.dummy_df.reset_index(), 'plain')
+            plain = list(db_manager.iter_chunks('plain', chunk_rows=2))
+            self.assertEqual(pd.concat(plain)['Close'].tolist(), [104, 105, 106, 107, 108])
+            self.assertNotIn('_rowid', plain[0].columns)
+            self.assertEqual(list(db_manager.iter_chunks('missing')), [])
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+
+    def test_dataset_backend_prunes_partitions_and_appends(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            dates = pd.date_range('2022-12-20', periods=30, freq='D')
+            bars = pd.DataFrame({'Open': range(30), 'Close': range(1, 31)}, index=dates, dtype='float64')
+            bars.index.name = 'Date'
+            for symbol in ('AAPL', 'MSFT'):
+                self.assertEqual(db_manager.save_dataset(bars, 'bars', symbol=symbol), 30)
+            self.assertEqual(db_manager.list_dataset_tables(), ['bars'])
+            self.assertEqual(len(db_manager.dataset.files('bars')), 4)  # Two symbols x two years.
+
+            pruned = db_manager.dataset.files('bars', symbols='AAPL', start='2023-01-05')
+            self.assertEqual([entry['path'] for entry in pruned], [os.path.join('symbol=AAPL', 'year=2023', 'part-000001.parquet')])
+            january = db_manager.load_dataset('bars', columns=['Close'], symbols='aapl', start='2023-01-05', end='2023-01-10')
+            self.assertEqual(list(january.columns), ['Close'])
+            self.assertEqual(january['Close'].tolist(), [17.0, 18.0, 19.0, 20.0, 21.0, 22.0])
+
+            existing = {entry['path'] for entry in db_manager.dataset.files('bars')}
+            update = bars.iloc[-2:].assign(Close=99.0)
+            db_manager.save_dataset(update, 'bars', symbol='AAPL')
+            self.assertTrue(existing < {entry['path'] for entry in db_manager.dataset.files('bars')})
+            everything = db_manager.load_dataset('bars')
+            self.assertEqual(everything.index.names, ['Symbol', 'Date'])
+            self.assertEqual(len(everything), 60)
+            self.assertEqual(everything.loc[('AAPL', dates[-1]), 'Close'], 99.0)
+
+            self.assertEqual(db_manager.dataset.compact('bars'), 2)
+            pd.testing.assert_frame_equal(db_manager.load_dataset('bars'), everything)
+            self.assertIsNone(db_manager.load_dataset('missing'))
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+            shutil.rmtree('test_ts_dataset', ignore_errors=True)
+
+    def test_bar_codec_roundtrips_exactly_and_compresses(self):
+        rng = np.random.default_rng(0)
+        ts = 1_700_000_000 + 60 * np.arange(5000)
+        cents = np.round(100 + np.cumsum(rng.normal(0, 0.05, 5000)), 2)
+        from_float32 = cents.astype(np.float32).astype(np.float64)
+        noisy = rng.random(5000)
+        gappy = cents.copy()
+        gappy[[0, 10, 11]] = np.nan
+        columns = [cents, from_float32, noisy, gappy, np.full(5000, np.nan), -np.zeros(5000)]
+
+        decoded_ts, decoded = decode_block(encode_block(ts, columns))
+        np.testing.assert_array_equal(decoded_ts, ts)
+        for original, values in zip(columns, decoded):
+            np.testing.assert_array_equal(values, original)
+            self.assertEqual(values[~np.isnan(values)].view(np.uint64).tolist(),
+                             original[~np.isnan(original)].view(np.uint64).tolist())
+        self.assertLess(len(encode_block(ts, [cents, cents, cents, cents])), ts.nbytes * 5 // 10)
+
+    def test_compressed_timeseries_table_reads_like_row_table(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            dates = pd.date_range('2023-01-30', periods=200, freq='h')
+            bars = pd.DataFrame({'Open': np.round(np.linspace(100, 120, 200), 2), 'Close': np.round(np.linspace(101, 121, 200), 2),
+                                 'Volume': np.arange(200.0)}, index=dates)
+            bars.index.name = 'Date'
+            for symbol in ('AAPL', 'MSFT'):
+                db_manager.save_timeseries(bars, 'rows', symbol=symbol)
+                db_manager.save_timeseries(bars, 'packed', symbol=symbol, compress=True)
+            self.assertTrue(db_manager.is_compressed_table('packed'))
+            # One block per symbol-month.
+            self.assertEqual(db_manager.conn.execute('SELECT COUNT(*) FROM packed').fetchone()[0], 4)
+
+            for filters in ({}, {'symbols': 'msft', 'start': '2023-02-01 05:00', 'columns': ['Close']}, {'limit': 3}):
+                pd.testing.assert_frame_equal(db_manager.query('packed', **filters), db_manager.query('rows', **filters))
+            chunks = list(db_manager.iter_chunks('packed', chunk_rows=150))
+            self.assertEqual([len(chunk) for chunk in chunks], [150, 150, 100])
+            chunks = list(db_manager.query('packed', chunksize=150))
+            self.assertEqual(len({tuple(chunk.columns) for chunk in chunks}), 1)
+            pd.testing.assert_frame_equal(pd.concat(chunks), pd.concat(db_manager.query('rows', chunksize=150)))
+
+            # Touches both AAPL months; a tiny key batch makes each lookup its own query.
+            update = bars.iloc[[0, -2, -1]].assign(Close=1.0)
+            with patch('db_manager.COMPRESSED_KEY_BATCH', 1):
+                db_manager.save_timeseries(update, 'packed', symbol='AAPL')
+            db_manager.save_timeseries(update, 'rows', symbol='AAPL')
+            pd.testing.assert_frame_equal(db_manager.query('packed'), db_manager.query('rows'))
+            with self.assertRaises(ValueError):
+                db_manager.save_timeseries(update, 'rows', symbol='AAPL', compress=True)
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+
+    def test_db_pool_batches_concurrent_writes_and_serves_parallel_reads(self):
+        db_manager = DBManager('test_ts.db')
+        try:
+            symbols = [f'SYM{i}' for i in range(16)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                written = list(executor.map(lambda s: db_manager.save_timeseries(self.dummy_df, 'bars', symbol=s), symbols))
+                failed = executor.submit(db_manager.pool.write, lambda conn: conn.execute('INSERT INTO missing VALUES (1)'))
+            self.assertEqual(written, [5] * 16)
+            with self.assertRaises(sqlite3.OperationalError):
+                failed.result()
+            # The failed job is rolled back on its own; every other write is kept.
+            self.assertEqual(db_manager.execute_query('SELECT COUNT(*) FROM bars')[0][0], 80)
+
+            # Jobs queued while the writer is busy are committed together.
+            pool, release = db_manager.pool, threading.Event()
+            commits, jobs = pool.commits, pool.jobs_written
+            futures = [pool.submit(lambda conn: release.wait(10))]
+            futures += [pool.submit(lambda conn: conn.execute('SELECT 1').fetchall()) for _ in range(5)]
+            release.set()
+            for future in futures:
+                future.result()
+            self.assertEqual(pool.jobs_written - jobs, 6)
+            self.assertLess(pool.commits - commits, pool.jobs_written - jobs)
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                reads = list(executor.map(lambda s: len(db_manager.query('bars', symbols=s)), symbols))
+            self.assertEqual(reads, [5] * 16)
+            throughput = db_manager.benchmark_reads('bars', thread_counts=(1, 2), queries=20)
+            self.assertEqual(set(throughput), {1, 2})
+            # Reader threads have exited, so only live threads still hold connections.
+            self.assertTrue(all(thread.is_alive() for thread in db_manager.pool._connections))
+        finally:
+            db_manager.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists('test_ts.db' + suffix):
+                    os.remove('test_ts.db' + suffix)
+
     def test_list_tables(self):
         self.db_manager.db_name = 'test.db'
         self.db_manager.save_dataframe(self.dummy_df, 'another_table')
@@ -130,28 +554,427 @@ class TestQuantApp(unittest.TestCase):
         self.market_data.get_quote_snapshot('AAPL')
         mock_ticker.assert_called_with('AAPL')
 
+    @patch('yfinance.Ticker')
+    def test_market_data_cache_reuses_info(self, mock_ticker):
+        mock_ticker.return_value.info = {'currentPrice': 150.0, 'sector': 'Technology'}
+        market_data = MarketData(cache=TTLCache(ttls={'quote': 60}))
+        market_data.get_quote_snapshot('AAPL')
+        market_data.get_quote_snapshot('aapl')
+        self.assertEqual(mock_ticker.call_count, 1)
+        self.assertEqual(market_data.cache.stats()['kinds']['quote'], {'hits': 1, 'misses': 1, 'ttl': 60})
+        # Fundamentals are derived from the same cached info, even once quotes have gone stale.
+        with patch('time.time', return_value=time.time() + 120):
+            self.assertEqual(market_data.get_company_fundamentals('AAPL')['sector'], 'Technology')
+        self.assertEqual(mock_ticker.call_count, 1)
+
+    def test_ttl_cache_expiry_lru_and_disk_tier(self):
+        cache = TTLCache(ttls={'quote': 60}, max_entries=1, disk_dir='test_ttl_cache')
+        try:
+            cache.set('quote', 'AAPL', {'price': 1})
+            cache.set('quote', 'MSFT', {'price': 2})
+            self.assertEqual(cache.stats()['entries'], 1)
+            # The disk tier is capped like the memory tier and serves a fresh instance.
+            self.assertEqual(len(os.listdir('test_ttl_cache')), 1)
+            self.assertIsNone(cache.get('quote', 'AAPL'))
+            self.assertEqual(TTLCache(disk_dir='test_ttl_cache', ttls={'quote': 60}).get('quote', 'MSFT'), {'price': 2})
+            with patch('time.time', return_value=time.time() + 120):
+                self.assertIsNone(cache.get('quote', 'MSFT'))
+        finally:
+            shutil.rmtree('test_ttl_cache', ignore_errors=True)
+
+    @patch('yfinance.Ticker')
+    def test_get_fundamentals_bundle_runs_calls_concurrently(self, mock_ticker):
+        statement = pd.DataFrame({'2023': [1.0]}, index=['Revenue'])
+
+        # Every (ticker, part) call blocks until all 12 are in flight, which a serial fetch never reaches.
+        all_in_flight = threading.Barrier(12, timeout=10)
+
+        class SlowTicker:
+            def __init__(self, symbol):
+                self.symbol = symbol
+
+            def __getattr__(self, name):
+                all_in_flight.wait()
+                if self.symbol == 'BAD':
+                    raise ValueError('no data')
+                return {'sector': 'Technology'} if name == 'info' else statement
+
+        mock_ticker.side_effect = SlowTicker
+        with patch('market_data.get_limiter'):
+            results, _ = self.market_data.get_fundamentals_bundle(['AAPL', 'MSFT', 'BAD'], max_workers=12)
+        self.assertFalse(all_in_flight.broken)
+        self.assertEqual(results['AAPL']['errors'], {})
+        self.assertEqual(results['AAPL']['info']['sector'], 'Technology')
+        pd.testing.assert_frame_equal(results['MSFT']['cash_flow'], statement)
+        self.assertEqual(set(results['BAD']['errors']), {'info', 'income_statement', 'balance_sheet', 'cash_flow'})
+
     # Test CryptoData (mock external calls)
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_price_chart(self, mock_requests_get):
         mock_requests_get.return_value.json.return_value = {'prices': [[1672531200000, 100], [1672617600000, 101]]}
         df = self.crypto_data.get_price_chart('bitcoin')
         self.assertIsInstance(df, pd.DataFrame)
         self.assertFalse(df.empty)
 
+    def test_crypto_price_store_appends_only_new_points(self):
+        hour = 3600 * 1000
+        now_ms = int(pd.Timestamp.now(tz='UTC').floor('h').timestamp() * 1000)
+
+        def chart(start_ms, end_ms, step):
+            stamps = range(start_ms, end_ms + 1, step)
+            return {'prices': [[t, t / hour] for t in stamps],
+                    'market_caps': [[t, 1e9] for t in stamps],
+                    'total_volumes': [[t, 1e6] for t in stamps]}
+
+        requested = []
+
+        def fake_get(url, params=None, **kwargs):
+            requested.append(params)
+            response = MagicMock()
+            # Short ranges come back at 5-minute granularity and are bucketed to hours.
+            step = hour if params['to'] - params['from'] > 86400 else hour // 12
+            response.json.return_value = chart(params['from'] * 1000 // hour * hour, params['to'] * 1000, step)
+            return response
+
+        store = SeriesStore('crypto', root='test_series')
+        crypto_data = CryptoData(price_store=store)
+        try:
+            with patch('requests.Session.get', side_effect=fake_get):
+                first = crypto_data.get_price_chart('bitcoin', days='30')
+                self.assertEqual(len(requested), 1)
+                self.assertTrue(requested[0]['to'] - requested[0]['from'] >= 30 * 86400)
+
+                # Pretend the last refresh was three hours ago; only the tail is requested.
+                key = ('bitcoin', 'usd', 'hourly')
+                start, end = store.coverage(key)
+                store.set_coverage(key, start, end - pd.Timedelta(hours=3))
+                second = crypto_data.get_price_chart('bitcoin', days='30')
+                self.assertEqual(len(requested), 2)
+                self.assertLess(requested[1]['to'] - requested[1]['from'], 86400)
+            self.assertTrue(second['timestamp'].is_unique)
+            self.assertTrue((second['timestamp'].dt.minute == 0).all())
+            # Incremental 5-minute points keep the start-of-hour price, like the stored hourly points.
+            self.assertTrue((second['price'] == second['timestamp'].astype('int64') // 10**6 / hour).all())
+            self.assertGreaterEqual(len(second), len(first))
+            # A failed download is reported, not raised through the CLI.
+            with patch.object(crypto_data, 'fetch_price_history', side_effect=requests.ConnectionError('offline')):
+                self.assertIsNone(crypto_data.get_price_chart('bitcoin', days='30'))
+
+            with patch('requests.Session.get', side_effect=AssertionError('network used for a local read')):
+                bars = crypto_data.load_price_history('bitcoin', interval='1D')
+            self.assertEqual(list(bars.columns[:5]), ['Open', 'High', 'Low', 'Close', 'Volume'])
+            self.assertTrue((bars['High'] >= bars['Low']).all())
+            self.assertEqual(bars.index.name, 'Date')
+
+            # Crypto bars save like stock bars, to both time-series and dataset tables.
+            db_manager = DBManager('test_ts.db')
+            try:
+                self.assertEqual(db_manager.save_timeseries(bars, 'crypto_bars', symbol='bitcoin'), len(bars))
+                self.assertEqual(db_manager.save_dataset(bars, 'crypto_bars', symbol='bitcoin'), len(bars))
+                unnamed = bars.rename_axis('BITCOIN')
+                self.assertEqual(db_manager.save_timeseries(unnamed, 'crypto_bars', symbol='bitcoin'), len(bars))
+                self.assertEqual(db_manager.query('crypto_bars', symbols='BITCOIN')['Close'].tolist(), bars['Close'].tolist())
+                self.assertEqual(len(db_manager.load_dataset('crypto_bars', symbols='BITCOIN')), len(bars))
+            finally:
+                db_manager.close()
+                shutil.rmtree('test_ts_dataset', ignore_errors=True)
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.exists('test_ts.db' + suffix):
+                        os.remove('test_ts.db' + suffix)
+        finally:
+            shutil.rmtree('test_series', ignore_errors=True)
+
+    def test_get_universe_snapshot_answers_rankings_and_screens(self):
+        def coin(rank):
+            return {'id': f'coin-{rank}', 'symbol': f'c{rank}', 'name': f'Coin {rank}', 'market_cap_rank': rank,
+                    'current_price': 1000.0 / rank, 'market_cap': 1e9 / rank, 'total_volume': 1e7 / rank,
+                    'price_change_percentage_24h': rank % 7 - 3, 'max_supply': None,
+                    'last_updated': '2023-01-01T00:00:00.000Z'}
+
+        def fake_get(url, params=None, **kwargs):
+            response = MagicMock()
+            if params['page'] == 3:
+                response.raise_for_status.side_effect = requests.exceptions.HTTPError('429 Too Many Requests')
+            first = (params['page'] - 1) * 250 + 1
+            response.json.return_value = [coin(rank) for rank in range(first, first + 250)]
+            return response
+
+        crypto_data = CryptoData(universe_dir='test_universe')
+        try:
+            with patch('requests.Session.get', side_effect=fake_get) as mock_get:
+                df, failed_pages = crypto_data.get_universe(top=600)
+            self.assertEqual(mock_get.call_count, 3)
+            self.assertEqual(list(failed_pages), [3])
+            self.assertEqual(len(df), 500)
+            self.assertEqual(str(df['market_cap_rank'].dtype), 'Int64')
+            self.assertEqual(df['market_cap'].dtype, 'float64')
+            self.assertTrue(df['max_supply'].isna().all())
+
+            with patch('requests.Session.get', side_effect=AssertionError('network used for a local query')):
+                snapshot, taken_at = crypto_data.load_universe_snapshot()
+                pd.testing.assert_frame_equal(snapshot, df)
+                self.assertIsNotNone(taken_at)
+                rows = crypto_data.get_local_rankings(per_page=5, page=2)
+                self.assertEqual(rows['market_cap_rank'].tolist(), [6, 7, 8, 9, 10])
+                screened = crypto_data.screen_universe(min_market_cap=1e7, min_change_24h=3)
+                self.assertTrue((screened['market_cap_rank'] % 7 == 6).all())
+                self.assertEqual(len(screened), 14)
+        finally:
+            shutil.rmtree('test_universe', ignore_errors=True)
+
     # Test ForexData (mock external calls)
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_live_rates(self, mock_requests_get):
         mock_requests_get.return_value.json.return_value = {'rates': {'USD': 1.0, 'EUR': 0.9}}
         self.forex_data.get_live_rates('USD')
         mock_requests_get.assert_called_once()
 
+    @patch('requests.Session.get')
+    def test_live_rates_for_any_base_come_from_one_fetch(self, mock_requests_get):
+        mock_requests_get.return_value.json.return_value = {'base': 'USD', 'rates': {'USD': 1.0, 'EUR': 0.9, 'JPY': 150.0, 'GBP': 0.8}}
+        eur = self.forex_data.get_live_rates('EUR')
+        jpy = self.forex_data.get_live_rates('jpy')
+        mock_requests_get.assert_called_once()
+        self.assertAlmostEqual(eur['USD'], 1 / 0.9)
+        self.assertAlmostEqual(jpy['GBP'], 0.8 / 150.0)
+        cross = self.forex_data.get_cross_matrix(['USD', 'EUR', 'JPY'])
+        self.assertEqual(cross.shape, (3, 3))
+        self.assertTrue((abs(cross.values * cross.values.T - 1) < 1e-12).all())
+        self.forex_data.get_live_rates('EUR', refresh=True)
+        self.assertEqual(mock_requests_get.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_live_rates_are_recorded_only_on_request(self, mock_requests_get):
+        mock_requests_get.return_value.json.return_value = {'base': 'USD', 'time_last_updated': 1672531200,
+                                                            'rates': {'USD': 1.0, 'EUR': 0.9, 'JPY': 150.0}}
+        forex_data = ForexData(history=FXHistory(SeriesStore('fx', root='test_series')))
+        try:
+            forex_data.get_live_rates('EUR')
+            self.assertEqual(forex_data.history.store.keys(), [])
+            self.assertEqual(forex_data.record_snapshot(), 2)
+            self.assertEqual(forex_data.history.store.keys(), ['snapshots__USD'])
+            self.assertAlmostEqual(forex_data.history.rate_at('EUR', 'JPY', '2023-01-02'), 150.0 / 0.9)
+        finally:
+            shutil.rmtree('test_series', ignore_errors=True)
+
+    def test_rate_matrix_staleness_and_persistence(self):
+        path = os.path.join('test_fx', 'latest_rates.json')
+        try:
+            matrix = RateMatrix(max_age=60, path=path)
+            matrix.update('USD', {'EUR': 0.9, 'JPY': 150.0}, fetched_at=time.time() - 120)
+            self.assertFalse(matrix.is_fresh())
+            reloaded = RateMatrix(max_age=300, path=path)
+            self.assertTrue(reloaded.is_fresh())
+            self.assertAlmostEqual(reloaded.convert([100.0], 'EUR', 'JPY')[0], 100 * 150.0 / 0.9)
+        finally:
+            shutil.rmtree('test_fx', ignore_errors=True)
+
+    def test_fx_history_asof_conversion(self):
+        history = FXHistory(SeriesStore('fx', root='test_series'))
+        try:
+            eurusd = pd.DataFrame({'Date': pd.date_range('2023-01-02', periods=3, freq='D'), 'Close': [1.05, 1.10, 1.20]})
+            self.assertEqual(history.import_frame(eurusd, base='EUR', quote='USD'), {('EUR', 'USD'): 3})
+            history.record_snapshot('USD', {'USD': 1.0, 'JPY': 130.0}, '2023-01-02 12:00')
+            history.record_snapshot('USD', {'USD': 1.0, 'JPY': 140.0}, '2023-01-04 12:00')
+            # Each snapshot is one write to a single per-base table.
+            self.assertEqual(history.store.keys(), ['EUR__USD', 'snapshots__USD'])
+            self.assertEqual(sorted(history.pairs()), [('EUR', 'USD'), ('USD', 'JPY')])
+
+            trades = pd.DataFrame({
+                'Date': pd.to_datetime(['2023-01-01 09:00', '2023-01-02 18:00', '2023-01-03 09:00', '2023-01-05 09:00', '2023-01-05 09:00']),
+                'Currency': ['EUR', 'JPY', 'EUR', 'jpy', 'USD'],
+                'Amount': [100.0, 13000.0, 100.0, 14000.0, 50.0],
+            })
+            usd = history.convert(trades, 'Amount', 'Currency', 'Date', to='USD')
+            self.assertTrue(pd.isna(usd.iloc[0]))
+            self.assertEqual(usd.iloc[1:].round(6).tolist(), [100.0, 110.0, 100.0, 50.0])
+            # EUR -> JPY goes through USD; JPY -> EUR uses the inverse.
+            self.assertAlmostEqual(history.rate_at('EUR', 'JPY', '2023-01-04 13:00'), 1.20 * 140.0)
+            self.assertAlmostEqual(history.rate_at('JPY', 'USD', '2023-01-03'), 1 / 130.0)
+            stale = history.convert(trades, 'Amount', 'Currency', 'Date', to='USD', tolerance='12h')
+            self.assertTrue(pd.isna(stale.iloc[3]))
+            # A cross is only as fresh as its stalest leg: EUR/USD last printed on Jan 4,
+            # so a fresh USD/JPY snapshot on Jan 10 does not make EUR/JPY pass the tolerance.
+            history.record_snapshot('USD', {'JPY': 145.0}, '2023-01-10 12:00')
+            cross = history.rates_asof('EUR', 'JPY', ['2023-01-04 13:00', '2023-01-10 13:00'], tolerance='2d')
+            self.assertAlmostEqual(cross[0], 1.20 * 140.0)
+            self.assertTrue(np.isnan(cross[1]))
+            self.assertAlmostEqual(history.rate_at('EUR', 'JPY', '2023-01-10 13:00'), 1.20 * 145.0)
+        finally:
+            shutil.rmtree('test_series', ignore_errors=True)
+
     # Test MacroData (mock external calls)
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_fred_series(self, mock_requests_get):
         mock_requests_get.return_value.json.return_value = {'observations': [{'date': '2023-01-01', 'value': '100.0'}]}
         self.macro_data.get_fred_series('GDP', 'test_key')
         mock_requests_get.assert_called_once()
 
+    def test_fred_store_parses_values_and_fetches_only_new_observations(self):
+        responses = [
+            {'observations': [{'date': '2023-01-01', 'value': '100.0'}, {'date': '2023-02-01', 'value': '.'},
+                              {'date': '2023-03-01', 'value': '101.5'}]},
+            {'observations': [{'date': '2023-03-01', 'value': '101.7'}, {'date': '2023-04-01', 'value': '102.0'}]},
+        ]
+        store = SeriesStore('fred', root='test_series')
+        macro_data = MacroData(series_store=store, refresh_seconds=3600)
+        try:
+            with patch('requests.Session.get') as mock_get:
+                mock_get.return_value.json.side_effect = responses
+                first = macro_data.get_fred_series('CPIAUCSL', 'test_key')
+                self.assertEqual(first['value'].dtype, 'float64')
+                self.assertTrue(pd.isna(first['value'].iloc[1]))
+                self.assertNotIn('observation_start', mock_get.call_args.kwargs['params'])
+
+                # Served from disk while fresh.
+                macro_data.get_fred_series('CPIAUCSL', 'test_key')
+                self.assertEqual(mock_get.call_count, 1)
+
+                start, end = store.coverage('CPIAUCSL')
+                store.set_coverage('CPIAUCSL', start, end - pd.Timedelta(hours=2))
+                updated = macro_data.get_fred_series('CPIAUCSL', 'test_key')
+                self.assertEqual(mock_get.call_count, 2)
+                self.assertEqual(mock_get.call_args.kwargs['params']['observation_start'], '2023-03-01')
+            self.assertEqual(updated['value'].iloc[2:].tolist(), [101.7, 102.0])
+        finally:
+            shutil.rmtree('test_series', ignore_errors=True)
+
+    def test_macro_panel_fetches_concurrently_and_aligns_frequencies(self):
+        observations = {
+            'CPIAUCSL': [{'date': f'2023-{m:02d}-01', 'value': str(300 + m)} for m in range(1, 7)],
+            'GDP': [{'date': '2023-01-01', 'value': '26000'}, {'date': '2023-04-01', 'value': '26500'}],
+            'DFF': [{'date': d.strftime('%Y-%m-%d'), 'value': '.' if d.day == 15 else str(4 + d.month / 10)}
+                    for d in pd.date_range('2023-02-01', '2023-06-30')],
+        }
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_get(url, params=None, **kwargs):
+            barrier.wait()  # Only passes if all three requests are in flight together.
+            response = MagicMock()
+            response.json.return_value = {'observations': observations[params['series_id']]}
+            return response
+
+        with patch('requests.Session.get', side_effect=fake_get):
+            panel, failures = self.macro_data.get_panel(['CPIAUCSL', 'GDP', 'DFF'], 'test_key', freq='M', how='mean')
+        self.assertEqual(failures, {})
+        self.assertEqual(list(panel.columns), ['CPIAUCSL', 'GDP', 'DFF'])
+        self.assertEqual(panel.index[0], pd.Timestamp('2023-02-01'))
+        self.assertEqual(len(panel), 5)
+        self.assertEqual(panel['GDP'].tolist(), [26000.0, 26000.0, 26500.0, 26500.0, 26500.0])
+        self.assertAlmostEqual(panel.loc['2023-03-01', 'DFF'], 4.3)
+        self.assertFalse(panel.isna().any().any())
+
+    def test_http_client_pools_connections_and_retries(self):
+        seen = {'requests': 0, 'ports': set()}
+
+        class FlakyHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                seen['requests'] += 1
+                seen['ports'].add(self.client_address[1])
+                status, body = (503, b'{}') if seen['requests'] == 1 else (200, b'{"ok": true}')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = HTTPClient(backoff_factor=0)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/data'
+            with patch('http_client.acquire_for_url') as acquire:
+                for _ in range(3):
+                    response = client.get(url)
+                    self.assertEqual(response.json(), {'ok': True})
+            # The 503 was retried, and all four requests shared one keep-alive connection.
+            self.assertEqual(seen['requests'], 4)
+            self.assertEqual(len(seen['ports']), 1)
+            # The retry waited for the rate limiter like every other request.
+            self.assertEqual(acquire.call_count, 4)
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_rate_limiter_releases_by_priority(self):
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.acquire()
+        order = []
+
+        def request(name, level):
+            limiter.acquire(level)
+            order.append(name)
+
+        bulk = threading.Thread(target=request, args=('bulk', BULK))
+        interactive = threading.Thread(target=request, args=('interactive', INTERACTIVE))
+        started = time.monotonic()
+        bulk.start()
+        time.sleep(0.02)
+        interactive.start()
+        bulk.join()
+        interactive.join()
+        self.assertEqual(order, ['interactive', 'bulk'])
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        with self.assertRaises(ValueError):
+            configure_rate_limits({'coingecko': {'rate': 0, 'burst': 1}})
+
+    def test_single_flight_coalesces_identical_requests(self):
+        group = SingleFlight()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            time.sleep(0.1)
+            return self.dummy_df
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(group.do(('yf_history', 'AAPL'), fetch))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(group.stats(), {'yf_history': {'calls': 1, 'deduplicated': 4}})
+
+        # Back-to-back calls reuse the result only while it lingers.
+        lingering = SingleFlight(linger=60)
+        lingering.do('fred', fetch)
+        lingering.do('fred', fetch)
+        self.assertEqual(len(fetches), 2)
+        group.do(('yf_history', 'AAPL'), fetch)
+        self.assertEqual(len(fetches), 3)
+
+    def test_cassette_records_and_replays_provider_responses(self):
+        recorder = Cassette(directory='test_cassettes', mode='record')
+        client = HTTPClient(single_flight=SingleFlight(), cassette=recorder)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"observations": [{"date": "2023-01-01", "value": "100.0"}]}'
+        response.url = 'https://api.stlouisfed.org/fred/series/observations?series_id=GDP&api_key=secret'
+        try:
+            with patch('requests.Session.get', return_value=response):
+                client.get('https://api.stlouisfed.org/fred/series/observations', params={'series_id': 'GDP', 'api_key': 'secret'})
+
+            recorder.configure(mode='replay', latency=0.05)
+            with patch('requests.Session.get', side_effect=AssertionError('network used during replay')):
+                started = time.monotonic()
+                replayed = client.get('https://api.stlouisfed.org/fred/series/observations', params={'series_id': 'GDP', 'api_key': 'other'})
+                self.assertGreaterEqual(time.monotonic() - started, 0.05)
+                self.assertEqual(replayed.json()['observations'][0]['value'], '100.0')
+                self.assertNotIn('secret', replayed.url)
+                with self.assertRaises(CassetteMiss):
+                    client.get('https://api.coingecko.com/api/v3/coins/bitcoin')
+            self.assertEqual((recorder.recorded, recorder.replayed), (1, 1))
+        finally:
+            shutil.rmtree('test_cassettes', ignore_errors=True)
+
     # Test Charting (visual output, so check no errors and mock plotext)
     @patch('plotext.plot')
     @patch('plotext.show')
@@ -166,6 +989,40 @@ class TestQuantApp(unittest.TestCase):
         self.assertIn('SMA_20', df_ta.columns)
         self.assertIn('RSI', df_ta.columns)
 
+    def test_chunked_indicators_match_in_memory(self):
+        dates = pd.date_range('2020-01-01', periods=600, freq='D')
+        close = pd.Series(100 * np.exp(np.cumsum(np.sin(np.arange(600)) / 50)), index=dates)
+        close.iloc[[3, 250, 251]] = np.nan
+        df = pd.DataFrame({'Close': close, 'High': close * 1.01, 'Low': close * 0.99})
+        chunks = lambda rows: (df.iloc[i:i + rows] for i in range(0, len(df), rows))
+
+        volatility = self.analytics.calculate_volatility(df)
+        for rows in (1, 37, 1000):
+            pd.testing.assert_series_equal(self.analytics.calculate_volatility_chunked(chunks(rows)), volatility)
+
+        indicators = self.analytics.calculate_technical_indicators(df.copy())
+        chunked = self.analytics.calculate_technical_indicators_chunked(chunks(100))
+        pd.testing.assert_frame_equal(chunked, indicators)
+
+    def test_chunked_analytics_restart_at_each_symbol(self):
+        dates = pd.date_range('2020-01-01', periods=120, freq='D')
+        frames = {
+            'AAA': pd.DataFrame({'Close': 100 + np.sin(np.arange(120)) * 5}, index=dates),
+            'BBB': pd.DataFrame({'Close': 20 + np.cos(np.arange(120))}, index=dates),
+        }
+        for frame in frames.values():
+            frame['High'], frame['Low'] = frame['Close'] * 1.01, frame['Close'] * 0.99
+        both = pd.concat(frames, names=['Symbol', 'Date'])
+        # Chunk edges fall inside symbols and on the boundary between them.
+        chunks = lambda rows: (both.iloc[i:i + rows] for i in range(0, len(both), rows))
+
+        for rows in (80, 120):
+            volatility = self.analytics.calculate_volatility_chunked(chunks(rows))
+            indicators = self.analytics.calculate_technical_indicators_chunked(chunks(rows))
+            for symbol, frame in frames.items():
+                pd.testing.assert_series_equal(volatility.loc[symbol], self.analytics.calculate_volatility(frame), check_names=False)
+                pd.testing.assert_frame_equal(indicators.loc[symbol], self.analytics.calculate_technical_indicators(frame.copy()), check_names=False)
+
     # Test PortfolioManager
     def test_add_and_view_position(self):
         self.portfolio_manager.add_position('AAPL', 10, 150.0)